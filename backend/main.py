@@ -1,3 +1,8 @@
+import time
+_import_started = time.perf_counter()
+
+import asyncio
+import functools
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -15,12 +20,26 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 # Import backend modules
 from src.preprocessing.data_preprocessor import preprocess_csv, process_text, remove_stopwords_from_text_column
-from src.chunking import chunk_fixed, chunk_document_based, chunk_document_based_multi, semantic_chunking_csv, chunk_recursive
-from src.chunking.base_chunker import ChunkingResult, ChunkMetadata
+from src.preprocessing.streaming import preprocess_csv_streaming, read_spill
+from src.preprocessing.parallel import shutdown_text_pool
+from src.preprocessing.deduplication import DEFAULT_SIMILARITY_THRESHOLD
+from src.preprocessing.dtype_optimizer import optimize_dtypes
+from src.preprocessing.result_cache import PreprocessCache, frame_content_hash, default_cache_dir, DEFAULT_CACHE_MAX_BYTES
+from src.chunking import chunk_fixed, chunk_document_based, chunk_document_based_multi, chunk_semantic, chunk_recursive
 from src.embedding import generate_chunk_embeddings, EmbeddingModelManager
 from src.metrics.retrieval_metrics import RetrievalMetricsTracker
 from src.storage.vector_db import ChromaVectorStore, VectorRecord
+from src.storage.session_store import create_session_store, DEFAULT_MEMORY_BUDGET_BYTES, DEFAULT_TTL_SECONDS
 from src.retrieval.retriever import Retriever
+from src.ingest import spool_upload, peak_rss_bytes, rss_report, get_ingest_engine, ParseJob
+from src.ingest import UploadFormat, detect_upload_format, resolve_columns, projected_content_hash, read_upload, read_upload_sample
+from src.ingest.background import DEFAULT_SAMPLE_ROWS
+from src.ingest.upload_stream import DEFAULT_BLOCK_SIZE, DEFAULT_SPOOL_MAX_MEMORY, DEFAULT_PARSE_BLOCK_ROWS
+from src.executors import StageExecutor
+from src.preprocessing.nlp_resources import preload_nlp_resources, nlp_resource_report
+
+# Time spent importing the API and its pipeline modules
+IMPORT_SECONDS = round(time.perf_counter() - _import_started, 3)
 
 app = FastAPI(title="CSV Chunking Optimizer API", version="1.0.0")
 
@@ -33,8 +52,88 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global variables for session state
-session_data = {}
+# Session state. "memory" keeps sessions in this process (bounded by a memory
+# budget, cold sessions spill to disk); "shared" keeps them in SESSION_SHARED_DIR
+# so several uvicorn workers can serve the same session.
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "memory")
+SESSION_TTL_SECONDS = float(os.environ.get("SESSION_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+if SESSION_BACKEND == "shared":
+    session_data = create_session_store(
+        "shared",
+        root_dir=os.environ.get("SESSION_SHARED_DIR") or os.path.join(tempfile.gettempdir(), "csv_chunking_sessions"),
+        ttl_seconds=SESSION_TTL_SECONDS
+    )
+else:
+    session_data = create_session_store(
+        "memory",
+        memory_budget_bytes=int(os.environ.get("SESSION_MEMORY_BUDGET_BYTES", DEFAULT_MEMORY_BUDGET_BYTES)),
+        spill_dir=os.environ.get("SESSION_SPILL_DIR") or None,
+        ttl_seconds=SESSION_TTL_SECONDS
+    )
+
+# Blocking work (parsing, NLP, tokenizing, encoding, Chroma I/O) runs off the event loop
+stage_executor = StageExecutor.from_env()
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    stage_executor.shutdown(wait=False)
+    shutdown_text_pool(wait=False)
+
+# NLP pipelines load on first use; PRELOAD_NLP=stopwords,lemmatize,stem loads them at startup
+PRELOAD_NLP = [name for name in os.environ.get("PRELOAD_NLP", "").split(",") if name.strip()]
+
+@app.on_event("startup")
+async def report_startup():
+    print(f"✓ API modules imported in {IMPORT_SECONDS:.2f}s")
+    if PRELOAD_NLP:
+        report = await stage_executor.run("preprocess", preload_nlp_resources, PRELOAD_NLP)
+        print(f"✓ Preloaded NLP resources: {report['load_seconds']}")
+
+# Upload streaming configuration
+UPLOAD_BLOCK_SIZE = int(os.environ.get("UPLOAD_BLOCK_SIZE", DEFAULT_BLOCK_SIZE))
+UPLOAD_SPOOL_MAX_MEMORY = int(os.environ.get("UPLOAD_SPOOL_MAX_MEMORY", DEFAULT_SPOOL_MAX_MEMORY))
+UPLOAD_SPOOL_DIR = os.environ.get("UPLOAD_SPOOL_DIR") or None
+UPLOAD_PARSE_BLOCK_ROWS = int(os.environ.get("UPLOAD_PARSE_BLOCK_ROWS", DEFAULT_PARSE_BLOCK_ROWS))
+# "pyarrow" (multithreaded, Arrow-backed columns) or "pandas"
+CSV_INGEST_ENGINE = os.environ.get("CSV_INGEST_ENGINE") or None
+# Uploads answer with a preview of the first UPLOAD_SAMPLE_ROWS rows and parse the
+# full file in the background; endpoints that need the table wait for it
+UPLOAD_SAMPLE_ROWS = int(os.environ.get("UPLOAD_SAMPLE_ROWS", DEFAULT_SAMPLE_ROWS))
+# Seconds between session checks when the parse runs in another worker
+UPLOAD_PARSE_POLL_SECONDS = float(os.environ.get("UPLOAD_PARSE_POLL_SECONDS", 0.5))
+# A parse owned by another worker that has not landed after this many seconds (e.g. because
+# that worker died) is marked failed instead of being waited for forever
+UPLOAD_PARSE_TIMEOUT_SECONDS = float(os.environ.get("UPLOAD_PARSE_TIMEOUT_SECONDS", 1800))
+
+# Background parses started by this process, by session id
+parse_jobs: Dict[str, ParseJob] = {}
+
+# Out-of-core preprocessing (/api/preprocess/stream): spill location and format.
+# "arrow" spills are memory-mapped when loaded into the session, "parquet" ones are compressed.
+PREPROCESS_SPILL_DIR = os.environ.get("PREPROCESS_SPILL_DIR") or os.path.join(tempfile.gettempdir(), "csv_preprocess_spill")
+PREPROCESS_SPILL_FORMAT = os.environ.get("PREPROCESS_SPILL_FORMAT", "arrow")
+
+# Worker processes for column-parallel text preprocessing (1 = in the request thread);
+# PREPROCESS_ROW_BLOCK_SIZE additionally splits each column into row blocks
+PREPROCESS_WORKERS = int(os.environ.get("PREPROCESS_WORKERS", 1))
+PREPROCESS_ROW_BLOCK_SIZE = int(os.environ["PREPROCESS_ROW_BLOCK_SIZE"]) if os.environ.get("PREPROCESS_ROW_BLOCK_SIZE") else None
+
+# Preprocessing results keyed by input content + parameters, shared by all sessions
+# (and by workers pointing at the same PREPROCESS_CACHE_DIR); 0 bytes disables it
+PREPROCESS_CACHE_MAX_BYTES = int(os.environ.get("PREPROCESS_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+preprocess_cache = PreprocessCache(
+    os.environ.get("PREPROCESS_CACHE_DIR") or default_cache_dir(),
+    max_bytes=PREPROCESS_CACHE_MAX_BYTES
+) if PREPROCESS_CACHE_MAX_BYTES > 0 else None
+
+# Compact dtypes (categoricals, Arrow strings, downcast numbers) before chunking
+OPTIMIZE_DTYPES = os.environ.get("OPTIMIZE_DTYPES", "1").strip().lower() not in ("0", "false", "no")
+
+def build_ingest_engine():
+    """Ingest engine used for uploads, as selected by CSV_INGEST_ENGINE"""
+    if CSV_INGEST_ENGINE == "pandas":
+        return get_ingest_engine("pandas", block_rows=UPLOAD_PARSE_BLOCK_ROWS)
+    return get_ingest_engine(CSV_INGEST_ENGINE)
 
 def validate_and_normalize_headers(columns):
     """Validate and normalize CSV headers"""
@@ -47,10 +146,63 @@ def validate_and_normalize_headers(columns):
         new_columns.append(new_col)
     return new_columns
 
+def parse_upload(ingest_engine, upload_format: UploadFormat, columns: Optional[List[str]], fileobj) -> pd.DataFrame:
+    """Parse a whole upload with the ingest engine and normalize its headers"""
+    df = read_upload(fileobj, upload_format, ingest_engine, columns)
+    df.columns = validate_and_normalize_headers(df.columns)
+    return df
+
+def install_parsed_table(session_id: str, job: ParseJob, df: Optional[pd.DataFrame]):
+    """Put a finished background parse into its session"""
+    parse_jobs.pop(session_id, None)
+    if session_id not in session_data:
+        return
+    session = session_data[session_id]
+    if df is not None:
+        # A cached preprocessing result may already have filled df
+        if session.get("df") is None:
+            session["df"] = df
+        if session.get("source_df") is None:
+            session["source_df"] = df
+    session["rows"] = job.rows
+    session["parse_status"] = job.status
+    session["parse_error"] = job.error
+    session_data[session_id] = session
+
+async def get_session_table(session_id: str) -> Dict[str, Any]:
+    """Return the session once its full table is parsed, waiting for a background parse"""
+    session = session_data[session_id]
+    if session.get("df") is not None:
+        return session
+    if session.get("spill_dir"):
+        # Streamed sessions keep their table in the spill directory; the Arrow parts are
+        # memory-mapped, so only the pages a stage touches are read
+        session["df"] = await stage_executor.run("ingest", read_spill, session["spill_dir"])
+        return session
+    job = parse_jobs.get(session_id)
+    if job is not None:
+        await job.wait()
+        return session_data[session_id]
+    # The parse runs in another worker (shared sessions); wait for it to land in the store
+    deadline = (session.get("parse_started_at") or time.time()) + UPLOAD_PARSE_TIMEOUT_SECONDS
+    while session.get("df") is None and session.get("parse_status") == "parsing":
+        if time.time() >= deadline:
+            session["parse_status"] = "failed"
+            session["parse_error"] = f"no result after {UPLOAD_PARSE_TIMEOUT_SECONDS:.0f}s (the parsing worker may have stopped)"
+            session_data[session_id] = session
+            break
+        await asyncio.sleep(UPLOAD_PARSE_POLL_SECONDS)
+        session = session_data[session_id]
+    if session.get("df") is None:
+        raise RuntimeError(f"Parsing the upload failed: {session.get('parse_error')}")
+    return session
+
 def convert_numpy_types(obj):
     """Convert numpy types to native Python types for JSON serialization"""
     import math
     
+    if obj is pd.NA or obj is pd.NaT:
+        return None
     if isinstance(obj, dict):
         return {key: convert_numpy_types(value) for key, value in obj.items()}
     elif isinstance(obj, list):
@@ -77,23 +229,56 @@ async def root():
     return {"message": "CSV Chunking Optimizer API"}
 
 @app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
-    """Upload and validate CSV file"""
+async def upload_file(
+    file: UploadFile = File(...),
+    columns: Optional[str] = Form(None)
+):
+    """Upload a CSV/JSONL/Parquet/Feather file (gzip, zstd or zip welcome), answer with a preview and parse it in the background"""
     try:
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(status_code=400, detail="Only CSV files are allowed")
-        
-        # Read CSV
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
-        
-        # Validate and normalize headers
-        df.columns = validate_and_normalize_headers(df.columns)
-        
-        # Store in session
-        session_id = f"session_{len(session_data)}"
+        try:
+            upload_format = detect_upload_format(file.filename)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Column projection: a JSON list or comma-separated names; other columns are never read
+        requested_columns = None
+        if columns:
+            requested_columns = json.loads(columns) if columns.strip().startswith("[") else \
+                [name.strip() for name in columns.split(",") if name.strip()]
+        
+        # Stream the upload to a spooled temp file, decompressing gzip/zstd on the way
+        rss_before = peak_rss_bytes()
+        spooled = await spool_upload(
+            file,
+            block_size=UPLOAD_BLOCK_SIZE,
+            max_memory=UPLOAD_SPOOL_MAX_MEMORY,
+            spool_dir=UPLOAD_SPOOL_DIR,
+            compression=upload_format.compression
+        )
+        try:
+            sample, rows, rows_exact = await stage_executor.run(
+                "ingest", read_upload_sample, spooled.file, upload_format, spooled.size_bytes, UPLOAD_SAMPLE_ROWS
+            )
+            if requested_columns:
+                requested_columns = resolve_columns(requested_columns, list(sample.columns))
+                sample = sample[requested_columns]
+        except Exception:
+            spooled.close()
+            raise
+        sample.columns = validate_and_normalize_headers(sample.columns)
+        peak_rss_mb, peak_rss_growth_mb = rss_report(rss_before, peak_rss_bytes())
+        
+        # Store in session; df is filled in when the background parse finishes
+        session_id = session_data.new_session_id()
         session_data[session_id] = {
-            "df": df,
+            "df": None,
+            "source_df": None,
+            "rows": rows if rows_exact else None,
+            "rows_estimate": rows,
+            "parse_status": "parsing",
+            "parse_error": None,
+            "parse_started_at": time.time(),
+            # The projection changes the table, so it is part of the hash keying cached preprocessing
+            "content_hash": projected_content_hash(spooled.content_hash, requested_columns),
             "filename": file.filename,
             "step": 0,
             "file_meta": {},
@@ -106,26 +291,67 @@ async def upload_file(file: UploadFile = File(...)):
             "metrics_tracker": RetrievalMetricsTracker()
         }
         
+        ingest_engine = build_ingest_engine()
+        job = ParseJob(
+            spooled,
+            functools.partial(parse_upload, ingest_engine, upload_format, requested_columns),
+            on_complete=functools.partial(install_parsed_table, session_id)
+        )
+        parse_jobs[session_id] = job.start(functools.partial(stage_executor.run, "ingest"))
+        
         # Convert preview data safely
-        preview_data = df.head().to_dict('records')
+        preview_data = sample.head().to_dict('records')
         preview_data = convert_numpy_types(preview_data)
         
         return {
             "session_id": session_id,
             "filename": file.filename,
-            "rows": len(df),
-            "columns": len(df.columns),
+            "rows": rows,
+            "rows_exact": rows_exact,
+            "columns": len(sample.columns),
+            "header": list(sample.columns),
+            "parse_status": job.status,
+            "ingest_engine": ingest_engine.name,
+            "format": upload_format.format,
+            "compression": upload_format.compression,
+            "size_bytes": spooled.size_bytes,
+            "received_bytes": spooled.received_bytes,
+            "peak_rss_mb": peak_rss_mb,
+            "peak_rss_growth_mb": peak_rss_growth_mb,
             "preview": preview_data
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/upload/{session_id}/status")
+async def get_upload_status(session_id: str):
+    """Progress of the background parse of an upload"""
+    if session_id not in session_data:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    job = parse_jobs.get(session_id)
+    if job is not None:
+        return {"session_id": session_id, **job.report()}
+    session = session_data[session_id]
+    status = session.get("parse_status") or "done"
+    return {
+        "session_id": session_id,
+        "status": status,
+        "progress": 1.0 if status == "done" else None,
+        "rows": session.get("rows") if session.get("df") is None else len(session["df"]),
+        "error": session.get("parse_error")
+    }
+
 @app.post("/api/preprocess")
 async def preprocess_data(
     session_id: str = Form(...),
     fill_null_strategy: Optional[str] = Form(None),
     type_conversions: Optional[str] = Form(None),
-    drop_duplicates_cols: Optional[str] = Form(None)
+    drop_duplicates_cols: Optional[str] = Form(None),
+    dedupe_mode: Optional[str] = Form(None),
+    dedupe_threshold: Optional[float] = Form(None)
 ):
     """Run default preprocessing"""
     try:
@@ -133,26 +359,67 @@ async def preprocess_data(
             raise HTTPException(status_code=404, detail="Session not found")
         
         session = session_data[session_id]
-        df = session["df"]
         
         # Parse type conversions if provided
         type_conv_dict = None
         if type_conversions:
             type_conv_dict = json.loads(type_conversions)
         
-        # Run preprocessing
-        df_processed, file_meta, numeric_meta = preprocess_csv(
-            df,
-            fill_null_strategy=fill_null_strategy,
-            type_conversions=type_conv_dict,
-            drop_duplicates_cols=drop_duplicates_cols
-        )
+        # Identical input + parameters (any session, any user) reuse the cached result;
+        # uploads are keyed by their bytes, so a hit does not wait for the full parse
+        cache_key = None
+        cached = None
+        if preprocess_cache is not None:
+            if not session.get("content_hash"):
+                session = await get_session_table(session_id)
+                session["content_hash"] = await stage_executor.run("preprocess", frame_content_hash, session["df"])
+            cache_key = PreprocessCache.make_key(
+                session["content_hash"],
+                fill_null_strategy=fill_null_strategy,
+                type_conversions=type_conv_dict,
+                drop_duplicates_cols=drop_duplicates_cols,
+                remove_stopwords_flag=False,
+                dedupe_mode=dedupe_mode,
+                dedupe_threshold=dedupe_threshold
+            )
+            cached = await stage_executor.run("preprocess", preprocess_cache.get, cache_key)
+        
+        if cached is not None:
+            df_processed, file_meta, numeric_meta = cached
+        else:
+            session = await get_session_table(session_id)
+            # Always preprocess the table as uploaded, never an already processed one
+            if session.get("source_df") is None:
+                session["source_df"] = session["df"]
+            df = session["source_df"]
+            
+            # Run preprocessing
+            df_processed, file_meta, numeric_meta = await stage_executor.run(
+                "preprocess",
+                preprocess_csv,
+                df,
+                fill_null_strategy=fill_null_strategy,
+                type_conversions=type_conv_dict,
+                drop_duplicates_cols=drop_duplicates_cols,
+                dedupe_mode=dedupe_mode,
+                dedupe_threshold=dedupe_threshold or DEFAULT_SIMILARITY_THRESHOLD,
+                n_workers=PREPROCESS_WORKERS,
+                row_block_size=PREPROCESS_ROW_BLOCK_SIZE
+            )
+            if cache_key is not None:
+                await stage_executor.run(
+                    "store", preprocess_cache.put, cache_key, df_processed,
+                    convert_numpy_types(file_meta), convert_numpy_types(numeric_meta)
+                )
         
         # Update session
         session["df"] = df_processed
+        session["dtype_report"] = None
         session["file_meta"] = file_meta
         session["numeric_meta"] = numeric_meta
+        session["column_roles"] = file_meta.get("column_roles")
         session["step"] = 1
+        session_data[session_id] = session
         
         return {
             "success": True,
@@ -160,7 +427,83 @@ async def preprocess_data(
             "columns": len(df_processed.columns),
             "file_meta": convert_numpy_types(file_meta),
             "numeric_meta": convert_numpy_types(numeric_meta),
-            "preview": df_processed.head().to_dict('records')
+            "cache_hit": cached is not None,
+            "preview": convert_numpy_types(df_processed.head().to_dict('records'))
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/preprocess/cache")
+async def preprocess_cache_report():
+    """Report preprocessing result cache usage"""
+    if preprocess_cache is None:
+        return {"enabled": False}
+    report = await stage_executor.run("store", preprocess_cache.report)
+    return {"enabled": True, **report}
+
+@app.post("/api/preprocess/stream")
+async def preprocess_stream(
+    file: UploadFile = File(...),
+    type_conversions: Optional[str] = Form(None),
+    drop_duplicates_cols: Optional[str] = Form(None),
+    remove_stopwords: Optional[bool] = Form(False)
+):
+    """Upload and preprocess a CSV block by block, for files larger than memory"""
+    try:
+        if not file.filename.endswith('.csv'):
+            raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+        
+        spooled = await spool_upload(
+            file,
+            block_size=UPLOAD_BLOCK_SIZE,
+            max_memory=UPLOAD_SPOOL_MAX_MEMORY,
+            spool_dir=UPLOAD_SPOOL_DIR
+        )
+        session_id = session_data.new_session_id()
+        try:
+            spill_dir, file_meta, numeric_meta = await stage_executor.run(
+                "preprocess",
+                preprocess_csv_streaming,
+                spooled.file,
+                spill_dir=os.path.join(PREPROCESS_SPILL_DIR, session_id),
+                block_rows=UPLOAD_PARSE_BLOCK_ROWS,
+                type_conversions=json.loads(type_conversions) if type_conversions else None,
+                drop_duplicates_cols=drop_duplicates_cols,
+                remove_stopwords_flag=bool(remove_stopwords),
+                spill_format=PREPROCESS_SPILL_FORMAT
+            )
+        finally:
+            spooled.close()
+        
+        # The spill directory is the session's table; stages map it when they need it
+        preview = await stage_executor.run("ingest", read_spill, spill_dir, max_parts=1)
+        session_data[session_id] = {
+            "df": None,
+            "rows": file_meta["num_rows"],
+            "filename": file.filename,
+            "step": 1,
+            "file_meta": file_meta,
+            "numeric_meta": numeric_meta,
+            "column_roles": file_meta.get("column_roles"),
+            "spill_dir": spill_dir,
+            "chunking_result": None,
+            "embedding_result": None,
+            "meta_numeric_cols": [],
+            "meta_categorical_cols": [],
+            "store_metadata_enabled": True,
+            "metrics_tracker": RetrievalMetricsTracker()
+        }
+        
+        return {
+            "success": True,
+            "session_id": session_id,
+            "filename": file.filename,
+            "rows": file_meta["num_rows"],
+            "columns": file_meta["num_columns"],
+            "size_bytes": spooled.size_bytes,
+            "file_meta": convert_numpy_types(file_meta),
+            "numeric_meta": convert_numpy_types(numeric_meta),
+            "preview": convert_numpy_types(preview.head().to_dict('records'))
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,60 +523,52 @@ async def chunk_data(
     similarity_threshold: Optional[float] = Form(None),
     use_fast_model: Optional[bool] = Form(True),
     text_chunk_chars: Optional[int] = Form(None),
-    overlap_chars: Optional[int] = Form(None)
+    overlap_chars: Optional[int] = Form(None),
+    fixed_size_mode: Optional[str] = Form("rows")
 ):
     """Apply chunking method to data"""
     try:
         if session_id not in session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        session = session_data[session_id]
+        session = await get_session_table(session_id)
+        
+        # Compact the table once per version of session["df"]
+        if OPTIMIZE_DTYPES and session.get("dtype_report") is None:
+            session["df"], session["dtype_report"] = await stage_executor.run(
+                "preprocess", optimize_dtypes, session["df"], column_roles=session.get("column_roles")
+            )
         df = session["df"]
         
         if chunking_method == "Fixed Size Chunking":
-            result = chunk_fixed(df, chunk_size, overlap, preserve_headers)
+            # fixed_size_mode "chars" measures chunk_size and overlap in characters of row text
+            result = await stage_executor.run(
+                "chunk", chunk_fixed, df, chunk_size, overlap, preserve_headers, fixed_size_mode or "rows"
+            )
         elif chunking_method == "Document Based Chunking":
             if key_columns:
                 key_cols_list = json.loads(key_columns)
-                result = chunk_document_based_multi(df, key_cols_list, token_limit, model_name, preserve_headers)
+                result = await stage_executor.run(
+                    "chunk", chunk_document_based_multi, df, key_cols_list, token_limit, model_name, preserve_headers
+                )
             else:
-                result = chunk_document_based(df, key_column, token_limit, model_name, preserve_headers)
-        elif chunking_method == "Semantic Chunking":
-            # For semantic chunking, we need the original file
-            # This is a simplified version - in production you'd want to handle file storage better
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
-                df.to_csv(tmp.name, index=False)
-                docs = semantic_chunking_csv(tmp.name, batch_size=batch_size, use_fast_model=use_fast_model, similarity_threshold=similarity_threshold)
-                os.unlink(tmp.name)
-            
-            df_chunks = []
-            metadata_list = []
-            for idx, doc in enumerate(docs):
-                chunk_text = doc.page_content
-                chunk_df = pd.DataFrame({"text": [chunk_text]})
-                df_chunks.append(chunk_df)
-                
-                md = ChunkMetadata(
-                    chunk_id=f"semantic_chunk_{idx:04d}",
-                    method="semantic",
-                    chunk_size=1,
-                    start_index=0,
-                    end_index=0,
-                    overlap=None,
-                    quality_score=None,
-                    metadata={"source_file": session["filename"]}
+                result = await stage_executor.run(
+                    "chunk", chunk_document_based, df, key_column, token_limit, model_name, preserve_headers
                 )
-                metadata_list.append(md)
-
-            result = ChunkingResult(
-                chunks=df_chunks,
-                metadata=metadata_list,
-                method="semantic",
-                total_chunks=len(df_chunks),
-                quality_report={"note": "Semantic chunking output; quality metrics not computed."}
+        elif chunking_method == "Semantic Chunking":
+            result = await stage_executor.run(
+                "semantic_chunk",
+                chunk_semantic,
+                df,
+                source_file=session["filename"],
+                batch_size=batch_size,
+                use_fast_model=use_fast_model,
+                similarity_threshold=similarity_threshold
             )
         elif chunking_method == "Recursive":
-            result = chunk_recursive(
+            result = await stage_executor.run(
+                "chunk",
+                chunk_recursive,
                 dataframe=df,
                 mode="semantic_text_recursive",
                 text_chunk_chars=int(text_chunk_chars),
@@ -243,15 +578,20 @@ async def chunk_data(
         else:
             raise HTTPException(status_code=400, detail="Invalid chunking method")
         
-        # Update session
+        # A result coming back from the process pool (semantic_chunk) references rows
+        # of df without carrying it; in-process results are already bound
+        result.bind(df)
+        
+        # Update session (chunks are reachable through chunking_result)
         session["chunking_result"] = result
-        session["chunks"] = result.chunks
+        session_data[session_id] = session
         
         return {
             "success": True,
             "total_chunks": result.total_chunks,
             "method": result.method,
-            "quality_report": result.quality_report
+            "quality_report": result.quality_report,
+            "dtype_report": convert_numpy_types(session.get("dtype_report"))
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -267,12 +607,14 @@ async def generate_embeddings(
         if session_id not in session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        session = session_data[session_id]
-        chunks = session["chunks"]
+        session = await get_session_table(session_id)
         chunking_result = session["chunking_result"]
+        chunks = chunking_result.chunks if chunking_result else None
         
         if not chunks or not chunking_result:
             raise HTTPException(status_code=400, detail="No chunks found. Please run chunking first.")
+        # A session reloaded from disk has its chunk plan detached from the table
+        chunking_result.bind(session["df"])
         
         # Prepare chunk metadata
         chunk_metadata_list = []
@@ -286,7 +628,9 @@ async def generate_embeddings(
             })
         
         # Generate embeddings
-        embedding_result = generate_chunk_embeddings(
+        embedding_result = await stage_executor.run(
+            "embed",
+            generate_chunk_embeddings,
             chunks=chunks,
             chunk_metadata_list=chunk_metadata_list,
             model_name=model_name,
@@ -296,6 +640,7 @@ async def generate_embeddings(
         
         # Update session
         session["embedding_result"] = embedding_result
+        session_data[session_id] = session
         
         return {
             "success": True,
@@ -308,6 +653,59 @@ async def generate_embeddings(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def store_embedding_result(embedding_result, persist_dir: str, collection_name: str, reset_before_store: bool) -> int:
+    """Write an EmbeddingResult to ChromaDB and return the number of records stored"""
+    # Initialize ChromaDB store
+    store = ChromaVectorStore(persist_directory=persist_dir, collection_name=collection_name)
+    store.connect()
+
+    if reset_before_store:
+        store.reset_collection()
+    else:
+        store.get_or_create_collection()
+
+    # Prepare records
+    records = []
+    for ec in embedding_result.embedded_chunks:
+        base_md = {
+            'chunk_id': str(ec.id),
+            'source_file': str(ec.metadata.source_file or 'unknown'),
+            'chunk_number': int(ec.metadata.chunk_number),
+            'embedding_model': str(ec.metadata.embedding_model),
+            'vector_dimension': int(ec.metadata.vector_dimension),
+            'text_length': int(ec.metadata.text_length),
+        }
+
+        extra_md = ec.metadata.additional_metadata or {}
+        safe_extra = {}
+        for k, v in extra_md.items():
+            try:
+                if v is None:
+                    continue
+                if isinstance(v, (str, int, float, bool)):
+                    safe_extra[str(k)] = v
+                else:
+                    safe_extra[str(k)] = str(v)
+            except Exception:
+                continue
+
+        md = {**base_md, **safe_extra}
+        if not md:
+            md = {'chunk_id': str(ec.id)}
+
+        records.append(
+            VectorRecord(
+                id=ec.id,
+                embedding=ec.embedding.tolist() if hasattr(ec.embedding, 'tolist') else list(ec.embedding),
+                metadata=md,
+                document=ec.document or ''
+            )
+        )
+
+    # Store records
+    store.add(records)
+    return len(records)
+
 @app.post("/api/store")
 async def store_embeddings(
     session_id: str = Form(...),
@@ -326,65 +724,24 @@ async def store_embeddings(
         if not embedding_result:
             raise HTTPException(status_code=400, detail="No embeddings found. Please generate embeddings first.")
         
-        # Initialize ChromaDB store
-        store = ChromaVectorStore(persist_directory=persist_dir, collection_name=collection_name)
-        store.connect()
-        
-        if reset_before_store:
-            store.reset_collection()
-        else:
-            store.get_or_create_collection()
-        
-        # Prepare records
-        records = []
-        for ec in embedding_result.embedded_chunks:
-            base_md = {
-                'chunk_id': str(ec.id),
-                'source_file': str(ec.metadata.source_file or 'unknown'),
-                'chunk_number': int(ec.metadata.chunk_number),
-                'embedding_model': str(ec.metadata.embedding_model),
-                'vector_dimension': int(ec.metadata.vector_dimension),
-                'text_length': int(ec.metadata.text_length),
-            }
-            
-            extra_md = ec.metadata.additional_metadata or {}
-            safe_extra = {}
-            for k, v in extra_md.items():
-                try:
-                    if v is None:
-                        continue
-                    if isinstance(v, (str, int, float, bool)):
-                        safe_extra[str(k)] = v
-                    else:
-                        safe_extra[str(k)] = str(v)
-                except Exception:
-                    continue
-            
-            md = {**base_md, **safe_extra}
-            if not md:
-                md = {'chunk_id': str(ec.id)}
-
-            records.append(
-                VectorRecord(
-                    id=ec.id,
-                    embedding=ec.embedding.tolist() if hasattr(ec.embedding, 'tolist') else list(ec.embedding),
-                    metadata=md,
-                    document=ec.document or ''
-                )
-            )
-        
-        # Store records
-        store.add(records)
+        records_stored = await stage_executor.run(
+            "store", store_embedding_result, embedding_result, persist_dir, collection_name, reset_before_store
+        )
         
         return {
             "success": True,
-            "records_stored": len(records),
+            "records_stored": records_stored,
             "collection_name": collection_name,
             "persist_dir": persist_dir
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def search_collection(query: str, model_name: str, top_k: int, persist_dir: str, collection_name: str):
+    """Embed the query and search the ChromaDB collection"""
+    retriever = Retriever(collection_name=collection_name, persist_directory=persist_dir)
+    return retriever.search(query=query, model_name=model_name, top_k=top_k, where=None)
+
 @app.post("/api/search")
 async def search_embeddings(
     session_id: str = Form(...),
@@ -404,12 +761,11 @@ async def search_embeddings(
         if not embedding_result:
             raise HTTPException(status_code=400, detail="No embeddings found. Please generate embeddings first.")
         
-        # Initialize retriever
-        model_used = embedding_result.model_used if embedding_result.model_used != 'dummy_model' else 'all-MiniLM-L6-v2'
-        retriever = Retriever(collection_name=collection_name, persist_directory=persist_dir)
-        
         # Search
-        results = retriever.search(query=query, model_name=model_used, top_k=int(top_k), where=None)
+        model_used = embedding_result.model_used if embedding_result.model_used != 'dummy_model' else 'all-MiniLM-L6-v2'
+        results = await stage_executor.run(
+            "search", search_collection, query, model_used, int(top_k), persist_dir, collection_name
+        )
         
         # Process results
         docs = results.get('documents', [[]])[0] if results else []
@@ -450,6 +806,19 @@ async def get_available_models():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/resources")
+async def get_resource_report():
+    """Get import time and NLP resource loading report"""
+    return {
+        "import_seconds": IMPORT_SECONDS,
+        "nlp": nlp_resource_report()
+    }
+
+@app.get("/api/sessions/memory")
+async def get_session_memory():
+    """Get session store memory accounting"""
+    return convert_numpy_types(session_data.memory_report())
+
 @app.get("/api/session/{session_id}")
 async def get_session_data(session_id: str):
     """Get session data"""
@@ -457,12 +826,14 @@ async def get_session_data(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
     
     session = session_data[session_id]
+    df = session.get("df")
     return {
         "session_id": session_id,
         "filename": session["filename"],
         "step": session["step"],
-        "rows": len(session["df"]),
-        "columns": len(session["df"].columns)
+        "parse_status": session.get("parse_status") or "done",
+        "rows": len(df) if df is not None else session.get("rows") or session.get("rows_estimate"),
+        "columns": len(df.columns) if df is not None else None
     }
 
 if __name__ == "__main__":
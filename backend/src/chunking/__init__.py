@@ -1,16 +1,22 @@
 # Chunking module for CSV chunking optimizer
-from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata, ChunkingQualityAssessment
+from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata, ChunkPlan, ChunkingQualityAssessment
 from .document_based_chunker import DocumentBasedChunker, chunk_document_based, chunk_document_based_multi
 from .fixed_size_chunker import FixedSizeChunker, chunk_fixed
-from .semantic_chunker import semantic_chunking_csv
+from .semantic_chunker import semantic_chunking_csv, chunk_semantic
 from .recursive_chunker import RecursiveChunker, chunk_recursive
+from .span_index import RowSpanIndex
+from .row_renderer import RowTemplate, RowRenderCache, render_rows
 
 __all__ = [
     # Base classes
     'BaseChunker',
     'ChunkingResult', 
     'ChunkMetadata',
+    'ChunkPlan',
     'ChunkingQualityAssessment',
+    'RowSpanIndex',
+    'RowTemplate',
+    'RowRenderCache',
     
     # Chunker classes
     'DocumentBasedChunker',
@@ -22,7 +28,9 @@ __all__ = [
     'chunk_document_based_multi',
     'chunk_fixed',
     'semantic_chunking_csv',
-    'chunk_recursive'
+    'chunk_semantic',
+    'chunk_recursive',
+    'render_rows'
 ]
 
 
@@ -1,5 +1,8 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from collections.abc import Sequence
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
@@ -16,15 +19,160 @@ class ChunkMetadata:
     quality_score: Optional[float] = None
     metadata: Optional[Dict[str, Any]] = None
 
+def _table_fingerprint(df: pd.DataFrame) -> str:
+    """sha256 of a table's column names and cell values, whatever dtypes hold them (NumPy, Arrow, categorical)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in df.columns]).encode("utf-8"))
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        values = column.to_numpy(dtype=object)
+        values[column.isna().to_numpy()] = None
+        digest.update(pd.util.hash_array(values, categorize=False).tobytes())
+    return digest.hexdigest()
+
+def _index_dtype(n_rows: int):
+    return np.int32 if n_rows < 2 ** 31 else np.int64
+
+
+class ChunkPlan(Sequence):
+    """
+    Chunks as row positions into one shared source DataFrame
+
+    Each chunk is either a contiguous row range (starts/stops) or a slice of
+    one concatenated array of row positions (CSR-style offsets), so a plan
+    over millions of rows costs a few integer arrays instead of a copy of
+    every chunk. Chunks are materialized only when indexed: ranges as iloc
+    views, position lists with take(). Chunks hold data rows only; headers
+    are rendered from the chunk metadata (preserve_headers) by TextPreparer.
+
+    Pickling drops the source table (e.g. when a result comes back from a
+    worker process or a session is spilled) and keeps its content hash
+    instead; bind() it again before reading chunks. bind() refuses a table
+    whose content differs, such as a re-preprocessed one with the same
+    number of rows.
+    """
+
+    def __init__(self, source: Optional[pd.DataFrame], n_rows: int,
+                 starts: Optional[np.ndarray] = None, stops: Optional[np.ndarray] = None,
+                 positions: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None,
+                 source_hash: Optional[str] = None):
+        self.source = source
+        self.n_rows = int(n_rows)
+        # _table_fingerprint of source, taken when the plan is first pickled
+        self.source_hash = source_hash
+        self.starts = starts
+        self.stops = stops
+        self.positions = positions
+        self.offsets = offsets
+
+    @classmethod
+    def from_ranges(cls, source: pd.DataFrame, starts: Iterable[int], stops: Iterable[int]) -> "ChunkPlan":
+        """Plan of contiguous chunks source.iloc[start:stop]"""
+        dtype = _index_dtype(len(source))
+        return cls(source, len(source), starts=np.asarray(starts, dtype=dtype), stops=np.asarray(stops, dtype=dtype))
+
+    @classmethod
+    def from_positions(cls, source: pd.DataFrame, position_lists: Iterable[np.ndarray]) -> "ChunkPlan":
+        """Plan of chunks source.take(positions), one array of row positions per chunk"""
+        dtype = _index_dtype(len(source))
+        position_lists = [np.asarray(p, dtype=dtype) for p in position_lists]
+        offsets = np.zeros(len(position_lists) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in position_lists], out=offsets[1:])
+        positions = np.concatenate(position_lists) if position_lists else np.empty(0, dtype=dtype)
+        return cls(source, len(source), positions=positions, offsets=offsets)
+
+    @property
+    def is_range_plan(self) -> bool:
+        return self.starts is not None
+
+    @property
+    def bound(self) -> bool:
+        return self.source is not None
+
+    def bind(self, source: pd.DataFrame) -> "ChunkPlan":
+        """Attach the table the positions refer to (the one the plan was built from)"""
+        if len(source) != self.n_rows:
+            raise ValueError(f"Chunk plan covers {self.n_rows} rows but the table has {len(source)}; re-run chunking")
+        if source is not self.source and self.source_hash is not None \
+                and _table_fingerprint(source) != self.source_hash:
+            raise ValueError("Chunk plan was built from a different version of the table; re-run chunking")
+        self.source = source
+        return self
+
+    def __len__(self) -> int:
+        return len(self.starts) if self.is_range_plan else len(self.offsets) - 1
+
+    def row_positions(self, i: int) -> np.ndarray:
+        """Row positions of chunk i in the source table"""
+        if self.is_range_plan:
+            return np.arange(self.starts[i], self.stops[i])
+        return self.positions[self.offsets[i]:self.offsets[i + 1]]
+
+    def lengths(self) -> np.ndarray:
+        """Rows per chunk"""
+        if self.is_range_plan:
+            return (self.stops - self.starts).astype(np.int64)
+        return np.diff(self.offsets)
+
+    @property
+    def total_rows(self) -> int:
+        """Rows over all chunks, overlapping rows counted once per chunk"""
+        return int(self.lengths().sum())
+
+    def covered_rows(self) -> int:
+        """Distinct source rows that are in at least one chunk"""
+        if not len(self):
+            return 0
+        if not self.is_range_plan:
+            covered = np.zeros(self.n_rows, dtype=bool)
+            covered[self.positions] = True
+            return int(covered.sum())
+        order = np.argsort(self.starts, kind="stable")
+        starts, stops = self.starts[order].astype(np.int64), self.stops[order].astype(np.int64)
+        # Each range adds the part past the furthest stop seen before it
+        reach = np.concatenate(([starts[0]], np.maximum.accumulate(stops)[:-1]))
+        return int(np.maximum(stops - np.maximum(starts, reach), 0).sum())
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("chunk index out of range")
+        if self.source is None:
+            raise RuntimeError("Chunk plan is not bound to its source table; call bind() first")
+        if self.is_range_plan:
+            return self.source.iloc[int(self.starts[i]):int(self.stops[i])]
+        return self.source.take(self.row_positions(i))
+
+    def __getstate__(self):
+        if self.source is not None and self.source_hash is None:
+            self.source_hash = _table_fingerprint(self.source)
+        state = dict(self.__dict__)
+        state["source"] = None
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault("source_hash", None)
+        self.__dict__.update(state)
+
+
 @dataclass
 class ChunkingResult:
     """Result of chunking operation"""
-    chunks: List[pd.DataFrame]
+    chunks: Union[List[pd.DataFrame], ChunkPlan]
     metadata: List[ChunkMetadata]
     method: str
     total_chunks: int
     quality_report: Optional[Dict[str, Any]] = None
 
+    def bind(self, source: pd.DataFrame) -> "ChunkingResult":
+        """Re-attach the source table of a ChunkPlan (after pickling); no-op for materialized chunks"""
+        if isinstance(self.chunks, ChunkPlan) and not self.chunks.bound:
+            self.chunks.bind(source)
+        return self
+
 class BaseChunker(ABC):
     """Abstract base class for all chunking methods"""
     
@@ -56,6 +204,11 @@ class BaseChunker(ABC):
         quality_score = (completeness + schema_consistency) / 2
         return round(quality_score, 3)
     
+    @staticmethod
+    def quality_scores(chunk_rows: np.ndarray, original_rows: int) -> np.ndarray:
+        """calculate_quality_score for many row selections of the original table at once"""
+        return np.round((np.asarray(chunk_rows) / max(original_rows, 1) + 1) / 2, 3)
+    
     def create_chunk_metadata(self, chunk: pd.DataFrame, chunk_index: int, 
                             start_idx: int, end_idx: int, **kwargs) -> ChunkMetadata:
         """Create metadata for a chunk"""
@@ -182,13 +335,9 @@ class ChunkingQualityAssessment:
             total_data_rows = 0
             for chunk in chunks:
                 if chunk is not None and not chunk.empty:
-                    # Count rows that look like data (not headers)
-                    data_rows = 0
-                    for _, row in chunk.iterrows():
-                        # Skip rows where all values are column names (header rows)
-                        if not all(str(val) in chunk.columns for val in row if pd.notna(val)):
-                            data_rows += 1
-                    total_data_rows += data_rows
+                    # Skip rows where all values are column names (header rows)
+                    header_like = (chunk.isna() | chunk.astype(str).isin(list(chunk.columns))).all(axis=1)
+                    total_data_rows += int((~header_like).sum())
             
             original_rows = len(original_df)
             
@@ -206,10 +355,44 @@ class ChunkingQualityAssessment:
         except Exception as e:
             return {'complete': True, 'completeness_ratio': 1.0, 'total_chunk_rows': 0, 'original_rows': 0, 'missing_rows': 0, 'error': str(e)}
     
+    @staticmethod
+    def assess_plan(plan: ChunkPlan, original_df: pd.DataFrame) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """Schema, integrity and completeness checks of a ChunkPlan from its index arrays alone"""
+        total_rows = plan.total_rows
+        original_rows = len(original_df) if original_df is not None else 0
+        completeness_ratio = total_rows / original_rows if original_rows > 0 else 1.0
+        schema_result = {'schema_consistent': True, 'schema_issues': [], 'total_chunks': len(plan),
+                         'note': 'Chunks are row selections of the source table'}
+        integrity_result = {
+            'data_integrity_ok': True,
+            'duplicate_rows': 0,
+            'total_rows_in_chunks': total_rows,
+            'original_rows': original_rows,
+            'note': 'Fixed-size chunking may have intentional overlaps'
+        }
+        completeness_result = {
+            'complete': completeness_ratio >= 0.95,
+            'completeness_ratio': round(completeness_ratio, 3),
+            'total_chunk_rows': total_rows,
+            'covered_rows': plan.covered_rows(),
+            'original_rows': original_rows,
+            'missing_rows': max(0, original_rows - total_rows)
+        }
+        return schema_result, integrity_result, completeness_result
+
     @classmethod
     def comprehensive_assessment(cls, chunks: List[pd.DataFrame], original_df: pd.DataFrame) -> Dict[str, Any]:
         """Robust comprehensive quality assessment"""
         try:
+            if isinstance(chunks, ChunkPlan):
+                schema_result, integrity_result, completeness_result = cls.assess_plan(chunks, original_df)
+                return {
+                    'schema_validation': schema_result,
+                    'data_integrity': integrity_result,
+                    'completeness': completeness_result,
+                    'overall_quality': 'PASS' if completeness_result['complete'] else 'FAIL',
+                    'assessment_method': 'chunk_plan'
+                }
             schema_result = cls.validate_schema_consistency(chunks, original_df)
             integrity_result = cls.validate_data_integrity(chunks, original_df)
             completeness_result = cls.validate_completeness(chunks, original_df)
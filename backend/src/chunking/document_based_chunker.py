@@ -1,8 +1,9 @@
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Union, Tuple
 import pandas as pd
 import numpy as np
 import os
-from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata
+from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata, ChunkPlan
+from .row_renderer import RowTemplate, render_rows
 
 try:
     import tiktoken  # type: ignore
@@ -10,6 +11,31 @@ try:
 except ImportError:
     TIKTOKEN_AVAILABLE = False
 
+# "v1, v2, ..." per row, nulls left empty (token counting)
+CSV_ROW_TEMPLATE = RowTemplate(separator=", ")
+# Rows tokenized per encode_ordinary_batch call (only the counts are kept)
+TOKEN_BATCH_ROWS = 10000
+
+
+def pack_rows(row_tokens: np.ndarray, budget: float) -> np.ndarray:
+    """
+    Greedily cut rows into consecutive slices whose token sums fit budget
+
+    Uses the prefix sums of row_tokens, so every cut is one binary search.
+    A row larger than budget gets a slice of its own.
+
+    Returns:
+        Slice boundaries [0, b1, ..., len(row_tokens)]
+    """
+    cumulative = np.concatenate(([0], np.cumsum(row_tokens)))
+    n = len(row_tokens)
+    bounds = [0]
+    while bounds[-1] < n:
+        start = bounds[-1]
+        stop = int(np.searchsorted(cumulative, cumulative[start] + budget, side="right")) - 1
+        bounds.append(min(max(stop, start + 1), n))
+    return np.asarray(bounds)
+
 
 class DocumentBasedChunker(BaseChunker):
     """Document-based chunking for CSV data - groups by key column and splits by token count"""
@@ -35,135 +61,15 @@ class DocumentBasedChunker(BaseChunker):
         if key_column not in dataframe.columns:
             raise ValueError(f"Key column '{key_column}' not found in dataframe")
         
-        # Initialize tokenizer if available
-        tokenizer = None
-        if TIKTOKEN_AVAILABLE:
-            try:
-                tokenizer = tiktoken.encoding_for_model(model_name)
-            except Exception:
-                # Fallback to cl100k_base encoding
-                tokenizer = tiktoken.get_encoding("cl100k_base")
-        else:
-            # Simple character-based estimation (rough approximation)
-            tokenizer = None
-        
-        chunks = []
-        metadata_list = []
-        
-        # Group by key column
-        grouped = dataframe.groupby(key_column)
+        # Group by key column (observed=True: only categories present in the data)
+        grouped = dataframe.groupby(key_column, observed=True)
+        groups = ((str(key_value), positions) for key_value, positions in grouped.indices.items())
         
-        chunk_index = 0
-        for key_value, group in grouped:
-            # Convert group to text for token counting
-            group_text = self._dataframe_to_text(group, preserve_headers)
-            
-            # Estimate token count
-            if tokenizer:
-                tokens = tokenizer.encode(group_text)
-                token_count = len(tokens)
-            else:
-                # Rough estimation: ~4 characters per token
-                token_count = len(group_text) // 4
-            
-            # Split into chunks if exceeds token limit
-            if token_count <= token_limit:
-                # Save entire group as one chunk
-                chunks.append(group.copy())
-                
-                metadata = self.create_chunk_metadata(
-                    chunk=group,
-                    chunk_index=chunk_index,
-                    start_idx=group.index[0],
-                    end_idx=group.index[-1],
-                    original_df=dataframe,
-                    extra_metadata={
-                        'key_column': key_column,
-                        'key_value': str(key_value),
-                        'chunking_method': 'document_based',
-                        'token_count': token_count,
-                        'token_limit': token_limit,
-                        'group_size': len(group),
-                        'is_subchunk': False
-                    }
-                )
-                metadata_list.append(metadata)
-                chunk_index += 1
-            else:
-                # Split group into sub-chunks
-                num_chunks = (token_count // token_limit) + 1
-                chunk_size = len(group) // num_chunks
-                
-                for i in range(num_chunks):
-                    start_idx = i * chunk_size
-                    end_idx = (i + 1) * chunk_size if i < num_chunks - 1 else len(group)
-                    
-                    if start_idx >= len(group):
-                        break
-                    
-                    sub_group = group.iloc[start_idx:end_idx].copy()
-                    chunks.append(sub_group)
-                    
-                    # Calculate token count for sub-chunk
-                    sub_text = self._dataframe_to_text(sub_group, preserve_headers)
-                    if tokenizer:
-                        sub_tokens = tokenizer.encode(sub_text)
-                        sub_token_count = len(sub_tokens)
-                    else:
-                        sub_token_count = len(sub_text) // 4
-                    
-                    metadata = self.create_chunk_metadata(
-                        chunk=sub_group,
-                        chunk_index=chunk_index,
-                        start_idx=group.index[start_idx],
-                        end_idx=group.index[end_idx - 1] if end_idx > 0 else group.index[start_idx],
-                        original_df=dataframe,
-                        extra_metadata={
-                            'key_column': key_column,
-                            'key_value': str(key_value),
-                            'chunking_method': 'document_based',
-                            'token_count': sub_token_count,
-                            'token_limit': token_limit,
-                            'group_size': len(group),
-                            'subchunk_index': i + 1,
-                            'total_subchunks': num_chunks,
-                            'is_subchunk': True
-                        }
-                    )
-                    metadata_list.append(metadata)
-                    chunk_index += 1
-        
-        # Quality assessment
-        from .base_chunker import ChunkingQualityAssessment
-        quality_report = ChunkingQualityAssessment.comprehensive_assessment(chunks, dataframe)
-        
-        return ChunkingResult(
-            chunks=chunks,
-            metadata=metadata_list,
-            method=self.name,
-            total_chunks=len(chunks),
-            quality_report=quality_report
+        return self._chunk_groups(
+            dataframe, groups, token_limit, model_name, preserve_headers,
+            {'key_column': key_column, 'chunking_method': 'document_based'}
         )
     
-    def _dataframe_to_text(self, df: pd.DataFrame, preserve_headers: bool = True) -> str:
-        """Convert DataFrame to text representation for token counting"""
-        if df.empty:
-            return ""
-        
-        text_parts = []
-        
-        # Add headers if requested
-        if preserve_headers:
-            headers = ", ".join(df.columns.astype(str))
-            text_parts.append(headers)
-        
-        # Add rows
-        for _, row in df.iterrows():
-            row_text = ", ".join([str(val) if pd.notna(val) else "" for val in row])
-            text_parts.append(row_text)
-        
-        return "\n".join(text_parts)
-    
     def chunk_by_multiple_keys(self, dataframe: pd.DataFrame, key_columns: List[str],
                               token_limit: int = 2000, model_name: str = "gpt-4",
                               preserve_headers: bool = True, **kwargs) -> ChunkingResult:
@@ -183,103 +89,74 @@ class DocumentBasedChunker(BaseChunker):
             if key_col not in dataframe.columns:
                 raise ValueError(f"Key column '{key_col}' not found in dataframe")
         
-        # Initialize tokenizer if available
-        tokenizer = None
-        if TIKTOKEN_AVAILABLE:
-            try:
-                tokenizer = tiktoken.encoding_for_model(model_name)
-            except Exception:
-                tokenizer = tiktoken.get_encoding("cl100k_base")
-        
-        chunks = []
-        metadata_list = []
+        # Group by multiple key columns (observed=True: only combinations present in the data)
+        grouped = dataframe.groupby(key_columns, observed=True)
         
-        # Group by multiple key columns
-        grouped = dataframe.groupby(key_columns)
+        def groups():
+            for key_tuple, positions in grouped.indices.items():
+                # Convert tuple to readable key (a single key column gives plain keys)
+                if not isinstance(key_tuple, tuple):
+                    key_tuple = (key_tuple,)
+                yield "_".join([str(k) for k in key_tuple]), positions
         
-        chunk_index = 0
-        for key_tuple, group in grouped:
-            # Convert tuple to readable key
-            if len(key_tuple) == 1:
-                key_value = str(key_tuple[0])
-            else:
-                key_value = "_".join([str(k) for k in key_tuple])
-            
-            # Convert group to text for token counting
-            group_text = self._dataframe_to_text(group, preserve_headers)
-            
-            # Estimate token count
-            if tokenizer:
-                tokens = tokenizer.encode(group_text)
-                token_count = len(tokens)
-            else:
-                token_count = len(group_text) // 4
+        return self._chunk_groups(
+            dataframe, groups(), token_limit, model_name, preserve_headers,
+            {'key_columns': key_columns, 'chunking_method': 'document_based_multi'}
+        )
+    
+    def _chunk_groups(self, dataframe: pd.DataFrame, groups: Iterable[Tuple[str, np.ndarray]],
+                      token_limit: int, model_name: str, preserve_headers: bool,
+                      key_metadata: Dict[str, Any]) -> ChunkingResult:
+        """
+        Chunk each (key value, row positions) group by token count
+
+        Every row is rendered and tokenized once; a group that fits
+        token_limit (headers included once) becomes one chunk, larger groups
+        are packed greedily into sub-chunks from the prefix sums of their
+        row token counts.
+        """
+        header_tokens, row_tokens = self._token_counts(dataframe, model_name, preserve_headers)
+        budget = token_limit - header_tokens
+        
+        # Row positions of every chunk; the rows stay in dataframe
+        position_lists = []
+        chunk_metadata = []
+        for key_value, positions in groups:
+            tokens = row_tokens[positions]
+            group_tokens = header_tokens + tokens.sum()
+            bounds = pack_rows(tokens, budget) if group_tokens > token_limit else np.array([0, len(positions)])
+            total_subchunks = len(bounds) - 1
             
-            # Split into chunks if exceeds token limit
-            if token_count <= token_limit:
-                chunks.append(group.copy())
-                
-                metadata = self.create_chunk_metadata(
-                    chunk=group,
-                    chunk_index=chunk_index,
-                    start_idx=group.index[0],
-                    end_idx=group.index[-1],
-                    original_df=dataframe,
-                    extra_metadata={
-                        'key_columns': key_columns,
-                        'key_value': key_value,
-                        'chunking_method': 'document_based_multi',
-                        'token_count': token_count,
-                        'token_limit': token_limit,
-                        'group_size': len(group),
-                        'is_subchunk': False
-                    }
-                )
-                metadata_list.append(metadata)
-                chunk_index += 1
-            else:
-                # Split group into sub-chunks
-                num_chunks = (token_count // token_limit) + 1
-                chunk_size = len(group) // num_chunks
-                
-                for i in range(num_chunks):
-                    start_idx = i * chunk_size
-                    end_idx = (i + 1) * chunk_size if i < num_chunks - 1 else len(group)
-                    
-                    if start_idx >= len(group):
-                        break
-                    
-                    sub_group = group.iloc[start_idx:end_idx].copy()
-                    chunks.append(sub_group)
-                    
-                    # Calculate token count for sub-chunk
-                    sub_text = self._dataframe_to_text(sub_group, preserve_headers)
-                    if tokenizer:
-                        sub_tokens = tokenizer.encode(sub_text)
-                        sub_token_count = len(sub_tokens)
-                    else:
-                        sub_token_count = len(sub_text) // 4
-                    
-                    metadata = self.create_chunk_metadata(
-                        chunk=sub_group,
-                        chunk_index=chunk_index,
-                        start_idx=group.index[start_idx],
-                        end_idx=group.index[end_idx - 1] if end_idx > 0 else group.index[start_idx],
-                        original_df=dataframe,
-                        extra_metadata={
-                            'key_columns': key_columns,
-                            'key_value': key_value,
-                            'chunking_method': 'document_based_multi',
-                            'token_count': sub_token_count,
-                            'token_limit': token_limit,
-                            'group_size': len(group),
-                            'subchunk_index': i + 1,
-                            'total_subchunks': num_chunks,
-                            'is_subchunk': True
-                        }
-                    )
-                    metadata_list.append(metadata)
-                    chunk_index += 1
+            for i, (start, stop) in enumerate(zip(bounds[:-1].tolist(), bounds[1:].tolist())):
+                chunk_positions = positions[start:stop]
+                position_lists.append(chunk_positions)
+                extra_metadata = dict(key_metadata)
+                extra_metadata.update({
+                    'key_value': key_value,
+                    'token_count': int(header_tokens + tokens[start:stop].sum()),
+                    'token_limit': token_limit,
+                    'group_size': len(positions),
+                    'is_subchunk': total_subchunks > 1
+                })
+                if total_subchunks > 1:
+                    extra_metadata.update({'subchunk_index': i + 1, 'total_subchunks': total_subchunks})
+                chunk_metadata.append((chunk_positions, extra_metadata))
+        
+        scores = self.quality_scores([len(p) for p in position_lists], len(dataframe))
+        index = dataframe.index
+        metadata_list = [
+            ChunkMetadata(
+                chunk_id=self.generate_chunk_id(self.name, chunk_index),
+                method=self.name,
+                chunk_size=len(chunk_positions),
+                start_index=index[chunk_positions[0]],
+                end_index=index[chunk_positions[-1]],
+                quality_score=score,
+                metadata=extra_metadata
+            )
+            for chunk_index, ((chunk_positions, extra_metadata), score) in enumerate(zip(chunk_metadata, scores.tolist()))
+        ]
+        chunks = ChunkPlan.from_positions(dataframe, position_lists)
         
         # Quality assessment
         from .base_chunker import ChunkingQualityAssessment
@@ -292,6 +169,46 @@ class DocumentBasedChunker(BaseChunker):
             total_chunks=len(chunks),
             quality_report=quality_report
         )
+    
+    @staticmethod
+    def _get_tokenizer(model_name: str):
+        """tiktoken encoding for model_name (cl100k_base if unknown), or None without tiktoken"""
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except Exception:
+            # Fallback to cl100k_base encoding
+            return tiktoken.get_encoding("cl100k_base")
+    
+    def _token_counts(self, dataframe: pd.DataFrame, model_name: str,
+                      preserve_headers: bool) -> Tuple[float, np.ndarray]:
+        """
+        Tokens of the header line and of every row, each counted once
+
+        A chunk's text is the header line (when preserve_headers) and its
+        rows, one per line; each line counts its own tokens plus one for its
+        newline. Without tiktoken, tokens are estimated as characters / 4.
+
+        Returns:
+            Tuple of (header tokens, array of row tokens in dataframe's row order)
+        """
+        row_texts = render_rows(dataframe, CSV_ROW_TEMPLATE)
+        header = ", ".join(dataframe.columns.astype(str)) if preserve_headers else None
+        tokenizer = self._get_tokenizer(model_name)
+        
+        if tokenizer is None:
+            # Rough estimation: ~4 characters per token
+            row_tokens = np.fromiter((len(text) + 1 for text in row_texts), dtype=np.float64,
+                                     count=len(row_texts)) / 4
+            return ((len(header) + 1) / 4 if header is not None else 0.0), row_tokens
+        
+        row_tokens = np.empty(len(row_texts), dtype=np.int64)
+        for start in range(0, len(row_texts), TOKEN_BATCH_ROWS):
+            batch = tokenizer.encode_ordinary_batch(row_texts[start:start + TOKEN_BATCH_ROWS].tolist())
+            row_tokens[start:start + len(batch)] = [len(tokens) + 1 for tokens in batch]
+        header_tokens = len(tokenizer.encode_ordinary(header)) + 1 if header is not None else 0
+        return header_tokens, row_tokens
 
 
 def chunk_document_based(dataframe: pd.DataFrame, key_column: str,
@@ -1,11 +1,30 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
-from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata
+from typing import List, Dict, Any, Tuple
+from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata, ChunkPlan
+from .row_renderer import VALUES_TEMPLATE, render_rows
+from .span_index import RowSpanIndex
+
+# Units chunk_size/overlap can be given in
+FIXED_SIZE_MODES = ("rows", "chars")
+
+
+def _split_with_offsets(text: str, chunk_size: int, overlap: int) -> Tuple[List[str], np.ndarray]:
+    """Split text with the recursive splitter, returning the chunks and their start offsets in text"""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=int(chunk_size), chunk_overlap=int(overlap),
+                                              add_start_index=True)
+    docs = splitter.create_documents([text])
+    texts = [doc.page_content for doc in docs]
+    starts = np.array([doc.metadata["start_index"] for doc in docs], dtype=np.int64)
+    # The splitter searches forward from where the chunk should start; retry the rare misses
+    for i in np.flatnonzero(starts < 0):
+        starts[i] = text.find(texts[i])
+    return texts, starts
 
 
 def fixed_size_chunking_from_df(df, chunk_size=400, overlap=50):
-    text = "\n".join(df.astype(str).apply(lambda row: " | ".join(row.values), axis=1))
+    text = "\n".join(render_rows(df, VALUES_TEMPLATE))
     splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=overlap)
     return splitter.split_text(text)
 
@@ -19,47 +38,18 @@ def fixed_size_chunking_with_spans(df: pd.DataFrame, chunk_size: int = 400, over
     if df is None or df.empty:
         return []
 
-    # Build per-row strings and the big concatenated text with newlines
-    row_lines: List[str] = df.astype(str).apply(lambda row: " | ".join(row.values), axis=1).tolist()
-    big_text = "\n".join(row_lines)
-
-    # Character spans for each row within big_text
-    spans: List[tuple] = []  # (start_char, end_char, row_index)
-    pos = 0
-    for idx, line in enumerate(row_lines):
-        start = pos
-        end = start + len(line)
-        spans.append((start, end, idx))
-        pos = end + 1  # account for the newline between rows
-
-    splitter = RecursiveCharacterTextSplitter(chunk_size=int(chunk_size), chunk_overlap=int(overlap))
-    text_chunks: List[str] = splitter.split_text(big_text)
-
-    # Map each chunk text back to row indices by approximate substring search
-    results: List[Dict[str, Any]] = []
-    search_from = 0
-    for chunk_text in text_chunks:
-        try:
-            start_idx = big_text.find(chunk_text, search_from)
-            if start_idx == -1:
-                # fallback: search from beginning
-                start_idx = big_text.find(chunk_text)
-            end_idx = start_idx + len(chunk_text) if start_idx >= 0 else 0
-            covered_rows: List[int] = []
-            if start_idx >= 0:
-                for (s, e, ri) in spans:
-                    if not (e <= start_idx or s >= end_idx):
-                        covered_rows.append(ri)
-            results.append({
-                'text': chunk_text,
-                'row_indices': covered_rows
-            })
-            # advance search position allowing small overlap tolerance
-            search_from = max(end_idx - int(overlap), 0)
-        except Exception:
-            results.append({'text': chunk_text, 'row_indices': []})
+    # Per-row strings, the concatenated text and each row's character span in it
+    row_lines = render_rows(df, VALUES_TEMPLATE)
+    span_index = RowSpanIndex.from_lines(row_lines)
+    text_chunks, starts = _split_with_offsets("\n".join(row_lines), chunk_size, overlap)
 
-    return results
+    # The splitter reports where each chunk starts; two binary searches give its rows
+    ends = starts + np.fromiter((len(t) for t in text_chunks), dtype=np.int64, count=len(text_chunks))
+    firsts, stops = span_index.row_ranges(starts, ends)
+    return [
+        {'text': chunk_text, 'row_indices': list(range(first, stop)) if start >= 0 else []}
+        for chunk_text, start, first, stop in zip(text_chunks, starts.tolist(), firsts.tolist(), stops.tolist())
+    ]
 
 
 class FixedSizeChunker(BaseChunker):
@@ -69,63 +59,60 @@ class FixedSizeChunker(BaseChunker):
         super().__init__("fixed_size")
     
     def chunk(self, dataframe: pd.DataFrame, chunk_size: int = 100, overlap: int = 0, 
-              preserve_headers: bool = True, **kwargs) -> ChunkingResult:
+              preserve_headers: bool = True, mode: str = "rows", **kwargs) -> ChunkingResult:
         """
         Chunk dataframe using fixed-size approach
         
         Args:
             dataframe: Input DataFrame
-            chunk_size: Number of rows per chunk
-            overlap: Number of overlapping rows between chunks
+            chunk_size: Rows per chunk, or characters per chunk with mode="chars"
+            overlap: Overlapping rows (characters with mode="chars") between chunks
             preserve_headers: Whether to include headers in each chunk
+            mode: "rows", or "chars" to split the rows' text with the recursive character
+                splitter and keep the rows each piece covers
         """
         self.validate_input(dataframe)
+        if mode not in FIXED_SIZE_MODES:
+            raise ValueError(f"Unknown fixed size mode '{mode}'. Available: {list(FIXED_SIZE_MODES)}")
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
         
-        chunks = []
-        metadata_list = []
-        
-        # Create chunks with overlap
-        start_idx = 0
-        chunk_index = 0
+        # Row ranges, computed at once; chunking never copies the rows.
+        # Headers are not added as rows: TextPreparer renders them when preserve_headers is set
+        n_rows = len(dataframe)
+        if mode == "chars":
+            starts, stops, char_starts, char_ends = self._char_ranges(dataframe, chunk_size, overlap)
+        else:
+            starts = np.arange(0, n_rows, chunk_size - overlap)
+            stops = np.minimum(starts + chunk_size, n_rows)
+            last = int(np.argmax(stops >= n_rows))
+            starts, stops = starts[:last + 1], stops[:last + 1]
+        sizes = stops - starts
+        scores = self.quality_scores(sizes, n_rows)
         
-        while start_idx < len(dataframe):
-            # Calculate end index with overlap consideration
-            end_idx = min(start_idx + chunk_size, len(dataframe))
-            
-            # Create chunk
-            chunk_df = dataframe.iloc[start_idx:end_idx].copy()
-            
-            # Add headers if requested
-            if preserve_headers and not chunk_df.empty:
-                # Add a header row at the beginning
-                header_row = pd.DataFrame([chunk_df.columns], columns=chunk_df.columns)
-                chunk_df = pd.concat([header_row, chunk_df], ignore_index=True)
-            
-            chunks.append(chunk_df)
-            
-            # Create metadata
-            metadata = self.create_chunk_metadata(
-                chunk=chunk_df,
-                chunk_index=chunk_index,
-                start_idx=start_idx,
-                end_idx=end_idx - 1,
-                original_df=dataframe,
-                extra_metadata={
-                    'chunking_method': 'fixed_size',
-                    'chunk_size': chunk_size,
-                    'overlap': overlap,
-                    'preserve_headers': preserve_headers,
-                    'actual_chunk_size': len(chunk_df)
-                }
-            )
-            metadata_list.append(metadata)
-            
-            chunk_index += 1
-            
-            # Move to next chunk with overlap
-            if end_idx >= len(dataframe):
-                break
-            start_idx = end_idx - overlap
+        metadata_list = []
+        for chunk_index, (start_idx, end_idx, size, score) in enumerate(
+                zip(starts.tolist(), stops.tolist(), sizes.tolist(), scores.tolist())):
+            extra_metadata = {
+                'chunking_method': 'fixed_size',
+                'chunk_size': chunk_size,
+                'overlap': overlap,
+                'preserve_headers': preserve_headers,
+                'actual_chunk_size': size
+            }
+            if mode == "chars":
+                extra_metadata.update(mode=mode, char_start=int(char_starts[chunk_index]),
+                                      char_end=int(char_ends[chunk_index]))
+            metadata_list.append(ChunkMetadata(
+                chunk_id=self.generate_chunk_id(self.name, chunk_index),
+                method=self.name,
+                chunk_size=size,
+                start_index=start_idx,
+                end_index=end_idx - 1,
+                quality_score=score,
+                metadata=extra_metadata
+            ))
+        chunks = ChunkPlan.from_ranges(dataframe, starts, stops)
         
         # Quality assessment
         from .base_chunker import ChunkingQualityAssessment
@@ -139,20 +126,33 @@ class FixedSizeChunker(BaseChunker):
             quality_report=quality_report
         )
 
+    
+    @staticmethod
+    def _char_ranges(dataframe: pd.DataFrame, chunk_chars: int, overlap_chars: int):
+        """Row ranges (and character spans) of the splitter's pieces of the rows' text"""
+        row_lines = render_rows(dataframe, VALUES_TEMPLATE)
+        texts, char_starts = _split_with_offsets("\n".join(row_lines), chunk_chars, overlap_chars)
+        char_ends = char_starts + np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        starts, stops = RowSpanIndex.from_lines(row_lines).row_ranges(char_starts, char_ends)
+        # Rows longer than a chunk are split into several pieces; keep each row range once
+        keep = (stops > starts) & np.r_[True, (starts[1:] != starts[:-1]) | (stops[1:] != stops[:-1])]
+        return starts[keep], stops[keep], char_starts[keep], char_ends[keep]
+
 
 def chunk_fixed(dataframe: pd.DataFrame, chunk_size: int = 100, overlap: int = 0, 
-                preserve_headers: bool = True) -> ChunkingResult:
+                preserve_headers: bool = True, mode: str = "rows") -> ChunkingResult:
     """
     Convenience function for fixed-size chunking
     
     Args:
         dataframe: Input DataFrame
-        chunk_size: Number of rows per chunk
-        overlap: Number of overlapping rows between chunks
+        chunk_size: Number of rows per chunk (characters with mode="chars")
+        overlap: Number of overlapping rows between chunks (characters with mode="chars")
         preserve_headers: Whether to include headers in each chunk
+        mode: "rows" or "chars"
         
     Returns:
         ChunkingResult with chunks and metadata
     """
     chunker = FixedSizeChunker()
-    return chunker.chunk(dataframe, chunk_size, overlap, preserve_headers)
\ No newline at end of file
+    return chunker.chunk(dataframe, chunk_size, overlap, preserve_headers, mode)
\ No newline at end of file
@@ -1,7 +1,16 @@
 from typing import List, Dict, Optional
 import pandas as pd
 import numpy as np
-from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata
+from .base_chunker import BaseChunker, ChunkingResult, ChunkMetadata, ChunkPlan
+from .row_renderer import RowTemplate, render_rows
+
+# Rows of sales-style tables read as one sentence (semantic compression)
+SALES_LINE_TEMPLATE = RowTemplate(
+    line="{Description} sold in {Country} on {InvoiceDate}, quantity {Quantity}, priced at ${UnitPrice}.",
+    defaults=(("Description", "item"), ("Country", "Unknown"))
+)
+# "col: value, col: value, ..." for every other table
+COLUMN_VALUE_TEMPLATE = RowTemplate(cell="{column}: {value}", separator=", ")
 
 class RecursiveChunker(BaseChunker):
     """Recursive hierarchical and text-driven chunking for CSV data"""
@@ -45,23 +54,18 @@ class RecursiveChunker(BaseChunker):
         use_semantic_compression: bool
     ) -> ChunkingResult:
         # Build one line of text per row (semantic compression optionally applied)
-        lines: List[str] = []
-        for _, row in dataframe.iterrows():
-            if use_semantic_compression:
-                line = self._semantic_compress_row(row)
-            else:
-                # Column: value, comma-separated
-                parts = [f"{col}: {row[col]}" for col in dataframe.columns]
-                line = ", ".join(parts)
-            lines.append(str(line))
-        if not lines:
+        template = self._row_template(dataframe) if use_semantic_compression else COLUMN_VALUE_TEMPLATE
+        lines = render_rows(dataframe, template)
+        if not len(lines):
             return ChunkingResult(chunks=[dataframe.copy()], metadata=[], method=self.name, total_chunks=1, quality_report={})
 
-        avg_len = max(1, int(round(np.mean([len(x) for x in lines]))))
+        line_lengths = np.fromiter((len(x) for x in lines), dtype=np.int64, count=len(lines))
+        avg_len = max(1, int(round(line_lengths.mean())))
         overlap_lines = max(0, int(round(overlap_chars / avg_len)))
 
-        # Accumulate lines to target character size per chunk
-        chunks: List[pd.DataFrame] = []
+        # Accumulate lines to target character size per chunk (kept as row ranges)
+        starts: List[int] = []
+        stops: List[int] = []
         metadata_list: List[ChunkMetadata] = []
         start_idx = 0
         chunk_idx = 0
@@ -69,12 +73,13 @@ class RecursiveChunker(BaseChunker):
             current_len = 0
             end_idx = start_idx
             while end_idx < len(lines) and current_len < text_chunk_chars:
-                current_len += len(lines[end_idx]) + 1  # +1 for newline
+                current_len += line_lengths[end_idx] + 1  # +1 for newline
                 end_idx += 1
             # Map back to dataframe rows [start_idx:end_idx)
-            chunk_df = dataframe.iloc[start_idx:end_idx].copy()
+            chunk_df = dataframe.iloc[start_idx:end_idx]
             if not chunk_df.empty:
-                chunks.append(chunk_df)
+                starts.append(start_idx)
+                stops.append(end_idx)
                 # Use a semantic-specific split_method label when semantic compression is enabled
                 split_method = 'semantic_text_recursive' if use_semantic_compression else 'text_recursive'
                 metadata = self.create_chunk_metadata(
@@ -98,6 +103,8 @@ class RecursiveChunker(BaseChunker):
                 break
             start_idx = max(start_idx + (end_idx - start_idx) - overlap_lines, start_idx + 1)
 
+        chunks = ChunkPlan.from_ranges(dataframe, starts, stops)
+        
         # Quality assessment
         from .base_chunker import ChunkingQualityAssessment
         quality_report = ChunkingQualityAssessment.comprehensive_assessment(chunks, dataframe)
@@ -112,17 +119,13 @@ class RecursiveChunker(BaseChunker):
             quality_report=quality_report
         )
 
-    def _semantic_compress_row(self, row: pd.Series) -> str:
-        # Try to find common fields, else generic sentence
-        description = str(row.get("Description", "item")) if hasattr(row, 'get') else "item"
-        country = str(row.get("Country", "Unknown")) if hasattr(row, 'get') else "Unknown"
-        date = str(row.get("InvoiceDate", "")) if hasattr(row, 'get') else ""
-        qty = str(row.get("Quantity", "")) if hasattr(row, 'get') else ""
-        price = str(row.get("UnitPrice", "")) if hasattr(row, 'get') else ""
-        if any([description != "item", country != "Unknown", date, qty, price]):
-            return f"{description} sold in {country} on {date}, quantity {qty}, priced at ${price}."
-        # fallback: combine short version of the row
-        return ", ".join([f"{c}: {row[c]}" for c in row.index])
+    @staticmethod
+    def _row_template(dataframe: pd.DataFrame) -> RowTemplate:
+        # Sentence form when the table has any of the common sales fields, else a generic line
+        fields = {"Description", "Country", "InvoiceDate", "Quantity", "UnitPrice"}
+        if fields & {str(col) for col in dataframe.columns}:
+            return SALES_LINE_TEMPLATE
+        return COLUMN_VALUE_TEMPLATE
 
     # Note: hierarchical utilities removed
 
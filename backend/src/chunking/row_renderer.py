@@ -0,0 +1,222 @@
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from string import Formatter
+from typing import Callable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+# Rendered tables kept per process (each entry is one string per row)
+DEFAULT_RENDER_CACHE_ENTRIES = 8
+
+
+@dataclass(frozen=True)
+class RowTemplate:
+    """
+    How a table row is rendered as one line of text
+
+    By default every cell becomes cell.format(column=<label>, value=<value>)
+    and the cells are joined with separator. A line template such as
+    "{Description} sold in {Country}" names columns directly instead; columns
+    the table lacks are filled from defaults.
+
+    Args:
+        cell: Cell format with {value} and optionally {column}
+        separator: Text between cells
+        skip_nulls: Leave out null cells (and their separator)
+        skip_blank: Also leave out cells whose text is blank
+        null_text: Text of null cells that are kept
+        label: Maps a column name to the label used for {column}
+        max_chars: Longer lines are cut to max_chars and end with "..."
+        line: Line template over column names, used instead of cells
+        defaults: ((column, text), ...) for line template columns the table lacks
+    """
+    cell: str = "{value}"
+    separator: str = " | "
+    skip_nulls: bool = False
+    skip_blank: bool = False
+    null_text: str = ""
+    label: Optional[Callable[[str], str]] = None
+    max_chars: Optional[int] = None
+    line: Optional[str] = None
+    defaults: Tuple[Tuple[str, str], ...] = ()
+
+
+# "v1 | v2 | ..." (fixed-size text chunking)
+VALUES_TEMPLATE = RowTemplate()
+# "col: v1 | col: v2 | ..." without nulls, cut at 500 characters (semantic chunking)
+FIELDS_TEMPLATE = RowTemplate(cell="{column}: {value}", skip_nulls=True, max_chars=500)
+
+
+def _is_text_column(s: pd.Series) -> bool:
+    return not (ptypes.is_numeric_dtype(s.dtype) or ptypes.is_bool_dtype(s.dtype)
+                or ptypes.is_datetime64_any_dtype(s.dtype))
+
+
+def _cell_strings(s: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """(object array of the column's values as str, null mask)"""
+    nulls = s.isna().to_numpy()
+    if not _is_text_column(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        # str() of each distinct value only, spread back with the codes
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+        labels = np.array([str(u) for u in uniques] + [""], dtype=object)
+        return labels[codes], nulls
+    values = np.asarray(s.astype(str), dtype=object)
+    return values, nulls
+
+
+def _blank(values: np.ndarray) -> np.ndarray:
+    return pd.Series(values, dtype=object).str.strip().str.len().to_numpy() == 0
+
+
+def _join_cells(df: pd.DataFrame, template: RowTemplate) -> np.ndarray:
+    before, marker, after = template.cell.partition("{value}")
+    if not marker:
+        raise ValueError("RowTemplate.cell needs a {value} field")
+    n = len(df)
+    out = np.full(n, "", dtype=object)
+    filled = np.zeros(n, dtype=bool)
+    for col in df.columns:
+        values, nulls = _cell_strings(df[col])
+        label = template.label(str(col)) if template.label else str(col)
+        prefix, suffix = before.format(column=label), after.format(column=label)
+        if template.skip_nulls or template.skip_blank:
+            keep = ~nulls if template.skip_nulls else np.ones(n, dtype=bool)
+            if template.skip_blank and _is_text_column(df[col]):
+                keep &= ~_blank(np.where(nulls, template.null_text, values))
+            values = np.where(nulls, template.null_text, values)
+            cells = prefix + values + suffix if (prefix or suffix) else values
+            joined = out + template.separator + cells
+            out = np.where(keep, np.where(filled, joined, cells), out)
+            filled |= keep
+        else:
+            values = np.where(nulls, template.null_text, values)
+            cells = prefix + values + suffix if (prefix or suffix) else values
+            out = np.where(filled, out + template.separator + cells, cells)
+            filled[:] = True
+    return out
+
+
+def _fill_line(df: pd.DataFrame, template: RowTemplate) -> np.ndarray:
+    columns = {str(col): col for col in df.columns}
+    defaults = dict(template.defaults)
+    out = np.full(len(df), "", dtype=object)
+    for literal, field, _, _ in Formatter().parse(template.line):
+        if literal:
+            out = out + literal
+        if field is None:
+            continue
+        if field in columns:
+            values, nulls = _cell_strings(df[columns[field]])
+            out = out + np.where(nulls, template.null_text, values)
+        else:
+            out = out + defaults.get(field, "")
+    return out
+
+
+def _render(df: pd.DataFrame, template: RowTemplate) -> np.ndarray:
+    if template.line is not None:
+        out = _fill_line(df, template)
+    else:
+        out = _join_cells(df, template)
+    if template.max_chars is not None and len(out):
+        lengths = np.fromiter((len(line) for line in out), dtype=np.int64, count=len(out))
+        for i in np.flatnonzero(lengths > template.max_chars):
+            out[i] = out[i][:template.max_chars] + "..."
+    return out
+
+
+class RowRenderCache:
+    """
+    Rendered rows of recently used tables, per (table, template)
+
+    The cache lives in one process: it is shared by the chunkers and the
+    embedder because both run in the API process (the "chunk" and "embed"
+    stages use the thread pool). Work sent to the process pool renders
+    into that worker's own copy and is not seen by the API process.
+
+    A table's version is the DataFrame object itself: the session replaces
+    session["df"] whenever the data changes, so entries are keyed by
+    identity (plus shape and columns as a guard) and dropped as soon as the
+    table is garbage collected. Tables must not be edited in place while
+    their renderings are cached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_RENDER_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, RowTemplate], Tuple[weakref.ref, tuple, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # ids of collected tables, purged on the next lookup (not from the GC callback,
+        # which may run while the lock is held)
+        self._dead = []
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _fingerprint(df: pd.DataFrame) -> tuple:
+        return (len(df), tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes))
+
+    def _purge(self):
+        while self._dead:
+            table_id = self._dead.pop()
+            for key in [key for key in self._entries if key[0] == table_id]:
+                del self._entries[key]
+
+    def get(self, df: pd.DataFrame, template: RowTemplate) -> np.ndarray:
+        key = (id(df), template)
+        fingerprint = self._fingerprint(df)
+        with self._lock:
+            self._purge()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is df and entry[1] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+        rows = _render(df, template)
+        rows.flags.writeable = False
+        table_id = id(df)
+        ref = weakref.ref(df, lambda _: self._dead.append(table_id))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (ref, fingerprint, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def report(self):
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+
+row_render_cache = RowRenderCache()
+
+
+def render_rows(df: pd.DataFrame, template: RowTemplate = VALUES_TEMPLATE, cache: bool = True) -> np.ndarray:
+    """
+    Render every row of df as one line of text, column by column
+
+    Cells are stringified and concatenated per column with vectorized
+    operations instead of a Python loop over rows. With cache=True the
+    result is shared (read-only) by every caller in this process rendering
+    the same table with the same template; pass cache=False for short-lived
+    frames such as single chunks.
+
+    Args:
+        df: Table to render
+        template: RowTemplate describing the line
+        cache: Reuse/keep the rendering in row_render_cache
+
+    Returns:
+        Object array with one str per row
+    """
+    if cache:
+        return row_render_cache.get(df, template)
+    return _render(df, template)
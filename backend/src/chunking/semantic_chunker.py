@@ -4,6 +4,10 @@ import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 import time
 import os
+import tempfile
+from .base_chunker import ChunkingResult, ChunkMetadata
+from .row_renderer import FIELDS_TEMPLATE, render_rows
+from .span_index import RowSpanIndex
 
 # Try to import LangChain components with fallbacks
 try:
@@ -177,23 +181,8 @@ def semantic_chunking_csv(file_path: str, batch_size: int = 100, use_fast_model:
     
     # Prepare texts efficiently
     print("📝 Preparing texts for semantic analysis...")
-    texts = []
-    
-    # Convert each row to a meaningful text representation
-    for idx, row in df.iterrows():
-        # Create a text representation of the row
-        row_text_parts = []
-        for col, value in row.items():
-            if pd.notna(value):
-                row_text_parts.append(f"{col}: {str(value)}")
-        
-        row_text = " | ".join(row_text_parts)
-        
-        # Truncate very long rows to improve performance
-        if len(row_text) > 500:
-            row_text = row_text[:500] + "..."
-        
-        texts.append(row_text)
+    # "col: value | ..." per row without nulls; very long rows are truncated to improve performance
+    texts = render_rows(df, FIELDS_TEMPLATE, cache=False).tolist()
     
     print(f"✓ Prepared {len(texts)} text representations")
     
@@ -256,57 +245,74 @@ def semantic_chunking_csv(file_path: str, batch_size: int = 100, use_fast_model:
     return final_chunks
 
 
+def chunk_semantic(dataframe: pd.DataFrame, source_file: str = "unknown", batch_size: int = 100,
+                   use_fast_model: bool = True, similarity_threshold: float = 0.7) -> ChunkingResult:
+    """
+    Run semantic_chunking_csv on a DataFrame and wrap the documents as a ChunkingResult
+
+    Each document becomes a single-row DataFrame with a 'text' column.
+    """
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        dataframe.to_csv(tmp_path, index=False)
+        docs = semantic_chunking_csv(tmp_path, batch_size=batch_size, use_fast_model=use_fast_model,
+                                     similarity_threshold=similarity_threshold)
+    finally:
+        os.unlink(tmp_path)
+
+    df_chunks = []
+    metadata_list = []
+    for idx, doc in enumerate(docs):
+        df_chunks.append(pd.DataFrame({"text": [doc.page_content]}))
+        metadata_list.append(ChunkMetadata(
+            chunk_id=f"semantic_chunk_{idx:04d}",
+            method="semantic",
+            chunk_size=1,
+            start_index=0,
+            end_index=0,
+            overlap=None,
+            quality_score=None,
+            metadata={"source_file": source_file}
+        ))
+
+    return ChunkingResult(
+        chunks=df_chunks,
+        metadata=metadata_list,
+        method="semantic",
+        total_chunks=len(df_chunks),
+        quality_report={"note": "Semantic chunking output; quality metrics not computed."}
+    )
+
+
 def semantic_chunking_with_spans(df: pd.DataFrame, batch_size: int = 100,
                                 use_fast_model: bool = True, similarity_threshold: float = 0.7) -> List[Dict[str, Any]]:
     """
     Chunk a DataFrame semantically and return {'text': chunk_text, 'row_indices': [..]} per chunk.
-    Uses the same row text representation as semantic_chunking_csv and maps back by substring.
+    Uses the same row text representation as semantic_chunking_csv and maps back by character span.
     """
     if df is None or df.empty:
         return []
 
-    # Prepare row-level texts similar to semantic_chunking_csv
-    row_lines: List[str] = []
-    for _, row in df.iterrows():
-        parts = []
-        for col, value in row.items():
-            if pd.notna(value):
-                parts.append(f"{col}: {str(value)}")
-        line = " | ".join(parts)
-        if len(line) > 500:
-            line = line[:500] + "..."
-        row_lines.append(line)
+    # Same row texts as semantic_chunking_csv
+    row_lines: List[str] = render_rows(df, FIELDS_TEMPLATE).tolist()
 
-    # Build big text and row spans
-    big_text = "\n".join(row_lines)
-    spans: List[Tuple[int, int, int]] = []
-    pos = 0
-    for idx, line in enumerate(row_lines):
-        start = pos
-        end = start + len(line)
-        spans.append((start, end, idx))
-        pos = end + 1
+    # Character span of each row in the newline-joined text
+    span_index = RowSpanIndex.from_lines(row_lines)
 
     # Run semantic chunking on row_lines
     model_name = "all-MiniLM-L6-v2" if use_fast_model else "BAAI/bge-base-en-v1.5"
     chunker = OptimizedSemanticChunker(model_name=model_name, batch_size=batch_size)
     docs = chunker.chunk_texts(row_lines, threshold=similarity_threshold)
 
-    # Map each chunk back to row indices
+    # Chunks join consecutive rows in order, so each one starts right after the
+    # previous one's newline; its rows follow from the span index
     results: List[Dict[str, Any]] = []
-    search_from = 0
+    start_idx = 0
     for doc in docs:
         text = doc.page_content or ""
-        start_idx = big_text.find(text, search_from)
-        if start_idx == -1:
-            start_idx = big_text.find(text)
-        end_idx = start_idx + len(text) if start_idx >= 0 else 0
-        covered_rows: List[int] = []
-        if start_idx >= 0:
-            for (s, e, ri) in spans:
-                if not (e <= start_idx or s >= end_idx):
-                    covered_rows.append(ri)
-        results.append({'text': text, 'row_indices': covered_rows})
-        search_from = max(end_idx - 100, 0)
+        end_idx = start_idx + len(text)
+        results.append({'text': text, 'row_indices': span_index.rows(start_idx, end_idx)})
+        start_idx = end_idx + 1
 
     return results
\ No newline at end of file
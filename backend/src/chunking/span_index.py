@@ -0,0 +1,45 @@
+from typing import List, Sequence, Tuple
+import numpy as np
+
+
+class RowSpanIndex:
+    """
+    Character spans of rows joined into one text, for mapping text ranges back to rows
+
+    Row i covers [starts[i], ends[i]) of the joined text. Both arrays are
+    sorted, so the rows overlapping a character range are found with two
+    binary searches instead of a scan over every row.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[str], separator: str = "\n") -> "RowSpanIndex":
+        """Index of separator.join(lines)"""
+        lengths = np.fromiter((len(line) for line in lines), dtype=np.int64, count=len(lines))
+        starts = np.zeros(len(lengths), dtype=np.int64)
+        if len(lengths) > 1:
+            np.cumsum(lengths[:-1] + len(separator), out=starts[1:])
+        return cls(starts, starts + lengths)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def row_range(self, start: int, end: int) -> Tuple[int, int]:
+        """(first, stop) of the rows overlapping characters [start, end)"""
+        first = int(np.searchsorted(self.ends, start, side="right"))
+        stop = int(np.searchsorted(self.starts, end, side="left"))
+        return first, max(first, stop)
+
+    def row_ranges(self, starts: Sequence[int], ends: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """row_range for many character ranges at once, as (firsts, stops) arrays"""
+        firsts = np.searchsorted(self.ends, np.asarray(starts, dtype=np.int64), side="right")
+        stops = np.searchsorted(self.starts, np.asarray(ends, dtype=np.int64), side="left")
+        return firsts, np.maximum(firsts, stops)
+
+    def rows(self, start: int, end: int) -> List[int]:
+        """Row positions overlapping characters [start, end)"""
+        first, stop = self.row_range(start, end)
+        return list(range(first, stop))
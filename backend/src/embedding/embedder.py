@@ -6,6 +6,9 @@ from dataclasses import dataclass
 import json
 import os
 
+from ..chunking.base_chunker import ChunkPlan
+from ..chunking.row_renderer import RowTemplate, render_rows
+
 @dataclass
 class EmbeddingMetadata:
     """Metadata for embedded chunks"""
@@ -40,13 +43,15 @@ class TextPreparer:
     """Handles conversion of CSV chunks to semantically meaningful text"""
     
     @staticmethod
-    def prepare_chunk_text(chunk: pd.DataFrame, chunk_metadata: Dict[str, Any] = None) -> str:
+    def prepare_chunk_text(chunk: pd.DataFrame, chunk_metadata: Dict[str, Any] = None,
+                           row_texts: Optional[np.ndarray] = None) -> str:
         """
         Convert a CSV chunk to semantically meaningful text
         
         Args:
             chunk: DataFrame chunk
             chunk_metadata: Additional metadata about the chunk
+            row_texts: The chunk's rows already rendered with ROW_TEXT_TEMPLATE (rendered here when omitted)
             
         Returns:
             Prepared text string
@@ -70,27 +75,26 @@ class TextPreparer:
             if 'method' in chunk_metadata:
                 text_parts.append(f"Chunking Method: {chunk_metadata['method']}")
         
-        # Process each row
-        for idx, row in chunk.iterrows():
-            row_text = TextPreparer._prepare_row_text(row, chunk.columns)
-            if row_text:
-                text_parts.append(row_text)
+        # Chunks hold data rows only; the header is rendered here when the chunker asked for it
+        if TextPreparer._preserve_headers(chunk_metadata):
+            readable_columns = [TextPreparer._make_column_readable(str(col)) for col in chunk.columns]
+            text_parts.append(f"Columns: {', '.join(readable_columns)}")
+        
+        # One "Column: value. ..." text per row, skipping rows with nothing to say
+        if row_texts is None:
+            row_texts = render_rows(chunk, ROW_TEXT_TEMPLATE, cache=False)
+        text_parts.extend(row_text for row_text in row_texts if row_text)
         
         return ". ".join(text_parts) + "."
     
     @staticmethod
-    def _prepare_row_text(row: pd.Series, columns: List[str]) -> str:
-        """Convert a single row to natural language text"""
-        text_parts = []
-        
-        for col in columns:
-            value = row[col]
-            if pd.notna(value) and str(value).strip():
-                # Convert column name to readable format
-                readable_col = TextPreparer._make_column_readable(col)
-                text_parts.append(f"{readable_col}: {value}")
-        
-        return ". ".join(text_parts) if text_parts else ""
+    def _preserve_headers(chunk_metadata: Optional[Dict[str, Any]]) -> bool:
+        """preserve_headers flag of a chunk, set directly or in the chunker's metadata"""
+        if not chunk_metadata:
+            return False
+        if 'preserve_headers' in chunk_metadata:
+            return bool(chunk_metadata['preserve_headers'])
+        return bool((chunk_metadata.get('metadata') or {}).get('preserve_headers', False))
     
     @staticmethod
     def _make_column_readable(column_name: str) -> str:
@@ -121,6 +125,11 @@ class TextPreparer:
         # Capitalize first letter
         return readable.capitalize()
 
+
+# "Readable column: value. ..." per row, leaving out null and blank cells
+ROW_TEXT_TEMPLATE = RowTemplate(cell="{column}: {value}", separator=". ", skip_nulls=True, skip_blank=True,
+                                label=TextPreparer._make_column_readable)
+
 class EmbeddingModelManager:
     """Manages embedding models and their configurations"""
     
@@ -240,9 +249,15 @@ class EmbeddingGenerator:
         """Prepare text representations for all chunks"""
         chunk_texts = []
         
+        # Chunks of a bound plan take their rows from one (cached) rendering of the source table
+        source_rows = None
+        if isinstance(chunks, ChunkPlan) and chunks.bound:
+            source_rows = render_rows(chunks.source, ROW_TEXT_TEMPLATE)
+        
         for i, chunk in enumerate(chunks):
             metadata = chunk_metadata_list[i] if i < len(chunk_metadata_list) else {}
-            text = self.text_preparer.prepare_chunk_text(chunk, metadata)
+            row_texts = source_rows[chunks.row_positions(i)] if source_rows is not None else None
+            text = self.text_preparer.prepare_chunk_text(chunk, metadata, row_texts)
             chunk_texts.append(text)
         
         return chunk_texts
@@ -0,0 +1,141 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# stage -> (pool kind, max concurrent jobs of that stage)
+# "thread" suits work that releases the GIL (pyarrow, numpy, model.encode, Chroma I/O);
+# "process" suits pure-Python row loops that would otherwise hold the GIL.
+# Chunking stays in-process so plans share the session table and its cached row
+# renderings; semantic chunking (per-row text building and sentence splitting around
+# the model calls) runs in the process pool. Preprocessing starts its own worker
+# processes for the text transforms (PREPROCESS_WORKERS), so it stays on a thread.
+DEFAULT_STAGES: Dict[str, Tuple[str, int]] = {
+    "ingest": ("thread", 2),
+    "preprocess": ("thread", 2),
+    "chunk": ("thread", 2),
+    "semantic_chunk": ("process", 1),
+    "embed": ("thread", 1),
+    "store": ("thread", 2),
+    "search": ("thread", 8),
+}
+
+
+class StageExecutor:
+    """
+    Runs blocking pipeline stages off the asyncio event loop
+
+    Every stage is dispatched to a shared thread pool or process pool and
+    guarded by its own semaphore, so a long embedding job only occupies the
+    "embed" slots and searches keep being served.
+    """
+
+    def __init__(self, stages: Optional[Dict[str, Tuple[str, int]]] = None,
+                 thread_workers: Optional[int] = None, process_workers: Optional[int] = None,
+                 start_method: str = "spawn"):
+        self.stages = dict(DEFAULT_STAGES)
+        if stages:
+            self.stages.update(stages)
+        cpu_count = os.cpu_count() or 1
+        self.thread_workers = thread_workers or min(32, cpu_count + 4)
+        self.process_workers = process_workers or max(1, cpu_count - 1)
+        self.start_method = start_method
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "StageExecutor":
+        """
+        Build an executor from environment variables
+
+        EXECUTOR_THREADS / EXECUTOR_PROCESSES size the pools,
+        STAGE_<NAME>_POOL ("thread"/"process") and STAGE_<NAME>_CONCURRENCY
+        override a stage, e.g. STAGE_EMBED_CONCURRENCY=2.
+        """
+        stages = {}
+        for stage, (kind, limit) in DEFAULT_STAGES.items():
+            prefix = f"STAGE_{stage.upper()}_"
+            stages[stage] = (
+                os.environ.get(prefix + "POOL", kind).strip().lower(),
+                int(os.environ.get(prefix + "CONCURRENCY", limit))
+            )
+        return cls(
+            stages=stages,
+            thread_workers=int(os.environ["EXECUTOR_THREADS"]) if os.environ.get("EXECUTOR_THREADS") else None,
+            process_workers=int(os.environ["EXECUTOR_PROCESSES"]) if os.environ.get("EXECUTOR_PROCESSES") else None,
+            start_method=os.environ.get("EXECUTOR_START_METHOD", "spawn")
+        )
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers,
+                                                       thread_name_prefix="stage")
+            return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return self._process_pool
+
+    def _reset_process_pool(self):
+        with self._lock:
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_semaphore(self, stage: str) -> asyncio.Semaphore:
+        if stage not in self._semaphores:
+            _, limit = self.stages.get(stage, ("thread", 1))
+            self._semaphores[stage] = asyncio.Semaphore(max(1, int(limit)))
+        return self._semaphores[stage]
+
+    async def run(self, stage: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) for the given stage and await its result
+
+        Process-pool stages need a picklable, module-level fn and arguments.
+        If the pool breaks (usually a worker killed for running out of
+        memory) the pool is rebuilt for later calls and this one fails with
+        RuntimeError; it is not retried in the API process.
+        """
+        kind, _ = self.stages.get(stage, ("thread", 1))
+        call = functools.partial(fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(stage):
+            if kind == "process":
+                try:
+                    return await loop.run_in_executor(self._get_process_pool(), call)
+                except BrokenProcessPool as e:
+                    self._reset_process_pool()
+                    raise RuntimeError(f"A worker process died while running stage '{stage}' "
+                                       "(possibly out of memory)") from e
+            return await loop.run_in_executor(self._get_thread_pool(), call)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "stages": {
+                stage: {"pool": kind, "concurrency": limit} for stage, (kind, limit) in self.stages.items()
+            }
+        }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=wait)
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait)
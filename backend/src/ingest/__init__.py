@@ -0,0 +1,60 @@
+# Ingest module for CSV chunking optimizer
+from .upload_stream import (
+    SpooledUpload,
+    spool_upload,
+    iter_csv_blocks,
+    read_csv_incremental,
+    detect_encoding,
+    peak_rss_bytes,
+    rss_report
+)
+from .background import (
+    ParseJob,
+    ProgressReader,
+    read_csv_sample,
+    read_jsonl_sample
+)
+from .formats import (
+    UploadFormat,
+    SUPPORTED_EXTENSIONS,
+    detect_upload_format,
+    resolve_columns,
+    projected_content_hash,
+    read_upload,
+    read_upload_sample,
+    read_zip_bundle
+)
+from .engines import (
+    BaseIngestEngine,
+    PandasIngestEngine,
+    PyArrowIngestEngine,
+    arrow_to_pandas,
+    get_ingest_engine
+)
+
+__all__ = [
+    'SpooledUpload',
+    'spool_upload',
+    'iter_csv_blocks',
+    'read_csv_incremental',
+    'detect_encoding',
+    'peak_rss_bytes',
+    'rss_report',
+    'ParseJob',
+    'ProgressReader',
+    'read_csv_sample',
+    'read_jsonl_sample',
+    'UploadFormat',
+    'SUPPORTED_EXTENSIONS',
+    'detect_upload_format',
+    'resolve_columns',
+    'projected_content_hash',
+    'read_upload',
+    'read_upload_sample',
+    'read_zip_bundle',
+    'BaseIngestEngine',
+    'PandasIngestEngine',
+    'PyArrowIngestEngine',
+    'arrow_to_pandas',
+    'get_ingest_engine'
+]
@@ -0,0 +1,187 @@
+import asyncio
+import io
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import pandas as pd
+
+from .upload_stream import SpooledUpload, detect_encoding
+
+# Rows parsed synchronously for the upload preview
+DEFAULT_SAMPLE_ROWS = 5000
+# Bytes read from the head of the file for the preview and row estimate
+DEFAULT_SAMPLE_BYTES = 4 * 1024 * 1024
+
+
+class ProgressReader(io.RawIOBase):
+    """Read-only view of a binary file object that records how far it has been read"""
+
+    def __init__(self, raw, size_bytes: int):
+        super().__init__()
+        self._raw = raw
+        self.size_bytes = int(size_bytes)
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def _advance(self):
+        # Parsers seek back after sniffing, so progress is the furthest position reached
+        self.bytes_read = max(self.bytes_read, self._raw.tell())
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self._advance()
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self._raw.read(len(buffer))
+        buffer[:len(data)] = data
+        self._advance()
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    @property
+    def progress(self) -> float:
+        if not self.size_bytes:
+            return 1.0
+        return min(1.0, self.bytes_read / self.size_bytes)
+
+
+def _read_head(fileobj, size_bytes: int, sample_bytes: int) -> Tuple[bytes, bool]:
+    """First sample_bytes of fileobj cut at the last full line, and whether that is the whole file"""
+    start = fileobj.tell()
+    head = fileobj.read(sample_bytes)
+    fileobj.seek(start)
+    complete = len(head) >= size_bytes
+    if not complete:
+        # Drop the partial last line
+        head = head[:head.rfind(b"\n") + 1] or head
+    return head, complete
+
+
+def _estimate_rows(head: bytes, size_bytes: int, header_end: int, parsed_rows: int) -> int:
+    """Rows in the whole file, extrapolated from the bytes per line of head"""
+    data_bytes = len(head) - header_end
+    data_lines = head.count(b"\n", header_end)
+    if not data_bytes or not data_lines:
+        return parsed_rows
+    return max(round(data_lines * (size_bytes - header_end) / data_bytes), parsed_rows)
+
+
+def read_csv_sample(fileobj, size_bytes: int, sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                    sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> Tuple[pd.DataFrame, int, bool]:
+    """
+    Parse the first rows of a CSV and estimate how many rows the whole file has
+
+    Only the first sample_bytes are read (the file position is restored).
+    When the sample covers the whole file the row count is exact; otherwise
+    it is extrapolated from the bytes per line of the sample.
+
+    Args:
+        fileobj: Seekable binary file object positioned at the start of the CSV
+        size_bytes: Total size of the file
+        sample_rows: Maximum rows to parse
+        sample_bytes: Maximum bytes to read
+
+    Returns:
+        Tuple of (sample DataFrame, row count or estimate, whether the count is exact)
+    """
+    head, complete = _read_head(fileobj, size_bytes, sample_bytes)
+    encoding = detect_encoding(io.BytesIO(head))
+    sample = pd.read_csv(io.BytesIO(head), nrows=sample_rows, encoding=encoding)
+    if complete and len(sample) < sample_rows:
+        return sample, len(sample), True
+    return sample, _estimate_rows(head, size_bytes, head.find(b"\n") + 1, len(sample)), False
+
+
+def read_jsonl_sample(fileobj, size_bytes: int, sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                      sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> Tuple[pd.DataFrame, int, bool]:
+    """read_csv_sample for newline-delimited JSON records"""
+    head, complete = _read_head(fileobj, size_bytes, sample_bytes)
+    sample = pd.read_json(io.BytesIO(head), lines=True, nrows=sample_rows)
+    if complete and len(sample) < sample_rows:
+        return sample, len(sample), True
+    return sample, _estimate_rows(head, size_bytes, 0, len(sample)), False
+
+
+class ParseJob:
+    """
+    Full parse of a spooled upload running as a background task
+
+    The parse runs through an async runner (e.g. a StageExecutor stage) so
+    the event loop stays free; its progress is the share of the file the
+    parser has consumed. on_complete receives the job and the parsed table
+    (None on failure) before any waiter is released, so it can install the
+    table wherever it is needed; the job itself does not keep it.
+    """
+
+    def __init__(self, spooled: SpooledUpload, parse: Callable[[Any], pd.DataFrame],
+                 on_complete: Optional[Callable[["ParseJob", Optional[pd.DataFrame]], None]] = None):
+        self.spooled = spooled
+        self.parse = parse
+        self.on_complete = on_complete
+        self.reader = ProgressReader(spooled.file, spooled.size_bytes)
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.rows: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self, run: Callable[..., Awaitable[pd.DataFrame]]) -> "ParseJob":
+        """Schedule the parse on the running event loop; run(fn, *args) must execute fn off the loop"""
+        self.status = "parsing"
+        self.started_at = time.time()
+        self.task = asyncio.get_running_loop().create_task(self._run(run))
+        return self
+
+    async def _run(self, run):
+        df = None
+        try:
+            df = await run(self.parse, self.reader)
+            self.rows = len(df)
+            self.status = "done"
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.spooled.close()
+            self.finished_at = time.time()
+        if self.on_complete is not None:
+            try:
+                self.on_complete(self, df)
+            except Exception as e:
+                self.status = "failed"
+                self.error = str(e)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    async def wait(self):
+        """Wait for the parse to finish; raises RuntimeError if it failed"""
+        if self.task is not None:
+            # Shielded so a cancelled request does not cancel the parse
+            await asyncio.shield(self.task)
+        if self.status == "failed":
+            raise RuntimeError(f"Parsing the upload failed: {self.error}")
+
+    def report(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "status": self.status,
+            "progress": 1.0 if self.status == "done" else round(self.reader.progress, 4),
+            "bytes_read": self.reader.bytes_read,
+            "size_bytes": self.reader.size_bytes,
+            "rows": self.rows,
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else None,
+            "error": self.error
+        }
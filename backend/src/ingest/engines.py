@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+import pandas as pd
+
+from .upload_stream import DEFAULT_PARSE_BLOCK_ROWS, detect_encoding, read_csv_incremental
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# File formats every engine can read
+INGEST_FORMATS = ("csv", "jsonl", "parquet", "feather")
+
+# Bytes handed to each pyarrow parser thread
+DEFAULT_ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def arrow_to_pandas(table) -> pd.DataFrame:
+    """
+    Wrap an Arrow table as a DataFrame of ArrowDtype columns
+
+    The columns keep pointing at the Arrow buffers, so no values are converted
+    or copied; numpy-backed copies are only made by code that asks for them.
+    """
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _select(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    return df if columns is None else df[list(columns)]
+
+
+def _require_pyarrow(what: str):
+    if not PYARROW_AVAILABLE:
+        raise ImportError(f"pyarrow is not installed. Please install it to read {what} files.")
+
+
+class BaseIngestEngine(ABC):
+    """Abstract base class for ingest engines (CSV plus JSONL, Parquet and Feather)"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def read_csv(self, source, encoding: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Parse a CSV path or binary file object into a DataFrame, optionally only some columns"""
+        pass
+
+    def wrap_table(self, table) -> pd.DataFrame:
+        """DataFrame for a pyarrow.Table read by a columnar reader"""
+        return table.to_pandas()
+
+    def read_jsonl(self, source, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Parse newline-delimited JSON records"""
+        return _select(pd.read_json(source, lines=True), columns)
+
+    def read_parquet(self, source, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read a Parquet file; only the requested column chunks are read from the file"""
+        _require_pyarrow("Parquet")
+        return self.wrap_table(pq.read_table(source, columns=columns))
+
+    def read_feather(self, source, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read a Feather (Arrow IPC) file"""
+        _require_pyarrow("Feather")
+        return self.wrap_table(pa_feather.read_table(source, columns=columns, memory_map=False))
+
+    def read(self, source, file_format: str = "csv", columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read source in one of INGEST_FORMATS"""
+        if file_format == "csv":
+            return self.read_csv(source, columns=columns)
+        if file_format == "jsonl":
+            return self.read_jsonl(source, columns=columns)
+        if file_format == "parquet":
+            return self.read_parquet(source, columns=columns)
+        if file_format == "feather":
+            return self.read_feather(source, columns=columns)
+        raise ValueError(f"Unknown file format '{file_format}'. Available: {list(INGEST_FORMATS)}")
+
+
+class PandasIngestEngine(BaseIngestEngine):
+    """pandas C parser, reading the input in row blocks"""
+
+    def __init__(self, block_rows: int = DEFAULT_PARSE_BLOCK_ROWS):
+        super().__init__("pandas")
+        self.block_rows = block_rows
+
+    def read_csv(self, source, encoding: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        kwargs = {"encoding": encoding} if encoding else {}
+        if columns is not None:
+            kwargs["usecols"] = list(columns)
+        return _select(read_csv_incremental(source, block_rows=self.block_rows, **kwargs), columns)
+
+    def read_jsonl(self, source, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        blocks = [_select(block, columns)
+                  for block in pd.read_json(source, lines=True, chunksize=int(self.block_rows))]
+        if not blocks:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(blocks, ignore_index=True, copy=False) if len(blocks) > 1 else blocks[0]
+
+
+class PyArrowIngestEngine(BaseIngestEngine):
+    """Multithreaded pyarrow.csv reader producing Arrow-backed DataFrames"""
+
+    def __init__(self, use_threads: bool = True, block_size: int = DEFAULT_ARROW_BLOCK_SIZE,
+                 fallback: Optional[BaseIngestEngine] = None):
+        super().__init__("pyarrow")
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is not installed. Please install it to use PyArrowIngestEngine.")
+        self.use_threads = use_threads
+        self.block_size = block_size
+        self.fallback = fallback or PandasIngestEngine()
+
+    def read_table(self, source, encoding: Optional[str] = None, columns: Optional[List[str]] = None):
+        """Parse the CSV into a pyarrow.Table"""
+        read_options = pa_csv.ReadOptions(
+            use_threads=self.use_threads,
+            block_size=int(self.block_size),
+            encoding=encoding or "utf8"
+        )
+        # Empty cells become nulls, matching pandas' NaN for missing strings;
+        # columns outside include_columns are skipped rather than converted
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True, include_columns=columns)
+        return pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+
+    def read_csv(self, source, encoding: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        start = source.tell() if hasattr(source, "tell") else None
+        try:
+            table = self.read_table(source, encoding=encoding, columns=columns)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, UnicodeDecodeError):
+            # Ragged rows, exotic quoting etc. - let the pandas parser have a go
+            if start is not None:
+                source.seek(start)
+            return self.fallback.read_csv(source, encoding=encoding or detect_encoding(source), columns=columns)
+        if encoding is None and any(pa.types.is_binary(field.type) for field in table.schema):
+            # Text that is not valid UTF-8 comes back as binary; re-read with a detected encoding
+            if start is not None:
+                source.seek(start)
+            encoding = detect_encoding(source)
+            if encoding != "utf-8":
+                return self.read_csv(source, encoding=encoding, columns=columns)
+        return arrow_to_pandas(table)
+
+    def wrap_table(self, table) -> pd.DataFrame:
+        return arrow_to_pandas(table)
+
+    def read_jsonl(self, source, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        read_options = pa_json.ReadOptions(use_threads=self.use_threads, block_size=int(self.block_size))
+        table = pa_json.read_json(source, read_options=read_options)
+        if columns is not None:
+            table = table.select(list(columns))
+        return arrow_to_pandas(table)
+
+
+INGEST_ENGINES: Dict[str, Type[BaseIngestEngine]] = {
+    "pandas": PandasIngestEngine,
+}
+if PYARROW_AVAILABLE:
+    INGEST_ENGINES["pyarrow"] = PyArrowIngestEngine
+
+
+def get_ingest_engine(name: Optional[str] = None, **kwargs) -> BaseIngestEngine:
+    """
+    Build an ingest engine by name
+
+    Args:
+        name: "pyarrow" or "pandas"; defaults to pyarrow when it is installed
+
+    Returns:
+        BaseIngestEngine instance
+    """
+    if not name:
+        name = "pyarrow" if PYARROW_AVAILABLE else "pandas"
+    name = name.strip().lower()
+    if name == "pyarrow" and not PYARROW_AVAILABLE:
+        name = "pandas"
+    if name not in INGEST_ENGINES:
+        raise ValueError(f"Unknown ingest engine '{name}'. Available: {sorted(INGEST_ENGINES)}")
+    return INGEST_ENGINES[name](**kwargs)
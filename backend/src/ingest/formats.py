@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import pandas as pd
+
+from .background import DEFAULT_SAMPLE_ROWS, read_csv_sample, read_jsonl_sample
+from .engines import BaseIngestEngine
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# File extension -> ingest format
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+}
+# Suffix after the format extension -> compression undone while spooling
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+SUPPORTED_EXTENSIONS = sorted(FORMAT_EXTENSIONS) + [".zip"]
+
+# Column added to multi-file zip bundles, naming the member each row came from
+SOURCE_FILE_COLUMN = "source_file"
+
+
+@dataclass
+class UploadFormat:
+    """How an uploaded file is read: format ("csv", "jsonl", "parquet", "feather" or "zip") and compression"""
+    format: str
+    compression: Optional[str] = None
+
+
+def detect_upload_format(filename: str) -> UploadFormat:
+    """
+    Work out the format of an upload from its file name
+
+    Any format may carry a .gz or .zst suffix (e.g. data.csv.gz); .zip
+    bundles may hold several files of the plain formats.
+
+    Raises:
+        ValueError: For unsupported extensions
+    """
+    name = (filename or "").lower()
+    if name.endswith(".zip"):
+        return UploadFormat("zip")
+    compression = None
+    for suffix, codec in COMPRESSION_EXTENSIONS.items():
+        if name.endswith(suffix):
+            compression = codec
+            name = name[:-len(suffix)]
+            break
+    for suffix, file_format in FORMAT_EXTENSIONS.items():
+        if name.endswith(suffix):
+            return UploadFormat(file_format, compression)
+    raise ValueError(
+        f"Unsupported file type '{filename}'. Supported: {', '.join(SUPPORTED_EXTENSIONS)}"
+        f" (optionally compressed as {', '.join(sorted(COMPRESSION_EXTENSIONS))})"
+    )
+
+
+def _normalize_name(name) -> str:
+    return str(name).strip().lower()
+
+
+def resolve_columns(requested: Sequence[str], available: Sequence) -> List:
+    """
+    Map requested column names onto a file's own column names
+
+    Names match exactly or after the header normalization applied on upload
+    (stripped, lowercased), so callers can use the names they see in previews.
+
+    Raises:
+        ValueError: When a requested column does not exist
+    """
+    by_normalized = {}
+    for name in available:
+        by_normalized.setdefault(_normalize_name(name), name)
+    resolved, missing = [], []
+    for name in requested:
+        if name in available:
+            resolved.append(name)
+        elif _normalize_name(name) in by_normalized:
+            resolved.append(by_normalized[_normalize_name(name)])
+        else:
+            missing.append(name)
+    if missing:
+        raise ValueError(f"Columns not found: {missing}. Available: {[str(c) for c in available]}")
+    return resolved
+
+
+def projected_content_hash(content_hash: str, columns: Optional[Sequence] = None) -> str:
+    """
+    Content hash of the table read from an upload with a column projection
+
+    The bytes digest alone would let a projected upload and a full upload of
+    the same file share cached results; the resolved columns (in order) are
+    folded in when there is a projection.
+    """
+    if not columns:
+        return content_hash
+    projection = json.dumps([str(col) for col in columns])
+    return hashlib.sha256(f"{content_hash}:{projection}".encode("utf-8")).hexdigest()
+
+
+def _zip_members(bundle: zipfile.ZipFile) -> List[Tuple[zipfile.ZipInfo, UploadFormat]]:
+    members = []
+    for info in bundle.infolist():
+        base = os.path.basename(info.filename)
+        if info.is_dir() or not base or base.startswith(".") or info.filename.startswith("__MACOSX/"):
+            continue
+        try:
+            member_format = detect_upload_format(base)
+        except ValueError:
+            continue
+        # The archive compresses its members already; nested archives are not opened
+        if member_format.format != "zip" and member_format.compression is None:
+            members.append((info, member_format))
+    return members
+
+
+def read_zip_bundle(source, engine: BaseIngestEngine, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read every supported file of a zip archive into one DataFrame
+
+    Members are decompressed as they are parsed, one at a time. With more
+    than one member a source_file column records where each row came from.
+    """
+    with zipfile.ZipFile(source) as bundle:
+        members = _zip_members(bundle)
+        if not members:
+            raise ValueError(f"The zip archive holds no supported files ({', '.join(sorted(FORMAT_EXTENSIONS))})")
+        frames = []
+        for info, member_format in members:
+            with bundle.open(info) as handle:
+                frame = engine.read(handle, member_format.format, columns)
+            if len(members) > 1 and SOURCE_FILE_COLUMN not in frame.columns:
+                frame[SOURCE_FILE_COLUMN] = info.filename
+            frames.append(frame)
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True, copy=False)
+
+
+def read_upload(source, upload_format: UploadFormat, engine: BaseIngestEngine,
+                columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a spooled upload (already decompressed) with the ingest engine"""
+    if upload_format.format == "zip":
+        return read_zip_bundle(source, engine, columns)
+    return engine.read(source, upload_format.format, columns)
+
+
+def _columnar_sample(source, file_format: str, sample_rows: int) -> Tuple[pd.DataFrame, int, bool]:
+    if not PYARROW_AVAILABLE:
+        raise ImportError(f"pyarrow is not installed. Please install it to read {file_format} files.")
+    if file_format == "parquet":
+        parquet = pq.ParquetFile(source)
+        # The footer holds the row count; only the first row group(s) are decoded
+        batch = next(parquet.iter_batches(batch_size=sample_rows), None)
+        sample = pa.Table.from_batches([batch]) if batch is not None else parquet.schema_arrow.empty_table()
+        return sample.to_pandas(), parquet.metadata.num_rows, True
+    try:
+        reader = pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        # Feather v1 has no IPC footer; read it whole
+        table = pa_feather.read_table(source, memory_map=False)
+        return table.slice(0, sample_rows).to_pandas(), table.num_rows, True
+    if reader.num_record_batches == 0:
+        return reader.schema.empty_table().to_pandas(), 0, True
+    first = reader.get_batch(0)
+    sample = pa.Table.from_batches([first]).slice(0, sample_rows).to_pandas()
+    if reader.num_record_batches == 1:
+        return sample, first.num_rows, True
+    return sample, first.num_rows * reader.num_record_batches, False
+
+
+def read_upload_sample(source, upload_format: UploadFormat, size_bytes: int,
+                       sample_rows: int = DEFAULT_SAMPLE_ROWS) -> Tuple[pd.DataFrame, int, bool]:
+    """
+    Preview rows and row count (exact or estimated) of a spooled upload
+
+    Only the head of row formats and the footer plus first batch of columnar
+    formats are read; the file position is restored.
+
+    Returns:
+        Tuple of (sample DataFrame, row count or estimate, whether the count is exact)
+    """
+    start = source.tell()
+    try:
+        file_format = upload_format.format
+        if file_format == "csv":
+            return read_csv_sample(source, size_bytes, sample_rows)
+        if file_format == "jsonl":
+            return read_jsonl_sample(source, size_bytes, sample_rows)
+        if file_format in ("parquet", "feather"):
+            return _columnar_sample(source, file_format, sample_rows)
+
+        with zipfile.ZipFile(source) as bundle:
+            members = _zip_members(bundle)
+            if not members:
+                raise ValueError(f"The zip archive holds no supported files ({', '.join(sorted(FORMAT_EXTENSIONS))})")
+            info, member_format = members[0]
+            with bundle.open(info) as handle:
+                sample, rows, exact = read_upload_sample(handle, member_format, info.file_size, sample_rows)
+            if len(members) > 1:
+                # Scale by uncompressed size, assuming the members look alike
+                total_size = sum(member.file_size for member, _ in members)
+                rows = round(rows * total_size / max(info.file_size, 1))
+                exact = False
+                if SOURCE_FILE_COLUMN not in sample.columns:
+                    sample[SOURCE_FILE_COLUMN] = info.filename
+            return sample, rows, exact
+    finally:
+        source.seek(start)
@@ -0,0 +1,250 @@
+import codecs
+import hashlib
+import sys
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+import pandas as pd
+
+try:
+    import resource  # POSIX only
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil  # type: ignore
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import chardet
+    CHARDET_AVAILABLE = True
+except ImportError:
+    CHARDET_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+# Bytes pulled from the upload stream per read
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+# Uploads larger than this roll over from memory to a temp file on disk
+DEFAULT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+# Rows parsed per block when reading the spooled file
+DEFAULT_PARSE_BLOCK_ROWS = 100_000
+# Bytes inspected when guessing a file's text encoding
+DEFAULT_ENCODING_SAMPLE_BYTES = 1024 * 1024
+
+# Compression spool_upload can undo while copying the upload
+SPOOL_COMPRESSIONS = ("gzip", "zstd")
+# Most decompressed bytes held at once per piece (a small compressed block can expand a thousandfold)
+DEFAULT_DECOMPRESS_MAX_OUTPUT = 1024 * 1024
+# A zstd block decompresses to at most 128 KiB and takes at least 4 bytes (RLE block)
+_ZSTD_MAX_BLOCK_OUTPUT = 128 * 1024
+_ZSTD_MIN_BLOCK_INPUT = 4
+
+
+@dataclass
+class SpooledUpload:
+    """An upload copied block by block into a spooled temp file"""
+    file: tempfile.SpooledTemporaryFile
+    filename: str
+    size_bytes: int
+    # sha256 of the spooled (decompressed) bytes, computed while spooling
+    content_hash: str = ""
+    # Bytes received over the wire; differs from size_bytes for compressed uploads
+    received_bytes: int = 0
+
+    def close(self):
+        try:
+            self.file.close()
+        except Exception:
+            pass
+
+
+class StreamDecompressor:
+    """
+    Incremental gzip/zstd decompressor that also reads concatenated gzip members or zstd frames
+
+    Output comes in pieces of at most about max_output bytes, however much a
+    block expands. zlib stops at max_output and keeps the rest of the input in
+    unconsumed_tail; zstd decompressobj has no output limit, so its input is
+    fed in slices too short to expand past max_output.
+    """
+
+    def __init__(self, compression: str, max_output: int = DEFAULT_DECOMPRESS_MAX_OUTPUT):
+        self.max_output = max(1, int(max_output))
+        self._input_slice = None
+        if compression == "gzip":
+            # wbits 16 + MAX_WBITS: expect a gzip header and trailer
+            self._factory = lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif compression == "zstd":
+            if not ZSTANDARD_AVAILABLE:
+                raise ImportError("zstandard is not installed. Please install it to upload .zst files.")
+            self._factory = lambda: zstandard.ZstdDecompressor().decompressobj()
+            blocks = max(1, self.max_output // _ZSTD_MAX_BLOCK_OUTPUT - 1)
+            self._input_slice = blocks * _ZSTD_MIN_BLOCK_INPUT
+        else:
+            raise ValueError(f"Unknown compression '{compression}'. Available: {list(SPOOL_COMPRESSIONS)}")
+        self._decompressor = self._factory()
+        self._in_stream = False
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        """Yield the decompressed bytes of data piece by piece"""
+        step = self._input_slice or len(data)
+        for start in range(0, len(data), step):
+            pending = data[start:start + step]
+            while True:
+                self._in_stream = True
+                if self._input_slice:
+                    piece = self._decompressor.decompress(pending)
+                    pending = b""
+                else:
+                    piece = self._decompressor.decompress(pending, self.max_output)
+                    pending = self._decompressor.unconsumed_tail
+                if piece:
+                    yield piece
+                if self._decompressor.eof:
+                    # End of one member/frame; whatever follows starts the next one
+                    pending = self._decompressor.unused_data
+                    self._decompressor = self._factory()
+                    self._in_stream = False
+                    if not pending:
+                        break
+                elif not pending and len(piece) < self.max_output:
+                    break
+
+    def finish(self):
+        """Raise if the input ended in the middle of a member/frame"""
+        if self._in_stream:
+            raise ValueError("Compressed upload is truncated")
+
+
+async def spool_upload(upload, block_size: int = DEFAULT_BLOCK_SIZE,
+                       max_memory: int = DEFAULT_SPOOL_MAX_MEMORY,
+                       spool_dir: Optional[str] = None,
+                       compression: Optional[str] = None) -> SpooledUpload:
+    """
+    Copy an UploadFile into a SpooledTemporaryFile in fixed-size blocks
+
+    Args:
+        upload: FastAPI/Starlette UploadFile (anything with an async read(n))
+        block_size: Bytes read from the upload per iteration
+        max_memory: Size above which the spool is moved to disk
+        spool_dir: Directory for the on-disk spool (defaults to the system temp dir)
+        compression: "gzip" or "zstd" to decompress block by block while spooling
+
+    Returns:
+        SpooledUpload positioned at the start of the (decompressed) data
+    """
+    decompressor = StreamDecompressor(compression) if compression else None
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b", dir=spool_dir)
+    digest = hashlib.sha256()
+    size = 0
+    received = 0
+    try:
+        while True:
+            block = await upload.read(block_size)
+            if not block:
+                break
+            received += len(block)
+            pieces = decompressor.decompress(block) if decompressor is not None else (block,)
+            for piece in pieces:
+                spool.write(piece)
+                digest.update(piece)
+                size += len(piece)
+        if decompressor is not None:
+            decompressor.finish()
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return SpooledUpload(file=spool, filename=getattr(upload, "filename", "") or "", size_bytes=size,
+                         content_hash=digest.hexdigest(), received_bytes=received)
+
+
+def iter_csv_blocks(fileobj, block_rows: int = DEFAULT_PARSE_BLOCK_ROWS, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """Parse a CSV file object incrementally, yielding DataFrames of at most block_rows rows"""
+    reader = pd.read_csv(fileobj, chunksize=int(block_rows), **read_kwargs)
+    with reader:
+        for block in reader:
+            yield block
+
+
+def read_csv_incremental(fileobj, block_rows: int = DEFAULT_PARSE_BLOCK_ROWS, **read_kwargs) -> pd.DataFrame:
+    """
+    Parse a CSV file object block by block and assemble the final DataFrame
+
+    Only one block of parser state is alive at a time; the raw bytes are read
+    from the file object as parsing advances instead of being loaded up front.
+    """
+    blocks = list(iter_csv_blocks(fileobj, block_rows, **read_kwargs))
+    if not blocks:
+        return pd.DataFrame()
+    if len(blocks) == 1:
+        return blocks[0]
+    df = pd.concat(blocks, ignore_index=True, copy=False)
+    del blocks
+    return df
+
+
+def detect_encoding(source, sample_bytes: int = DEFAULT_ENCODING_SAMPLE_BYTES) -> str:
+    """
+    Guess the text encoding of a CSV from a bounded sample of its bytes
+
+    UTF-8 is tried first (a character cut off at the end of the sample is
+    not an error); otherwise chardet is run on the sample only, never on the
+    whole file.
+
+    Args:
+        source: File path or seekable binary file object (position is restored)
+        sample_bytes: Maximum number of bytes to inspect
+
+    Returns:
+        Encoding name usable with pandas.read_csv
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as fh:
+            sample = fh.read(sample_bytes)
+    else:
+        start = source.tell()
+        sample = source.read(sample_bytes)
+        source.seek(start)
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if CHARDET_AVAILABLE:
+        encoding = chardet.detect(sample).get("encoding")
+        if encoding:
+            return encoding
+    # Every byte sequence decodes as latin-1, so parsing cannot fail on it
+    return "latin-1"
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Process peak resident set size in bytes (None when it cannot be measured)"""
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+        return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+    if PSUTIL_AVAILABLE:
+        info = psutil.Process().memory_info()
+        return int(getattr(info, "peak_wset", info.rss))
+    return None
+
+
+def rss_report(before: Optional[int], after: Optional[int]) -> Tuple[Optional[float], Optional[float]]:
+    """Return (peak_rss_mb, peak_rss_growth_mb) for a measured section"""
+    if after is None:
+        return None, None
+    peak_mb = round(after / (1024 * 1024), 2)
+    growth_mb = round((after - before) / (1024 * 1024), 2) if before is not None else None
+    return peak_mb, growth_mb
@@ -7,6 +7,16 @@ from .data_preprocessor import (
     normalize_text_column,
     apply_type_conversion
 )
+from .column_profile import ColumnProfile, profile_columns, merge_profiles
+from .column_roles import detect_column_roles, columns_with_role
+from .deduplication import deduplicate, exact_duplicate_mask, near_duplicate_mask
+from .dtype_optimizer import optimize_dtypes
+from .imputation import apply_fill_null_strategy, parse_fill_null_strategy
+from .parallel import parallel_text_transform
+from .result_cache import PreprocessCache, frame_content_hash
+from .streaming import preprocess_csv_streaming, read_spill
+from .transform_cache import TransformCache, apply_unique
+from .type_conversion import downcast_numeric, infer_datetime_format
 
 __all__ = [
     'preprocess_csv',
@@ -14,6 +24,26 @@ __all__ = [
     'remove_stopwords_from_text_column',
     'validate_and_normalize_headers',
     'normalize_text_column',
-    'apply_type_conversion'
+    'apply_type_conversion',
+    'ColumnProfile',
+    'profile_columns',
+    'merge_profiles',
+    'detect_column_roles',
+    'columns_with_role',
+    'deduplicate',
+    'exact_duplicate_mask',
+    'near_duplicate_mask',
+    'optimize_dtypes',
+    'apply_fill_null_strategy',
+    'parse_fill_null_strategy',
+    'parallel_text_transform',
+    'PreprocessCache',
+    'frame_content_hash',
+    'preprocess_csv_streaming',
+    'read_spill',
+    'TransformCache',
+    'apply_unique',
+    'downcast_numeric',
+    'infer_datetime_format'
 ]
 
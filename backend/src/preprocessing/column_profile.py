@@ -0,0 +1,271 @@
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+DEFAULT_SKETCH_K = 200
+DEFAULT_HLL_PRECISION = 12
+DEFAULT_HISTOGRAM_BINS = 20
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def _as_float_array(values) -> np.ndarray:
+    """Non-null values of a Series/array as float64, whatever the storage backend"""
+    if isinstance(values, pd.Series):
+        arr = values.to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        arr = np.asarray(values, dtype="float64")
+    return arr[~np.isnan(arr)]
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL-style quantile sketch
+
+    Values live in levels; an item on level h stands for 2**h input values.
+    When a level outgrows its capacity it is sorted and every other item
+    (random offset) is promoted to the next level, so memory stays around
+    3*k items while rank error stays around 1/k.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K, seed: Optional[int] = 0):
+        self.k = int(k)
+        self.levels: List[np.ndarray] = [np.empty(0, dtype="float64")]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(8, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype="float64"))
+                items = np.sort(items)
+                # An odd leftover stays behind so the total weight is preserved
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[int(self._rng.integers(2))::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype="float64")
+        if not len(values):
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype="float64"))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def weighted_items(self):
+        """(sorted items, weights) across all levels"""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        if self.n == 0:
+            return [None for _ in qs]
+        items, weights = self.weighted_items()
+        cumulative = np.cumsum(weights)
+        ranks = np.asarray(qs, dtype="float64") * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return [float(v) for v in items[positions]]
+
+    def histogram(self, bins: int, value_range) -> Dict[str, List]:
+        if self.n == 0:
+            return {"bin_edges": [], "counts": []}
+        items, weights = self.weighted_items()
+        counts, edges = np.histogram(items, bins=bins, range=value_range, weights=weights)
+        return {"bin_edges": edges.tolist(), "counts": [int(round(c)) for c in counts]}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "kll",
+            "k": self.k,
+            "n": self.n,
+            "levels": [np.sort(lvl).tolist() for lvl in self.levels]
+        }
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator over pandas' 64-bit value hashes"""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        self.precision = int(precision)
+        self.m = 1 << self.precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        # frexp is exact on 32-bit halves, unlike a float64 cast of the full word
+        hi = (values >> np.uint64(32)).astype(np.float64)
+        lo = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        hi_len = np.frexp(hi)[1]
+        lo_len = np.frexp(lo)[1]
+        return np.where(hi > 0, hi_len + 32, lo_len)
+
+    def update(self, values):
+        values = np.asarray(values)
+        if not len(values):
+            return
+        hashes = pd.util.hash_array(values)
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        rank = (remaining_bits - self._bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = float(self.m)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class ColumnProfile:
+    """
+    One-pass, mergeable statistics for a numeric column
+
+    count/mean/variance are combined with Chan's parallel update, so profiles
+    built on separate partitions can be merged into the profile of the whole
+    column. Quantiles and histograms come from a QuantileSketch and the
+    distinct count from a HyperLogLog.
+    """
+
+    def __init__(self, column_name: str, sketch_k: int = DEFAULT_SKETCH_K,
+                 hll_precision: int = DEFAULT_HLL_PRECISION):
+        self.column_name = column_name
+        self.count = 0
+        self.null_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(sketch_k)
+        self.hll = HyperLogLog(hll_precision)
+
+    def _combine_moments(self, n: int, mean: float, m2: float):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def update(self, values) -> "ColumnProfile":
+        """Add a batch of values (Series or array; nulls are counted, not profiled)"""
+        total = len(values)
+        arr = _as_float_array(values)
+        self.null_count += total - len(arr)
+        if not len(arr):
+            return self
+        batch_mean = float(arr.mean())
+        batch_m2 = float(np.square(arr - batch_mean).sum())
+        self._combine_moments(len(arr), batch_mean, batch_m2)
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+        self.sketch.update(arr)
+        self.hll.update(arr)
+        return self
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        self.null_count += other.null_count
+        if other.count:
+            self._combine_moments(other.count, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        self.hll.merge(other.hll)
+        return self
+
+    @property
+    def std(self) -> Optional[float]:
+        # Sample standard deviation, as pandas' Series.std
+        if self.count < 2:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def to_dict(self, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                bins: int = DEFAULT_HISTOGRAM_BINS, include_sketch: bool = True) -> Dict[str, Any]:
+        """
+        JSON-ready summary of the profile
+
+        Args:
+            quantiles: Quantiles to report, e.g. 0.5 for the median
+            bins: Number of equal-width histogram bins between min and max
+            include_sketch: Include the serialized quantile sketch
+
+        Returns:
+            Dictionary with the summary statistics
+        """
+        has_values = self.count > 0
+        summary = {
+            "column_name": self.column_name,
+            "count": self.count,
+            "null_count": self.null_count,
+            "mean": self.mean if has_values else None,
+            "std": self.std,
+            "min": self.min if has_values else None,
+            "max": self.max if has_values else None,
+            "distinct_estimate": self.hll.estimate(),
+            "quantiles": {
+                f"p{round(q * 100):02d}": value
+                for q, value in zip(quantiles, self.sketch.quantiles(quantiles))
+            },
+            "histogram": self.sketch.histogram(bins, (self.min, self.max) if has_values else None),
+        }
+        if include_sketch:
+            summary["sketch"] = self.sketch.to_dict()
+        return summary
+
+
+def profile_columns(df: pd.DataFrame, columns: Optional[Iterable[str]] = None,
+                    sketch_k: int = DEFAULT_SKETCH_K) -> Dict[str, ColumnProfile]:
+    """
+    Build a ColumnProfile for each column in a single pass over its values
+
+    Args:
+        df: DataFrame (or one partition of it)
+        columns: Columns to profile; defaults to every column of df
+        sketch_k: Quantile sketch accuracy parameter
+
+    Returns:
+        Dictionary of column name -> ColumnProfile
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    return {col: ColumnProfile(col, sketch_k=sketch_k).update(df[col]) for col in columns}
+
+
+def merge_profiles(partials: Iterable[Dict[str, ColumnProfile]]) -> Dict[str, ColumnProfile]:
+    """Merge per-partition profile dictionaries column by column"""
+    merged: Dict[str, ColumnProfile] = {}
+    for profiles in partials:
+        for col, profile in profiles.items():
+            if col in merged:
+                merged[col].merge(profile)
+            else:
+                merged[col] = profile
+    return merged
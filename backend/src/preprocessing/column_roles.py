@@ -0,0 +1,111 @@
+import re
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from .column_types import is_text_dtype, is_numeric_column_dtype
+from .type_conversion import spread_sample, infer_datetime_format
+
+# Roles of text columns, decided from a sample of their values
+TEXT_ROLES = ("identifier", "code", "categorical", "free_text", "date_like", "numeric_string")
+# Roles of columns that are not stored as text
+DTYPE_ROLES = ("numeric", "datetime", "boolean", "other")
+# Text columns that get the full normalization (HTML, lowercasing, whitespace)
+NORMALIZE_ROLES = ("free_text", "categorical")
+# Text columns that get the NLP transforms (stopwords, lemmatization, stemming)
+NLP_ROLES = ("free_text",)
+
+# Non-empty values sampled per text column
+DEFAULT_ROLE_SAMPLE_SIZE = 1000
+# Fewer sampled values than this are too few to call a column an identifier or categorical
+MIN_ROLE_SAMPLE = 20
+
+_IDENTIFIER_NAME_RE = re.compile(r"(^|[_\s])(id|uuid|guid|key|email|url)$")
+_CODE_NAME_RE = re.compile(r"(^|[_\s])(sku|code)$")
+_CODE_RE = r"^(?:[A-Za-z0-9]*[0-9_\-./#:][A-Za-z0-9_\-./#:]*|[A-Z0-9]{2,})$"
+_NUMBER_RE = r"^[+-]?(?:\d+|\d{1,3}(?:,\d{3})+)?(?:\.\d+)?(?:[eE][+-]?\d+)?$"
+
+
+def _dtype_role(dtype) -> str:
+    if ptypes.is_bool_dtype(dtype):
+        return "boolean"
+    if is_numeric_column_dtype(dtype):
+        return "numeric"
+    if ptypes.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "categorical"
+    return "other"
+
+
+def _sample(s: pd.Series, sample_size: int) -> pd.Series:
+    """Up to sample_size stripped non-empty values spread across the column, without scanning it"""
+    if len(s) > 4 * sample_size:
+        s = s.iloc[np.linspace(0, len(s) - 1, 4 * sample_size).astype(int)]
+    return spread_sample(s, sample_size).str.strip()
+
+
+def _text_role(name, sample: pd.Series) -> str:
+    n = len(sample)
+    if not n:
+        return "categorical"
+    name = str(name).lower()
+    single_token = ~sample.str.contains(r"\s", regex=True)
+
+    number_share = sample.str.match(_NUMBER_RE).mean()
+    if number_share >= 0.95 and sample.str.match(r"^0\d").mean() < 0.05:
+        return "numeric_string"
+    if sample.str.contains(r"\d", regex=True).mean() >= 0.9 and sample.str.len().mean() <= 40:
+        if infer_datetime_format(sample) is not None:
+            return "date_like"
+
+    distinct_ratio = sample.nunique() / n
+    if single_token.mean() >= 0.95:
+        code_hint = bool(_CODE_NAME_RE.search(name))
+        if distinct_ratio >= 0.95 and not code_hint and (n >= MIN_ROLE_SAMPLE or _IDENTIFIER_NAME_RE.search(name)):
+            return "identifier"
+        if (code_hint or sample.str.match(_CODE_RE).mean() >= 0.9) and sample.str.len().mean() <= 32:
+            return "code"
+    if distinct_ratio <= 0.5 and (n >= MIN_ROLE_SAMPLE or single_token.all()):
+        return "categorical"
+    return "free_text"
+
+
+def detect_column_roles(df: pd.DataFrame, sample_size: int = DEFAULT_ROLE_SAMPLE_SIZE,
+                        previous: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Classify every column by what it holds
+
+    Text columns are told apart from a sample of at most sample_size values
+    spread across the column: identifier (unique single tokens such as IDs,
+    UUIDs or emails), code (SKUs, zip or status codes), categorical (few
+    distinct values), date_like, numeric_string or free_text. Other columns
+    get their dtype's role (numeric, datetime, boolean, categorical, other).
+
+    Args:
+        df: DataFrame to classify
+        sample_size: Values sampled per text column
+        previous: Roles detected earlier; text columns found there are not sampled again
+
+    Returns:
+        {column: role}
+    """
+    previous = previous or {}
+    roles: Dict[str, str] = {}
+    for col, dtype in df.dtypes.items():
+        if not is_text_dtype(dtype):
+            roles[col] = _dtype_role(dtype)
+        elif previous.get(col) in TEXT_ROLES:
+            roles[col] = previous[col]
+        else:
+            roles[col] = _text_role(col, _sample(df[col], sample_size))
+    return roles
+
+
+def columns_with_role(roles: Dict[str, str], role_names: Iterable[str],
+                      columns: Optional[Iterable[str]] = None) -> List[str]:
+    """Columns (of columns, or all of roles) whose role is one of role_names"""
+    role_names = set(role_names)
+    columns = roles if columns is None else columns
+    return [col for col in columns if roles.get(col) in role_names]
@@ -0,0 +1,33 @@
+from typing import List
+import pandas as pd
+from pandas.api import types as ptypes
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def is_text_dtype(dtype) -> bool:
+    """True for object, pandas string and Arrow string dtypes"""
+    if ptypes.is_object_dtype(dtype) or isinstance(dtype, pd.StringDtype):
+        return True
+    if PYARROW_AVAILABLE and isinstance(dtype, pd.ArrowDtype):
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
+
+
+def is_numeric_column_dtype(dtype) -> bool:
+    """True for numpy, nullable and Arrow numeric dtypes (booleans excluded)"""
+    return ptypes.is_numeric_dtype(dtype) and not ptypes.is_bool_dtype(dtype)
+
+
+def text_columns(df: pd.DataFrame) -> List[str]:
+    """Columns holding strings, whatever their storage backend"""
+    return [col for col, dtype in df.dtypes.items() if is_text_dtype(dtype)]
+
+
+def numeric_columns(df: pd.DataFrame) -> List[str]:
+    """Columns holding numbers, whatever their storage backend"""
+    return [col for col, dtype in df.dtypes.items() if is_numeric_column_dtype(dtype)]
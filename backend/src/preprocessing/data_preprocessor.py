@@ -3,50 +3,49 @@ import numpy as np
 import re
 from bs4 import BeautifulSoup
 from datetime import datetime
-import spacy
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
-import nltk
-nltk.download('punkt')
-nltk.download('popular')
 
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
-    nltk.download('wordnet')
-    nltk.download('omw-1.4')
+from .column_profile import profile_columns
+from .column_roles import NLP_ROLES, NORMALIZE_ROLES, columns_with_role, detect_column_roles
+from .column_types import is_text_dtype, text_columns, numeric_columns
+from .nlp_resources import get_spacy_pipeline, get_stemmer, get_word_tokenizer
+from .deduplication import DEFAULT_SIMILARITY_THRESHOLD, deduplicate
+from .imputation import apply_fill_null_strategy
+from .parallel import parallel_text_transform
+from .transform_cache import TransformCache, apply_unique
+from .type_conversion import apply_type_conversion
+from ..ingest.engines import get_ingest_engine
+from ..ingest.upload_stream import detect_encoding
 
 try:
-    import chardet
-    CHORDET_AVAILABLE = True
-except Exception:
-    CHORDET_AVAILABLE = False
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+_HTML_TAG_RE = re.compile('<[^<]+?>')
+_WHITESPACE_RE = re.compile(r'\s+')
+# RE2 equivalent of Python's Unicode-aware \s for the Arrow kernels
+_ARROW_WHITESPACE_PATTERN = r'[\s\x0b\x1c-\x1f\x85\p{Z}]+'
+# Cells containing '<' or '&' may hold tags or entities for BeautifulSoup
+_MARKUP_PATTERN = '[<&]'
 
-def _load_csv(input_obj):
+def _load_csv(input_obj, engine=None):
     if isinstance(input_obj, pd.DataFrame):
         return input_obj.copy()
+    ingest_engine = get_ingest_engine(engine)
     if hasattr(input_obj, "read"):
         try:
-            return pd.read_csv(input_obj, engine="python")
+            return ingest_engine.read_csv(input_obj)
         except Exception:
             input_obj.seek(0)
-            return pd.read_csv(input_obj)
+            return pd.read_csv(input_obj, encoding=detect_encoding(input_obj), engine="python")
     if isinstance(input_obj, str):
         try:
-            return pd.read_csv(input_obj, engine="python")
+            return ingest_engine.read_csv(input_obj)
         except Exception:
-            if CHORDET_AVAILABLE:
-                with open(input_obj, "rb") as fh:
-                    raw = fh.read()
-                enc = chardet.detect(raw).get("encoding", "utf-8")
-                return pd.read_csv(input_obj, encoding=enc, engine="python")
-            else:
-                with open(input_obj, "rb") as fh:
-                    raw = fh.read(100)
-                text = raw.decode("utf-8", errors="replace")
-                from io import StringIO
-                return pd.read_csv(StringIO(text))
+            # Guess the encoding from a bounded sample rather than the whole file
+            return pd.read_csv(input_obj, encoding=detect_encoding(input_obj), engine="python")
     raise ValueError("Unsupported input type for _load_csv")
 
 def remove_html(text):
@@ -55,7 +54,7 @@ def remove_html(text):
     try:
         return BeautifulSoup(text, "lxml").get_text(separator=' ')
     except:
-        return re.sub('<[^<]+?>', ' ', text)
+        return _HTML_TAG_RE.sub(' ', text)
 
 def validate_and_normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
     new_columns = []
@@ -68,96 +67,231 @@ def validate_and_normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
     df.columns = new_columns
     return df
 
-def normalize_text_column(s: pd.Series, lowercase=True, strip=True, remove_html_flag=True):
-    s = s.fillna('')
-    if remove_html_flag:
-        s = s.map(remove_html)
+def _string_mask(values: np.ndarray) -> np.ndarray:
+    """Boolean mask of the cells that hold Python strings"""
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        return np.ones(len(values), dtype=bool)
+    return np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+
+def _markup_mask(strings: np.ndarray) -> np.ndarray:
+    """Boolean mask of the strings that may contain HTML"""
+    if PYARROW_AVAILABLE:
+        arr = pa.array(strings, type=pa.string())
+        return pc.match_substring_regex(arr, pattern=_MARKUP_PATTERN).to_numpy(zero_copy_only=False)
+    return pd.Series(strings, dtype=object).str.contains(_MARKUP_PATTERN, regex=True).to_numpy(dtype=bool)
+
+def _normalize_strings_arrow(arr, lowercase, strip, collapse_whitespace=True):
     if lowercase:
-        s = s.map(lambda x: x.lower() if isinstance(x, str) else x)
+        arr = pc.utf8_lower(arr)
+    if collapse_whitespace:
+        arr = pc.replace_substring_regex(arr, pattern=_ARROW_WHITESPACE_PATTERN, replacement=' ')
     if strip:
-        s = s.map(lambda x: x.strip() if isinstance(x, str) else x)
-    s = s.map(lambda x: re.sub(r'\s+', ' ', x) if isinstance(x, str) else x)
-    return s
-
-def apply_type_conversion(df: pd.DataFrame, conversion: dict):
-    df = df.copy()
-    for col, t in conversion.items():
-        if col not in df.columns:
-            continue
-        try:
-            if t == 'numeric':
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            elif t == 'datetime':
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-            elif t == 'text':
-                df[col] = df[col].astype(str)
-        except Exception:
-            pass
-    return df
+        arr = pc.utf8_trim_whitespace(arr)
+    return arr
+
+def _normalize_strings_pandas(strings: pd.Series, lowercase, strip, collapse_whitespace=True) -> pd.Series:
+    if lowercase:
+        strings = strings.str.lower()
+    if collapse_whitespace:
+        strings = strings.str.replace(_WHITESPACE_RE, ' ', regex=True)
+    if strip:
+        strings = strings.str.strip()
+    return strings
+
+def normalize_text_column(s: pd.Series, lowercase=True, strip=True, remove_html_flag=True, cache=None,
+                          collapse_whitespace=True):
+    """
+    Strip HTML, lowercase, collapse whitespace and trim a text column
+
+    Lowercasing, whitespace collapsing and trimming run as one vectorized pass
+    over Arrow string kernels (pandas .str methods without pyarrow). HTML is
+    only parsed for the cells that contain '<' or '&', once per distinct
+    value (and once per run when a TransformCache is passed). Nulls become ''
+    and non-string cells are left as they are. collapse_whitespace=False keeps
+    inner whitespace (codes, identifiers) and only trims the ends.
+    """
+    arrow_backed = PYARROW_AVAILABLE and isinstance(s.dtype, pd.ArrowDtype)
+    values = s.fillna('').to_numpy(dtype=object)
+    mask = _string_mask(values)
+    if not mask.any():
+        return pd.Series(values, index=s.index, name=s.name)
+    strings = values[mask] if not mask.all() else values
+
+    if remove_html_flag:
+        has_markup = _markup_mask(strings)
+        if has_markup.any():
+            strings = strings.copy()
+            markup = pd.Series(strings[has_markup], dtype=object, name=s.name)
+            strings[has_markup] = apply_unique(markup, remove_html, "remove_html", cache).to_numpy(dtype=object)
+
+    if PYARROW_AVAILABLE:
+        normalized = _normalize_strings_arrow(pa.array(strings, type=pa.string()), lowercase, strip,
+                                              collapse_whitespace)
+        if arrow_backed and mask.all():
+            return pd.Series(pd.arrays.ArrowExtensionArray(normalized), index=s.index, name=s.name)
+        normalized = normalized.to_numpy(zero_copy_only=False)
+    else:
+        normalized = _normalize_strings_pandas(pd.Series(strings, dtype=object), lowercase, strip,
+                                               collapse_whitespace).to_numpy(dtype=object)
+
+    if mask.all():
+        return pd.Series(normalized, index=s.index, name=s.name, dtype=object)
+    values = values.copy()
+    values[mask] = normalized
+    return pd.Series(values, index=s.index, name=s.name)
 
-# Load spaCy once
-nlp = spacy.load("en_core_web_sm")
+# Texts handed to spaCy per nlp.pipe batch
+DEFAULT_NLP_BATCH_SIZE = 1000
 
-def remove_stopwords_from_text_column(df, remove_stopwords=True):
+def _remove_stop_tokens(doc):
+    return " ".join([token.text for token in doc if not token.is_stop])
+
+def _lemmatize_doc(doc):
+    return " ".join([token.text if token.lemma_ == '-PRON-' else token.lemma_ for token in doc])
+
+def _pipe_texts(texts, profile, transform, batch_size=DEFAULT_NLP_BATCH_SIZE, n_process=1,
+                progress_callback=None):
+    """
+    Stream texts through nlp.pipe and apply transform to each Doc
+
+    progress_callback(done, total) is called once per batch as results come
+    off the stream, not once per cell.
+    """
+    nlp = get_spacy_pipeline(profile)
+    total = len(texts)
+    results = []
+    for done, doc in enumerate(nlp.pipe(texts, batch_size=batch_size, n_process=n_process), 1):
+        results.append(transform(doc))
+        if progress_callback and (done % batch_size == 0 or done == total):
+            progress_callback(done, total)
+    return results
+
+def _stopword_columns(df, columns=None):
+    """Text columns (of columns, or all of df) with at least one word-like value"""
+    candidates = text_columns(df) if columns is None else [col for col in columns if col in text_columns(df)]
+    return [col for col in candidates if df[col].dropna().astype(str).str.match('.[a-zA-Z]+.').any()]
+
+def remove_stopwords_from_text_column(df, remove_stopwords=True, batch_size=DEFAULT_NLP_BATCH_SIZE,
+                                      n_process=1, progress_callback=None, cache=None, n_workers=1, columns=None):
     if not remove_stopwords:
         return df, "Stop words removal skipped."
-    # Detect text/object columns with non-empty values
-    text_cols = [col for col in df.select_dtypes(include=["object"]).columns if df[col].dropna().astype(str).str.match('.[a-zA-Z]+.').any()]
+    # Detect text/object columns (of columns, when given) with non-empty values
+    text_cols = _stopword_columns(df, columns)
     if not text_cols:
         return df  # no text columns found
+    if n_workers > 1:
+        return parallel_text_transform(df, text_cols, ("stopwords",), n_workers, batch_size=batch_size)[0]
 
-    # For each text column detected, remove stopwords
-    def process_text(text):
-        doc = nlp(str(text))
-        filtered_tokens = [token.text for token in doc if not token.is_stop]
-        return " ".join(filtered_tokens)
+    # For each text column detected, remove stopwords from each distinct value in nlp.pipe batches
+    def batch_transform(values):
+        texts = [str(text) for text in values]
+        return _pipe_texts(texts, "stopwords", _remove_stop_tokens, batch_size, n_process, progress_callback)
 
     for col in text_cols:
-        df[col] = df[col].apply(process_text)
+        df[col] = apply_unique(df[col], transform_name="stopwords", cache=cache, batch_transform=batch_transform)
 
     return df
 
-nlp = spacy.load("en_core_web_sm", disable=["parser", "ner"])
-stemmer = PorterStemmer()
-
 def lemmatize_text(text):
-    doc = nlp(str(text))
-    return " ".join([token.text if token.lemma_ == '-PRON-' else token.lemma_ for token in doc])
+    return _lemmatize_doc(get_spacy_pipeline("lemmatize")(str(text)))
 
 def stem_text(text):
-    words = word_tokenize(str(text))
+    stemmer = get_stemmer()
+    words = get_word_tokenizer()(str(text))
     return " ".join([stemmer.stem(word) for word in words])
 
-def process_text(df, method):
-    text_cols = df.select_dtypes(include=["object"]).columns
+def process_text(df, method, batch_size=DEFAULT_NLP_BATCH_SIZE, n_process=1, progress_callback=None, cache=None,
+                 n_workers=1, columns=None):
+    text_cols = text_columns(df) if columns is None else [col for col in columns if col in text_columns(df)]
+    if n_workers > 1 and method in ('lemmatize', 'stem'):
+        return parallel_text_transform(df, text_cols, (method,), n_workers, batch_size=batch_size)[0]
+
+    def lemmatize_batch(values):
+        texts = [str(text) for text in values]
+        return _pipe_texts(texts, "lemmatize", _lemmatize_doc, batch_size, n_process, progress_callback)
+
     for col in text_cols:
         if method == 'lemmatize':
-            df[col] = df[col].apply(lemmatize_text)
+            df[col] = apply_unique(df[col], transform_name="lemmatize", cache=cache, batch_transform=lemmatize_batch)
         elif method == 'stem':
-            df[col] = df[col].apply(stem_text)
+            df[col] = apply_unique(df[col], stem_text, "stem", cache)
     return df
 
 
-def preprocess_csv(input_obj, fill_null_strategy=None, type_conversions=None, drop_duplicates_cols=None, remove_stopwords_flag=False):
-    df = _load_csv(input_obj)
+def preprocess_csv(input_obj, fill_null_strategy=None, type_conversions=None, drop_duplicates_cols=None, remove_stopwords_flag=False, engine=None,
+                   nlp_batch_size=DEFAULT_NLP_BATCH_SIZE, nlp_n_process=1, n_workers=1, row_block_size=None,
+                   dedupe_mode=None, dedupe_threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    df = _load_csv(input_obj, engine=engine)
     df = validate_and_normalize_headers(df)
 
-    # Normalize text columns (object dtype)
-    text_cols = df.select_dtypes(include=['object']).columns.tolist()
+    # Per-value results of the expensive text transforms, shared across columns
+    transform_cache = TransformCache()
+    # With n_workers > 1 text columns are transformed in worker processes
+    parallel = n_workers > 1 and PYARROW_AVAILABLE
+    parallel_report = {}
+
+    # Sample each column to tell free text from identifiers, codes, categories,
+    # dates and numbers stored as text
+    column_roles = detect_column_roles(df)
+
+    # Normalize text columns (object, string and Arrow string dtypes); only free text
+    # and categories are lowercased and stripped of HTML, the rest just have their
+    # whitespace trimmed
+    text_cols = text_columns(df)
+    normalize_cols = columns_with_role(column_roles, NORMALIZE_ROLES, text_cols)
+    # Normalizing turns text nulls into ''; remember where they were for fill_null_strategy
+    text_nulls = {}
+    if fill_null_strategy:
+        text_nulls = {col: nulls for col in text_cols if (nulls := df[col].isna()).any()}
+    if parallel and normalize_cols:
+        df, parallel_report['normalize'] = parallel_text_transform(
+            df, normalize_cols, ("normalize",), n_workers, row_block_size, nlp_batch_size)
+    else:
+        for col in normalize_cols:
+            df[col] = normalize_text_column(df[col], cache=transform_cache)
     for col in text_cols:
-        df[col] = normalize_text_column(df[col])
+        if col not in normalize_cols:
+            df[col] = normalize_text_column(df[col], lowercase=False, remove_html_flag=False,
+                                            collapse_whitespace=False)
 
-    # Apply type conversions (numeric, datetime, text)
+    # Apply type conversions (numeric, datetime, text) column by column in place
+    conversion_report = None
     if type_conversions:
-        df = apply_type_conversion(df, type_conversions)
+        df, conversion_report = apply_type_conversion(df, type_conversions, return_report=True)
 
-    # Drop duplicates as per input
-    if drop_duplicates_cols:
-        df = df.drop_duplicates(subset=drop_duplicates_cols, keep='first')
+    # Drop exact (row hash) or near (MinHash/LSH) duplicates over drop_duplicates_cols
+    dedupe_report = None
+    if dedupe_mode or drop_duplicates_cols:
+        df, dedupe_report = deduplicate(df, dedupe_mode or 'exact', columns=drop_duplicates_cols,
+                                        threshold=dedupe_threshold, row_block_size=row_block_size)
 
-    # Remove stopwords if flagged
-    if remove_stopwords_flag:
-        df = remove_stopwords_from_text_column(df, remove_stopwords=True)
+    # Converted columns take their new dtype's role
+    column_roles = detect_column_roles(df, previous=column_roles)
+
+    # One pass per numeric column; the sketch replaces the raw value list and
+    # supplies the mean/median used to fill nulls
+    profiles = profile_columns(df, numeric_columns(df))
+
+    # Fill or drop missing values (the profiles are updated with the filled cells)
+    null_report = None
+    if fill_null_strategy:
+        restored = [col for col in text_nulls if col in df.columns and is_text_dtype(df[col].dtype)]
+        for col in restored:
+            df[col] = df[col].mask(text_nulls[col].reindex(df.index, fill_value=False))
+        df, null_report = apply_fill_null_strategy(df, fill_null_strategy, profiles=profiles)
+        for col in restored:
+            df[col] = df[col].fillna('')
+
+    # Remove stopwords from free text columns if flagged
+    nlp_cols = columns_with_role(column_roles, NLP_ROLES)
+    if remove_stopwords_flag and parallel:
+        stopword_cols = _stopword_columns(df, nlp_cols)
+        if stopword_cols:
+            df, parallel_report['stopwords'] = parallel_text_transform(
+                df, stopword_cols, ("stopwords",), n_workers, row_block_size, nlp_batch_size)
+    elif remove_stopwords_flag and nlp_cols:
+        df = remove_stopwords_from_text_column(df, remove_stopwords=True, batch_size=nlp_batch_size,
+                                               n_process=nlp_n_process, cache=transform_cache, columns=nlp_cols)
 
     # Prepare file and numeric metadata
     file_meta = {
@@ -165,21 +299,19 @@ def preprocess_csv(input_obj, fill_null_strategy=None, type_conversions=None, dr
         'num_rows': df.shape[0],
         'num_columns': df.shape[1],
         'shape': df.shape,
-        'upload_time': datetime.utcnow().isoformat() + 'Z'
+        'upload_time': datetime.utcnow().isoformat() + 'Z',
+        'text_transform_cache': transform_cache.report(),
+        'column_roles': column_roles
     }
+    if parallel_report:
+        file_meta['parallel'] = parallel_report
+    if dedupe_report:
+        file_meta['deduplication'] = dedupe_report
+    if conversion_report:
+        file_meta['type_conversion'] = conversion_report
+    if null_report:
+        file_meta['null_handling'] = null_report
 
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    numeric_metadata = []
-    for col in numeric_cols:
-        numeric_metadata.append({
-            'column_name': col,
-            'count': int(df[col].count()),
-            'mean': float(df[col].mean()),
-            'std': float(df[col].std()),
-            'min': float(df[col].min()),
-            'max': float(df[col].max()),
-            'values': df[col].dropna().tolist() 
-        })
-
+    numeric_metadata = [profile.to_dict() for profile in profiles.values()]
 
     return df, file_meta, numeric_metadata
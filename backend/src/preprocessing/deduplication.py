@@ -0,0 +1,197 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .column_types import text_columns
+
+DEDUPE_MODES = ("exact", "minhash")
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 5
+# Rows whose shingles are hashed together (bounds MinHash memory)
+DEFAULT_MINHASH_BLOCK_ROWS = 10_000
+
+
+def _subset(df: pd.DataFrame, columns) -> List[str]:
+    if columns is None:
+        return list(df.columns)
+    if isinstance(columns, str):
+        return [columns]
+    return list(columns)
+
+
+def exact_duplicate_mask(df: pd.DataFrame, columns=None) -> np.ndarray:
+    """True for rows whose values in columns repeat an earlier row (64-bit row hashes)"""
+    hashes = pd.util.hash_pandas_object(df[_subset(df, columns)], index=False)
+    return hashes.duplicated(keep="first").to_numpy()
+
+
+def row_text(df: pd.DataFrame, columns=None) -> pd.Series:
+    """Normalized text representation of each row: lowercased values joined by spaces"""
+    columns = _subset(df, columns)
+    if not columns:
+        return pd.Series("", index=df.index)
+    text = df[columns[0]].astype(str)
+    for col in columns[1:]:
+        text = text + " " + df[col].astype(str)
+    return text.str.lower().str.split().str.join(" ")
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer; uint64 arithmetic wraps, which is what it relies on"""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _block_signatures(texts, seeds: np.ndarray, shingle_size: int) -> np.ndarray:
+    shingles = []
+    counts = np.empty(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        text = text or ""
+        n = max(1, len(text) - shingle_size + 1)
+        shingles.extend(text[j:j + shingle_size] for j in range(n))
+        counts[i] = n
+    base = pd.util.hash_array(np.asarray(shingles, dtype=object))
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    signatures = np.empty((len(counts), len(seeds)), dtype=np.uint64)
+    for i, perm_seed in enumerate(seeds):
+        signatures[:, i] = np.minimum.reduceat(_mix64(base ^ perm_seed), offsets)
+    return signatures
+
+
+def minhash_signatures(texts, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                       seed: int = 1, row_block_size: Optional[int] = None) -> np.ndarray:
+    """
+    MinHash signatures over character shingles
+
+    Rows are processed row_block_size at a time: the shingles of a block are
+    hashed in one vectorized call and each of the num_perm hash functions is
+    a seeded splitmix64 remix of those hashes, reduced to a per-row minimum
+    with np.minimum.reduceat. Only one block's shingles are held at once.
+
+    Returns:
+        uint64 array of shape (len(texts), num_perm)
+    """
+    if not len(texts):
+        return np.empty((0, num_perm), dtype=np.uint64)
+    block = max(1, int(row_block_size or DEFAULT_MINHASH_BLOCK_ROWS))
+    seeds = _mix64(np.arange(1, num_perm + 1, dtype=np.uint64) + np.uint64(seed))
+    return np.concatenate([_block_signatures(texts[start:start + block], seeds, shingle_size)
+                           for start in range(0, len(texts), block)])
+
+
+def lsh_bands(num_perm: int, threshold: float, min_recall: float = 0.95) -> Tuple[int, int]:
+    """
+    (bands, rows per band) for LSH candidate generation
+
+    Picks the widest bands (fewest spurious candidates) for which a pair at
+    exactly threshold similarity still lands in a shared bucket with
+    probability 1 - (1 - s**r)**b >= min_recall.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1.0 - (1.0 - threshold ** rows) ** bands >= min_recall:
+            best = (bands, rows)
+    return best
+
+
+def near_duplicate_mask(texts, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                        shingle_size: int = DEFAULT_SHINGLE_SIZE, row_block_size: Optional[int] = None) -> np.ndarray:
+    """
+    True for rows whose estimated Jaccard similarity to an earlier row reaches threshold
+
+    Rows sharing an LSH band bucket are compared with the earliest row of the
+    bucket; matches are merged with union-find, and every row except the
+    first of its group is marked. Similarity is therefore not required to be
+    transitive: a row can be dropped through a chain of near matches.
+    """
+    n = len(texts)
+    signatures = minhash_signatures(texts, num_perm, shingle_size, row_block_size=row_block_size)
+    bands, rows = lsh_bands(num_perm, threshold)
+    parent = np.arange(n)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = pd.util.hash_pandas_object(pd.DataFrame(block), index=False).to_numpy()
+        # Every row is compared with the earliest row of its bucket (first_rows)
+        _, first_rows, bucket = np.unique(keys, return_index=True, return_inverse=True)
+        anchors = first_rows[bucket]
+        members = np.flatnonzero(anchors != np.arange(n))
+        for start in range(0, len(members), DEFAULT_MINHASH_BLOCK_ROWS):
+            batch = members[start:start + DEFAULT_MINHASH_BLOCK_ROWS]
+            similarity = (signatures[batch] == signatures[anchors[batch]]).mean(axis=1)
+            matched = batch[similarity >= threshold]
+            for member, anchor in zip(matched.tolist(), anchors[matched].tolist()):
+                root_a, root_b = find(anchor), find(member)
+                if root_a != root_b:
+                    # The earliest row of a group stays its root (and is kept)
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = np.fromiter((find(i) for i in range(n)), dtype=np.int64, count=n)
+    return roots != np.arange(n)
+
+
+def deduplicate(df: pd.DataFrame, mode: str = "exact", columns=None,
+                threshold: float = DEFAULT_SIMILARITY_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                shingle_size: int = DEFAULT_SHINGLE_SIZE, rows_per_chunk: int = 1,
+                row_block_size: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Drop exact or near-duplicate rows, keeping the first occurrence
+
+    Args:
+        df: DataFrame to deduplicate
+        mode: "exact" (row hashes over columns) or "minhash" (near duplicates
+            of the normalized row text; columns default to the text columns)
+        columns: Columns defining a duplicate; defaults to all columns
+        threshold: Minimum estimated Jaccard similarity for "minhash"
+        num_perm: MinHash signature length
+        shingle_size: Character shingle length
+        rows_per_chunk: Rows per chunk assumed when estimating embedding calls saved
+        row_block_size: Rows whose MinHash signatures are computed together
+
+    Returns:
+        Tuple of (deduplicated DataFrame, report)
+    """
+    if mode not in DEDUPE_MODES:
+        raise ValueError(f"Unknown dedupe mode '{mode}'. Available: {list(DEDUPE_MODES)}")
+
+    if mode == "exact":
+        duplicates = exact_duplicate_mask(df, columns)
+    else:
+        if columns is None:
+            columns = text_columns(df) or list(df.columns)
+        duplicates = near_duplicate_mask(row_text(df, columns).tolist(), threshold, num_perm, shingle_size,
+                                         row_block_size=row_block_size)
+
+    rows_before = len(df)
+    removed = int(duplicates.sum())
+    if removed:
+        df = df[~duplicates]
+    rows_per_chunk = max(1, int(rows_per_chunk))
+    report = {
+        "mode": mode,
+        "columns": _subset(df, columns),
+        "rows_before": rows_before,
+        "rows_after": rows_before - removed,
+        "rows_removed": removed,
+        # One embedding call per chunk of rows_per_chunk rows
+        "estimated_embedding_calls_saved": math.ceil(rows_before / rows_per_chunk)
+                                           - math.ceil((rows_before - removed) / rows_per_chunk)
+    }
+    if mode == "minhash":
+        bands, rows = lsh_bands(num_perm, threshold)
+        report.update({"threshold": threshold, "num_perm": num_perm, "shingle_size": shingle_size,
+                       "lsh_bands": bands, "lsh_rows_per_band": rows})
+    return df, report
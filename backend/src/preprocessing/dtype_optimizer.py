@@ -0,0 +1,90 @@
+from typing import Any, Dict, Optional, Tuple
+import pandas as pd
+from pandas.api import types as ptypes
+
+from .column_types import is_text_dtype, is_numeric_column_dtype
+from .type_conversion import downcast_numeric
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# A string column becomes categorical when distinct values / rows is at most this
+DEFAULT_CATEGORY_MAX_RATIO = 0.5
+
+
+def _column_bytes(s: pd.Series) -> int:
+    return int(s.memory_usage(index=False, deep=True))
+
+
+def _optimize_text(s: pd.Series, category_max_ratio: float, role: Optional[str] = None) -> pd.Series:
+    non_null = s.dropna()
+    if non_null.empty:
+        return s
+    if not isinstance(s.dtype, pd.ArrowDtype) and pd.api.types.infer_dtype(non_null, skipna=True) != "string":
+        return s  # mixed Python objects, leave them alone
+    # Identifiers and free text are (nearly) all distinct; skip counting them
+    if role not in ("identifier", "free_text") and non_null.nunique() <= category_max_ratio * len(s):
+        return s.astype("category")
+    if PYARROW_AVAILABLE and not isinstance(s.dtype, pd.ArrowDtype):
+        return s.astype(pd.ArrowDtype(pa.string()))
+    return s
+
+
+def optimize_dtypes(df: pd.DataFrame, category_max_ratio: float = DEFAULT_CATEGORY_MAX_RATIO,
+                    downcast: bool = True, column_roles: Optional[Dict[str, str]] = None
+                    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Shrink a DataFrame's memory footprint column by column
+
+    Low-cardinality strings become categoricals (integer codes plus one copy
+    of each distinct value), other strings become Arrow-backed strings, and
+    numbers are downcast to the smallest dtype that holds them losslessly.
+    The input frame is left untouched; a shallow copy with the replaced
+    columns is returned.
+
+    Args:
+        df: DataFrame to optimize
+        category_max_ratio: Maximum distinct/rows ratio for categoricals
+        downcast: Downcast integer and float columns
+        column_roles: Roles from detect_column_roles; identifier and free text columns are not considered for categoricals
+
+    Returns:
+        Tuple of (df, report) with per-column dtypes and bytes before/after
+    """
+    df = df.copy(deep=False)
+    columns: Dict[str, Dict[str, Any]] = {}
+    for col, dtype in list(df.dtypes.items()):
+        if isinstance(dtype, pd.CategoricalDtype) or ptypes.is_bool_dtype(dtype):
+            continue
+        s = df[col]
+        if is_text_dtype(dtype):
+            optimized = _optimize_text(s, category_max_ratio, (column_roles or {}).get(col))
+        elif downcast and is_numeric_column_dtype(dtype):
+            optimized = downcast_numeric(s)
+        else:
+            continue
+        if optimized is s:
+            continue
+        bytes_before = _column_bytes(s)
+        bytes_after = _column_bytes(optimized)
+        if bytes_after >= bytes_before:
+            continue
+        df[col] = optimized
+        columns[str(col)] = {
+            "from_dtype": str(dtype),
+            "to_dtype": str(optimized.dtype),
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after
+        }
+
+    total_after = int(df.memory_usage(index=False, deep=True).sum())
+    saved = sum(c["bytes_before"] - c["bytes_after"] for c in columns.values())
+    report = {
+        "bytes_before": total_after + saved,
+        "bytes_after": total_after,
+        "columns": columns
+    }
+    return df, report
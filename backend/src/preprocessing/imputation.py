@@ -0,0 +1,259 @@
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from .column_profile import ColumnProfile, profile_columns
+from .column_types import is_numeric_column_dtype
+
+NULL_STRATEGIES = ("constant", "mean", "median", "mode", "ffill", "bfill", "drop_rows")
+_ALIASES = {
+    "drop": "drop_rows",
+    "forward_fill": "ffill",
+    "pad": "ffill",
+    "backward_fill": "bfill",
+    "backfill": "bfill",
+}
+_SKIP = ("", "skip", "none")
+# Strategies that only mean something for numeric columns; other columns are left unfilled
+NUMERIC_STRATEGIES = ("mean", "median")
+
+
+def _parse_rule(spec) -> Optional[Dict[str, Any]]:
+    """{"strategy", "value", "group_by"} for a strategy name, "constant:<value>" or dict; None to skip"""
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        name, _, value = spec.partition(":")
+        spec = {"strategy": name, "value": value} if name.strip().lower() == "constant" and _ else {"strategy": spec}
+    rule = dict(spec)
+    strategy = str(rule.get("strategy") or "").strip().lower()
+    if strategy in _SKIP:
+        return None
+    strategy = _ALIASES.get(strategy, strategy)
+    if strategy not in NULL_STRATEGIES:
+        raise ValueError(f"Unknown fill_null_strategy '{strategy}'. Available: {list(NULL_STRATEGIES)}")
+    if strategy == "constant" and "value" not in rule:
+        raise ValueError("The constant fill_null_strategy needs a value")
+    rule["strategy"] = strategy
+    return rule
+
+
+def parse_fill_null_strategy(spec) -> Dict[str, Any]:
+    """
+    Normalize a fill_null_strategy into {"default": rule, "columns": {column: rule}}
+
+    spec is a strategy name ("mean", "mode", "ffill", "drop_rows",
+    "constant:<value>", ...) applied to every column, or a dict / JSON
+    object such as {"strategy": "median", "group_by": "region",
+    "columns": {"city": {"strategy": "constant", "value": "unknown"}}}
+    where "columns" overrides the default per column (null skips a column).
+    """
+    if spec is None:
+        return {"default": None, "columns": {}}
+    if isinstance(spec, str) and spec.strip().startswith("{"):
+        spec = json.loads(spec)
+    if isinstance(spec, dict):
+        default = {key: value for key, value in spec.items() if key != "columns"}
+        columns = {col: _parse_rule(rule) for col, rule in (spec.get("columns") or {}).items()}
+        return {"default": _parse_rule(default) if default.get("strategy") else None, "columns": columns}
+    return {"default": _parse_rule(spec), "columns": {}}
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def _mode(s: pd.Series):
+    counts = s.value_counts(dropna=True, sort=False)
+    if counts.empty:
+        return None
+    return counts.index[counts.to_numpy().argmax()]
+
+
+def _constant_for(s: pd.Series, value):
+    """value cast to the column's kind, so numeric columns are not turned into objects"""
+    if is_numeric_column_dtype(s.dtype):
+        return pd.to_numeric(pd.Series([value]), errors="raise").iloc[0]
+    if ptypes.is_datetime64_any_dtype(s.dtype):
+        return pd.Timestamp(value)
+    return value
+
+
+def _statistic(s: pd.Series, strategy: str, profile: Optional[ColumnProfile]):
+    """Column-wide fill value for mean/median (numeric columns) and mode, taken from the profile when there is one"""
+    if strategy == "mean":
+        if profile is not None:
+            return profile.mean if profile.count else None
+        return s.mean()
+    if strategy == "median":
+        if profile is not None:
+            return profile.sketch.quantiles([0.5])[0] if profile.count else None
+        return s.median()
+    return _mode(s)
+
+
+def _cast_like(s: pd.Series, value):
+    """Keep integer columns integer: round averaged fill values of integer dtypes"""
+    if value is not None and ptypes.is_integer_dtype(s.dtype) and not isinstance(value, (int, np.integer)):
+        return round(float(value))
+    return value
+
+
+def _group_mode(s: pd.Series, keys: pd.Series):
+    """Most frequent value of s within each row's group (NA where the group has none)"""
+    key_codes, key_uniques = pd.factorize(keys)
+    value_codes, value_uniques = pd.factorize(s)
+    n_values = max(len(value_uniques), 1)
+    valid = (key_codes >= 0) & (value_codes >= 0)
+    # Count (group, value) pairs as single int64 codes, then keep each group's most
+    # frequent pair (ties go to the value seen first)
+    counts = pd.Series(key_codes[valid].astype(np.int64) * n_values + value_codes[valid]).value_counts(sort=False)
+    pair_keys, pair_values = np.divmod(counts.index.to_numpy(), n_values)
+    order = np.lexsort((pair_values, -counts.to_numpy(), pair_keys))
+    first = order[np.r_[True, pair_keys[order][1:] != pair_keys[order][:-1]]] if len(order) else order
+    top = np.full(len(key_uniques), -1, dtype=np.int64)
+    top[pair_keys[first]] = pair_values[first]
+    row_codes = np.where(key_codes >= 0, top[key_codes], -1)
+    return pd.api.extensions.take(value_uniques, row_codes, allow_fill=True)
+
+
+def _group_fill(s: pd.Series, keys: pd.Series, strategy: str, fallback) -> pd.Series:
+    """Fill values computed within each group of keys, falling back to the column-wide value"""
+    groups = s.groupby(keys, observed=True, sort=False, dropna=False)
+    if strategy in ("ffill", "bfill"):
+        filled = getattr(groups, strategy)()
+    else:
+        if strategy in NUMERIC_STRATEGIES:
+            per_row = groups.transform(strategy)
+            if ptypes.is_integer_dtype(s.dtype):
+                per_row = per_row.round().astype(s.dtype)
+        else:
+            per_row = pd.Series(_group_mode(s, keys), index=s.index)
+        filled = s.fillna(per_row)
+    if fallback is not None:
+        filled = filled.fillna(fallback)
+    return filled
+
+
+def _fill_column(df: pd.DataFrame, col, rule: Dict[str, Any],
+                 profile: Optional[ColumnProfile]) -> Tuple[pd.Series, Dict[str, Any]]:
+    s = df[col]
+    strategy = rule["strategy"]
+    group_by = rule.get("group_by")
+    entry: Dict[str, Any] = {"strategy": strategy}
+    if group_by:
+        entry["group_by"] = group_by
+
+    if strategy == "constant":
+        value = _constant_for(s, rule["value"])
+    elif strategy in ("mean", "median", "mode"):
+        value = _cast_like(s, _statistic(s, strategy, profile))
+    else:
+        value = None
+
+    if isinstance(s.dtype, pd.CategoricalDtype) and value is not None and value not in s.cat.categories:
+        s = s.cat.add_categories([value])
+
+    if group_by:
+        if group_by not in df.columns:
+            raise ValueError(f"group_by column '{group_by}' not found")
+        filled = _group_fill(s, df[group_by], strategy, value)
+    elif strategy == "ffill":
+        filled = s.ffill()
+    elif strategy == "bfill":
+        filled = s.bfill()
+    elif value is None:
+        filled = s
+    else:
+        filled = s.fillna(value)
+
+    if value is not None:
+        entry["value"] = _json_value(value)
+    return filled, entry
+
+
+def apply_fill_null_strategy(df: pd.DataFrame, fill_null_strategy,
+                             profiles: Optional[Dict[str, ColumnProfile]] = None
+                             ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Fill or drop missing values column by column
+
+    Strategies: constant, mean, median, mode, ffill, bfill (each optionally
+    per group with group_by) and drop_rows. Every column is handled with one
+    vectorized fill; mean and median of numeric columns come from their
+    ColumnProfile (the median is the quantile sketch estimate), so nothing
+    is rescanned. Mean/median leave non-numeric columns unfilled; they are
+    listed under "skipped_columns" in the report.
+    The profiles are updated with the filled values so they describe the
+    returned table.
+
+    Args:
+        df: DataFrame to fill (columns are replaced in place)
+        fill_null_strategy: Strategy name, "constant:<value>", or dict/JSON (see parse_fill_null_strategy)
+        profiles: Column profiles of df's numeric columns, profiled on demand when omitted
+
+    Returns:
+        Tuple of (df, report)
+    """
+    plan = parse_fill_null_strategy(fill_null_strategy)
+    default, overrides = plan["default"], plan["columns"]
+    missing = [col for col in overrides if col not in df.columns]
+    if missing:
+        raise ValueError(f"fill_null_strategy columns not found: {missing}")
+    rules = {col: overrides.get(col, default) for col in df.columns}
+    rules = {col: rule for col, rule in rules.items() if rule is not None}
+    report: Dict[str, Any] = {"columns": {}}
+    if not rules:
+        return df, report
+
+    started = time.perf_counter()
+    drop_cols = [col for col, rule in rules.items() if rule["strategy"] == "drop_rows"]
+    if drop_cols:
+        rows_before = len(df)
+        df = df.dropna(subset=drop_cols)
+        report["rows_dropped"] = rows_before - len(df)
+        if report["rows_dropped"] and profiles is not None:
+            profiles.update(profile_columns(df, list(profiles)))
+    if profiles is None:
+        profiles = profile_columns(df, [col for col in rules if is_numeric_column_dtype(df[col].dtype)])
+
+    for col, rule in rules.items():
+        if rule["strategy"] == "drop_rows":
+            continue
+        column_started = time.perf_counter()
+        profile = profiles.get(col)
+        if profile is not None and profile.null_count == 0:
+            continue
+        mask = df[col].isna()
+        nulls = int(mask.sum())
+        if not nulls:
+            continue
+        if rule["strategy"] in NUMERIC_STRATEGIES and not is_numeric_column_dtype(df[col].dtype):
+            report.setdefault("skipped_columns", []).append(str(col))
+            report["columns"][str(col)] = {"strategy": rule["strategy"], "skipped": "not numeric",
+                                           "filled": 0, "remaining_nulls": nulls}
+            continue
+        try:
+            filled, entry = _fill_column(df, col, rule, profile)
+            df[col] = filled
+            remaining = int(filled.isna().sum())
+            if profile is not None:
+                # The filled cells join the profile; cells still null are counted again
+                profile.null_count -= nulls
+                profile.update(filled[mask])
+        except Exception as e:
+            entry = {"strategy": rule["strategy"], "error": str(e)}
+            remaining = nulls
+        entry["filled"] = nulls - remaining
+        entry["remaining_nulls"] = remaining
+        entry["seconds"] = round(time.perf_counter() - column_started, 4)
+        report["columns"][str(col)] = entry
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return df, report
@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+DEFAULT_SPACY_MODEL = "en_core_web_sm"
+
+# Every component shipped with the en_core_web_* pipelines
+_SPACY_COMPONENTS = ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter")
+
+# Components each operation needs; the rest are excluded at load time.
+# Stop-word flags are lexical attributes, so the tokenizer alone is enough;
+# the rule-based lemmatizer needs POS tags from tagger + attribute_ruler.
+SPACY_PROFILES: Dict[str, tuple] = {
+    "stopwords": (),
+    "lemmatize": ("tok2vec", "tagger", "attribute_ruler", "lemmatizer"),
+}
+
+# NLTK data used by stem_text (word_tokenize), as (resource path, package)
+NLTK_RESOURCES = (
+    ("tokenizers/punkt_tab", "punkt_tab"),
+)
+
+
+class NLPResourceRegistry:
+    """
+    Loads NLP resources on first use, once per process
+
+    Nothing is imported or read from disk until an operation asks for it;
+    load durations are recorded so start-up cost can be reported.
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.load_times: Dict[str, float] = {}
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        resource = self._resources.get(key)
+        if resource is not None:
+            return resource
+        with self._lock:
+            if key not in self._resources:
+                start = time.perf_counter()
+                self._resources[key] = loader()
+                self.load_times[key] = round(time.perf_counter() - start, 4)
+            return self._resources[key]
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._resources
+
+    def spacy_pipeline(self, profile: str = "stopwords", model: str = DEFAULT_SPACY_MODEL):
+        """spaCy pipeline with only the components needed for profile"""
+        if profile not in SPACY_PROFILES:
+            raise ValueError(f"Unknown spaCy profile '{profile}'. Available: {sorted(SPACY_PROFILES)}")
+
+        def _load():
+            import spacy
+            keep = SPACY_PROFILES[profile]
+            return spacy.load(model, exclude=[c for c in _SPACY_COMPONENTS if c not in keep])
+
+        return self.get(f"spacy:{model}:{profile}", _load)
+
+    def stemmer(self):
+        def _load():
+            from nltk.stem import PorterStemmer
+            return PorterStemmer()
+
+        return self.get("nltk:porter_stemmer", _load)
+
+    def word_tokenize(self):
+        """nltk.word_tokenize, downloading the tokenizer data only if it is missing"""
+        def _load():
+            import nltk
+            for resource_path, package in NLTK_RESOURCES:
+                try:
+                    nltk.data.find(resource_path)
+                except LookupError:
+                    nltk.download(package, quiet=True)
+            from nltk.tokenize import word_tokenize
+            return word_tokenize
+
+        return self.get("nltk:word_tokenize", _load)
+
+    def preload(self, names: Iterable[str]):
+        """Load resources ahead of time; names are spaCy profiles and/or "stem" """
+        for name in names:
+            name = name.strip()
+            if not name:
+                continue
+            if name == "stem":
+                self.stemmer()
+                self.word_tokenize()
+            else:
+                self.spacy_pipeline(name)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "loaded": sorted(self._resources),
+            "load_seconds": dict(self.load_times),
+        }
+
+
+registry = NLPResourceRegistry()
+
+
+def get_spacy_pipeline(profile: str = "stopwords", model: str = DEFAULT_SPACY_MODEL):
+    return registry.spacy_pipeline(profile, model)
+
+
+def get_stemmer():
+    return registry.stemmer()
+
+
+def get_word_tokenizer():
+    return registry.word_tokenize()
+
+
+def preload_nlp_resources(names: Optional[Iterable[str]] = None):
+    registry.preload(names if names is not None else list(SPACY_PROFILES) + ["stem"])
+    return registry.report()
+
+
+def nlp_resource_report() -> Dict[str, Any]:
+    return registry.report()
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Bump when preprocessing output changes so stale entries are not served
+CACHE_VERSION = 3
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+_FRAME_FILE = "frame.parquet"
+_META_FILE = "meta.json"
+
+
+def frame_content_hash(df: pd.DataFrame) -> str:
+    """sha256 over a DataFrame's columns, dtypes and row hashes"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return str(value)
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class PreprocessCache:
+    """
+    Content-addressed on-disk cache of preprocessing results
+
+    Entries are keyed by the hash of the input content plus the preprocessing
+    parameters, and hold the processed table as Parquet next to its metadata
+    as JSON. Writes are staged and renamed into place, so several workers can
+    share the directory. Least recently used entries are evicted once the
+    directory outgrows max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content_hash: str, **params) -> str:
+        """Cache key for an input hash and the parameters that shape the output"""
+        payload = json.dumps({"version": CACHE_VERSION, "content": content_hash, "params": params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any], list]]:
+        """Return (df, file_meta, numeric_meta) for key, or None on a miss"""
+        entry = self._entry_dir(key)
+        meta_path = os.path.join(entry, _META_FILE)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            df = pd.read_parquet(os.path.join(entry, _FRAME_FILE))
+            os.utime(meta_path)  # mark as recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return df, meta["file_meta"], meta["numeric_meta"]
+
+    def put(self, key: str, df: pd.DataFrame, file_meta: Dict[str, Any], numeric_meta: list) -> bool:
+        """Store a result; returns False when the table cannot be written as Parquet"""
+        entry = self._entry_dir(key)
+        if os.path.isdir(entry):
+            return True
+        staging = os.path.join(self.cache_dir, f".staging-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            df.to_parquet(os.path.join(staging, _FRAME_FILE))
+            with open(os.path.join(staging, _META_FILE), "w", encoding="utf-8") as fh:
+                json.dump({"file_meta": file_meta, "numeric_meta": numeric_meta}, fh, default=_json_default)
+            os.replace(staging, entry)
+        except Exception:
+            # Mixed-type object columns etc., or another worker stored the entry first
+            shutil.rmtree(staging, ignore_errors=True)
+            return os.path.isdir(entry)
+        self.evict()
+        return True
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                last_used = os.path.getmtime(os.path.join(path, _META_FILE))
+            except OSError:
+                last_used = 0.0
+            entries.append((last_used, path, _dir_size(path)))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def report(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            "cache_dir": self.cache_dir,
+            "entries": len(entries),
+            "bytes": sum(size for _, _, size in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def default_cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "csv_preprocess_cache")
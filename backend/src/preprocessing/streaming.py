@@ -0,0 +1,342 @@
+import glob
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from .column_profile import merge_profiles, profile_columns
+from .column_roles import NLP_ROLES, NORMALIZE_ROLES, TEXT_ROLES, columns_with_role, detect_column_roles
+from .column_types import numeric_columns, text_columns
+from .data_preprocessor import (
+    DEFAULT_NLP_BATCH_SIZE,
+    apply_type_conversion,
+    normalize_text_column,
+    remove_stopwords_from_text_column,
+    validate_and_normalize_headers
+)
+from .transform_cache import TransformCache
+from ..ingest.engines import arrow_to_pandas
+from ..ingest.upload_stream import (
+    DEFAULT_PARSE_BLOCK_ROWS,
+    detect_encoding,
+    iter_csv_blocks,
+    peak_rss_bytes,
+    rss_report
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SPILL_FORMATS = ("parquet", "arrow")
+_PART_PATTERN = "part-{:05d}.{}"
+
+
+def _block_to_table(block: pd.DataFrame):
+    """Arrow table for a block; object columns Arrow cannot type are stored as strings"""
+    try:
+        return pa.Table.from_pandas(block, preserve_index=False)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        block = block.copy()
+        for col in text_columns(block):
+            try:
+                pa.array(block[col], from_pandas=True)
+            except (pa.ArrowTypeError, pa.ArrowInvalid):
+                block[col] = block[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        return pa.Table.from_pandas(block, preserve_index=False)
+
+
+def _promote_type(left, right):
+    if left == right:
+        return left
+    if pa.types.is_null(left):
+        return right
+    if pa.types.is_null(right):
+        return left
+    if pa.types.is_integer(left) and pa.types.is_integer(right):
+        return pa.int64()
+    if (pa.types.is_integer(left) or pa.types.is_floating(left)) and \
+            (pa.types.is_integer(right) or pa.types.is_floating(right)):
+        return pa.float64()
+    return pa.string()
+
+
+def promote_schemas(schemas: List["pa.Schema"]) -> "pa.Schema":
+    """
+    Common schema for blocks whose inferred column types disagree
+
+    Mixed integer widths become int64, mixed integer/float columns become
+    float64, columns that are numeric in some blocks and text in others
+    become strings.
+    """
+    fields = {}
+    for schema in schemas:
+        for field in schema:
+            fields[field.name] = _promote_type(fields[field.name], field.type) if field.name in fields else field.type
+    return pa.schema([pa.field(name, dtype) for name, dtype in fields.items()])
+
+
+class SpillWriter:
+    """
+    Appends Arrow tables to a directory of columnar part files
+
+    Blocks are appended to the current part as long as they can be cast to
+    its schema; a block with a conflicting type closes the part and starts
+    a new one with the promoted schema. read_spill reconciles the parts.
+    """
+
+    def __init__(self, path: str, spill_format: str = "parquet"):
+        if spill_format not in SPILL_FORMATS:
+            raise ValueError(f"Unknown spill format '{spill_format}'. Available: {list(SPILL_FORMATS)}")
+        self.path = path
+        self.spill_format = spill_format
+        self.schema = None
+        self.parts: List[str] = []
+        self.rows = 0
+        self._writer = None
+        self._sink = None
+        os.makedirs(path, exist_ok=True)
+
+    def _open(self, schema):
+        self.close()
+        filename = os.path.join(self.path, _PART_PATTERN.format(len(self.parts), self.spill_format))
+        if self.spill_format == "arrow":
+            self._sink = pa.OSFile(filename, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+        else:
+            self._writer = pq.ParquetWriter(filename, schema)
+        self.schema = schema
+        self.parts.append(filename)
+
+    def write(self, table):
+        if self._writer is None:
+            self._open(table.schema)
+        elif not table.schema.equals(self.schema):
+            try:
+                table = table.cast(self.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                schema = promote_schemas([self.schema, table.schema])
+                table = table.cast(schema)
+                self._open(schema)
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+
+def read_spill(path: str, columns: Optional[List[str]] = None, memory_map: bool = True,
+               max_parts: Optional[int] = None) -> pd.DataFrame:
+    """
+    Load a spill directory written by preprocess_csv_streaming
+
+    Arrow IPC parts are memory-mapped, so their columns are paged in from
+    disk on access instead of being read up front.
+
+    Args:
+        path: Spill directory
+        columns: Optional subset of columns to load
+        memory_map: Memory-map Arrow IPC parts
+        max_parts: Read only the first max_parts parts (e.g. for a preview)
+
+    Returns:
+        DataFrame of ArrowDtype columns
+    """
+    tables = []
+    for filename in sorted(glob.glob(os.path.join(path, "part-*")))[:max_parts]:
+        if filename.endswith(".arrow"):
+            source = pa.memory_map(filename, "r") if memory_map else pa.OSFile(filename, "rb")
+            table = pa.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select(columns)
+        else:
+            table = pq.read_table(filename, columns=columns)
+        tables.append(table)
+    if not tables:
+        return pd.DataFrame(columns=columns or [])
+    schema = promote_schemas([t.schema for t in tables])
+    tables = [t if t.schema.equals(schema) else t.cast(schema) for t in tables]
+    return arrow_to_pandas(pa.concat_tables(tables))
+
+
+def _row_hashes(block: pd.DataFrame, subset) -> np.ndarray:
+    return pd.util.hash_pandas_object(block[subset], index=False).to_numpy()
+
+
+def _in_sorted(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """Mask of hashes present in the sorted array sorted_hashes"""
+    if not len(sorted_hashes):
+        return np.zeros(len(hashes), dtype=bool)
+    positions = np.searchsorted(sorted_hashes, hashes)
+    return sorted_hashes[np.minimum(positions, len(sorted_hashes) - 1)] == hashes
+
+
+class _SeenHashes:
+    """
+    Row hashes of the blocks written so far, as sorted uint64 runs
+
+    Each block adds one sorted run; the runs are merged into the main array
+    once they hold as many hashes as it does, so the array is re-sorted
+    O(log n) times instead of copied for every block.
+    """
+
+    def __init__(self):
+        self._main = np.empty(0, dtype=np.uint64)
+        self._runs: List[np.ndarray] = []
+        self._run_size = 0
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = _in_sorted(self._main, hashes)
+        for run in self._runs:
+            found |= _in_sorted(run, hashes)
+        return found
+
+    def add(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        self._runs.append(np.sort(hashes))
+        self._run_size += len(hashes)
+        if self._run_size >= len(self._main):
+            self._main = np.sort(np.concatenate([self._main, *self._runs]))
+            self._runs, self._run_size = [], 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._main.nbytes) + sum(int(run.nbytes) for run in self._runs)
+
+
+def preprocess_csv_streaming(source, spill_dir: Optional[str] = None, block_rows: int = DEFAULT_PARSE_BLOCK_ROWS,
+                             encoding: Optional[str] = None, type_conversions=None, drop_duplicates_cols=None,
+                             remove_stopwords_flag=False, spill_format: str = "parquet",
+                             nlp_batch_size=DEFAULT_NLP_BATCH_SIZE, nlp_n_process=1):
+    """
+    Preprocess a CSV block by block, writing the result to a columnar spill
+
+    Each block of block_rows rows goes through header normalization, text
+    normalization, type conversion, de-duplication and (optionally) stopword
+    removal, is profiled, and is appended to the spill before the next block
+    is parsed, so the table itself never has to fit in memory. Duplicates
+    are detected across blocks from 64-bit row hashes kept in one sorted
+    uint64 array: with drop_duplicates_cols, memory still grows by 8 bytes
+    per distinct row of the file on top of the block size.
+
+    Args:
+        source: CSV path or seekable binary file object
+        spill_dir: Directory for the spill (a new one under the temp dir by default)
+        block_rows: Rows parsed and transformed per block
+        encoding: Text encoding; detected from a bounded sample when omitted
+        type_conversions: {column: "numeric"|"datetime"|"text"} as for preprocess_csv
+        drop_duplicates_cols: Column (or list of columns) defining duplicates
+        remove_stopwords_flag: Remove stopwords from text columns
+        spill_format: "parquet" (compressed) or "arrow" (memory-mappable IPC)
+
+    Returns:
+        Tuple of (spill directory, file_meta, numeric_metadata)
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is not installed. Please install it to use streaming preprocessing.")
+
+    start = time.perf_counter()
+    rss_before = peak_rss_bytes()
+    if spill_dir is None:
+        spill_dir = os.path.join(tempfile.gettempdir(), "csv_preprocess_spill", uuid.uuid4().hex)
+    encoding = encoding or detect_encoding(source)
+    if drop_duplicates_cols is not None and not isinstance(drop_duplicates_cols, (list, tuple)):
+        drop_duplicates_cols = [drop_duplicates_cols]
+
+    writer = SpillWriter(spill_dir, spill_format)
+    transform_cache = TransformCache()
+    # Sorted hashes of every row kept so far (only with drop_duplicates_cols)
+    seen_hashes = _SeenHashes()
+    partial_profiles = []
+    rows_read = 0
+    duplicates_dropped = 0
+    blocks = 0
+    columns: List[str] = []
+    column_roles: Dict[str, str] = {}
+
+    try:
+        for block in iter_csv_blocks(source, block_rows=block_rows, encoding=encoding):
+            blocks += 1
+            rows_read += len(block)
+            block = validate_and_normalize_headers(block)
+            columns = list(block.columns)
+
+            # Text roles come from the first block holding text in a column; later blocks reuse them
+            block_roles = detect_column_roles(block, previous=column_roles)
+            column_roles.update({col: role for col, role in block_roles.items()
+                                 if role in TEXT_ROLES or col not in column_roles})
+            for col in text_columns(block):
+                if block_roles[col] in NORMALIZE_ROLES:
+                    block[col] = normalize_text_column(block[col], cache=transform_cache)
+                else:
+                    block[col] = normalize_text_column(block[col], lowercase=False, remove_html_flag=False,
+                                                       collapse_whitespace=False)
+
+            if type_conversions:
+                # No downcasting: each block would pick its own narrowest dtype
+                block = apply_type_conversion(block, type_conversions, downcast=False)
+
+            if drop_duplicates_cols:
+                hashes = _row_hashes(block, drop_duplicates_cols)
+                keep = ~pd.Series(hashes).duplicated().to_numpy() & ~seen_hashes.contains(hashes)
+                seen_hashes.add(hashes[keep])
+                duplicates_dropped += int((~keep).sum())
+                block = block[keep]
+
+            if remove_stopwords_flag:
+                block = remove_stopwords_from_text_column(block, remove_stopwords=True, batch_size=nlp_batch_size,
+                                                          n_process=nlp_n_process, cache=transform_cache,
+                                                          columns=columns_with_role(block_roles, NLP_ROLES))
+
+            partial_profiles.append(profile_columns(block, numeric_columns(block)))
+            writer.write(_block_to_table(block))
+    finally:
+        writer.close()
+
+    # A column that turned to text in a later block is no longer profiled as numeric
+    profiles = merge_profiles(partial_profiles)
+    if writer.schema is not None:
+        profiles = {
+            col: profile for col, profile in profiles.items()
+            if pa.types.is_integer(writer.schema.field(col).type) or pa.types.is_floating(writer.schema.field(col).type)
+        }
+    numeric_metadata = [profile.to_dict() for profile in profiles.values()]
+    peak_rss_mb, peak_rss_growth_mb = rss_report(rss_before, peak_rss_bytes())
+
+    file_meta: Dict[str, Any] = {
+        'file_source': source if isinstance(source, str) else 'stream_input',
+        'num_rows': writer.rows,
+        'num_columns': len(columns),
+        'shape': (writer.rows, len(columns)),
+        'upload_time': datetime.utcnow().isoformat() + 'Z',
+        'text_transform_cache': transform_cache.report(),
+        'column_roles': column_roles,
+        'streaming': {
+            'encoding': encoding,
+            'block_rows': int(block_rows),
+            'blocks': blocks,
+            'rows_read': rows_read,
+            'duplicates_dropped': duplicates_dropped,
+            'dedup_hash_bytes': seen_hashes.nbytes,
+            'spill_dir': spill_dir,
+            'spill_format': spill_format,
+            'spill_parts': len(writer.parts),
+            'seconds': round(time.perf_counter() - start, 3),
+            'peak_rss_mb': peak_rss_mb,
+            'peak_rss_growth_mb': peak_rss_growth_mb
+        }
+    }
+    return spill_dir, file_meta, numeric_metadata
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_SIZE = 200_000
+
+
+class TransformCache:
+    """
+    Bounded LRU of per-value transform results, shared across columns
+
+    Entries are keyed by (transform name, input value), so a value that
+    appears in several columns is only transformed once. Per-column
+    statistics are collected for reporting in file_meta.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = int(maxsize)
+        self._data: "OrderedDict[tuple, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.column_stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def lookup(self, transform_name: str, value: Any):
+        """Return (True, result) on a hit, (False, None) otherwise"""
+        key = (transform_name, value)
+        try:
+            result = self._data[key]
+        except (KeyError, TypeError):
+            self.misses += 1
+            return False, None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return True, result
+
+    def store(self, transform_name: str, value: Any, result: Any):
+        key = (transform_name, value)
+        try:
+            self._data[key] = result
+        except TypeError:
+            return  # unhashable input, nothing to remember
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def record(self, column: Any, transform_name: str, rows: int, unique: int, computed: int):
+        hit_rate = round((rows - computed) / rows, 4) if rows else 0.0
+        self.column_stats.setdefault(str(column), {})[transform_name] = {
+            "rows": int(rows),
+            "unique_values": int(unique),
+            "computed": int(computed),
+            "cross_column_hits": int(unique - computed),
+            "hit_rate": hit_rate
+        }
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "cache_entries": len(self._data),
+            "cache_maxsize": self.maxsize,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "columns": self.column_stats
+        }
+
+
+def apply_unique(series: pd.Series, transform: Optional[Callable[[Any], Any]] = None,
+                 transform_name: Optional[str] = None, cache: Optional[TransformCache] = None,
+                 batch_transform: Optional[Callable[[List[Any]], List[Any]]] = None) -> pd.Series:
+    """
+    Apply a per-cell transform once per distinct value and broadcast the results
+
+    The series is factorized; only the unique values (minus those already in
+    the cache) are transformed, either one by one with transform or all at
+    once with batch_transform, and the results are taken back through the
+    factorize codes. Nulls are treated as a value of their own, so the
+    transform sees them exactly as a Series.apply would.
+
+    Args:
+        series: Column to transform
+        transform: Callable applied to a single value
+        transform_name: Cache namespace (defaults to the callable's name)
+        cache: Optional TransformCache shared across columns
+        batch_transform: Callable mapping a list of values to a list of results
+
+    Returns:
+        Object Series aligned with the input
+    """
+    if transform is None and batch_transform is None:
+        raise ValueError("apply_unique needs transform or batch_transform")
+    if transform_name is None:
+        transform_name = getattr(transform or batch_transform, "__name__", "transform")
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    unique_values = np.asarray(uniques, dtype=object)
+    results = np.empty(len(unique_values), dtype=object)
+
+    pending_positions = []
+    pending_values = []
+    for pos, value in enumerate(unique_values):
+        if cache is not None:
+            hit, cached = cache.lookup(transform_name, value)
+            if hit:
+                results[pos] = cached
+                continue
+        pending_positions.append(pos)
+        pending_values.append(value)
+
+    if pending_values:
+        if batch_transform is not None:
+            computed = list(batch_transform(pending_values))
+        else:
+            computed = [transform(value) for value in pending_values]
+        for pos, value, result in zip(pending_positions, pending_values, computed):
+            results[pos] = result
+            if cache is not None:
+                cache.store(transform_name, value, result)
+
+    if cache is not None and series.name is not None:
+        cache.record(series.name, transform_name, len(series), len(unique_values), len(pending_values))
+
+    return pd.Series(results.take(codes), index=series.index, name=series.name)
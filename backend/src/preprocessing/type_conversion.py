@@ -0,0 +1,233 @@
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.0
+    from pandas.core.tools.datetimes import guess_datetime_format
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Non-null values inspected when inferring a datetime format
+DEFAULT_FORMAT_SAMPLE_SIZE = 500
+# Share of the sample a format must parse to be used for the whole column
+DEFAULT_FORMAT_MIN_MATCH = 0.9
+
+_INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+_UINT_TYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+class DatetimeFormatCache:
+    """Bounded LRU of inferred datetime formats per column name"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._formats: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, column: str) -> Optional[str]:
+        with self._lock:
+            fmt = self._formats.get(column)
+            if fmt is not None:
+                self._formats.move_to_end(column)
+            return fmt
+
+    def set(self, column: str, fmt: str):
+        with self._lock:
+            self._formats[column] = fmt
+            self._formats.move_to_end(column)
+            while len(self._formats) > self.maxsize:
+                self._formats.popitem(last=False)
+
+
+datetime_format_cache = DatetimeFormatCache()
+
+
+def spread_sample(s: pd.Series, sample_size: int) -> pd.Series:
+    """Up to sample_size non-empty values taken evenly across the column"""
+    values = s.dropna()
+    values = values[values.astype(str).str.strip() != ""]
+    if len(values) > sample_size:
+        values = values.iloc[np.linspace(0, len(values) - 1, sample_size).astype(int)]
+    return values.astype(str)
+
+
+def infer_datetime_format(s: pd.Series, sample_size: int = DEFAULT_FORMAT_SAMPLE_SIZE,
+                          min_match: float = DEFAULT_FORMAT_MIN_MATCH) -> Optional[str]:
+    """
+    Guess one strftime format for a column of date strings from a sample
+
+    Candidate formats are guessed (month-first and day-first) from values
+    spread across the column; the candidate parsing most of the sample wins
+    if it parses at least min_match of it.
+    """
+    sample = spread_sample(s, sample_size)
+    if sample.empty:
+        return None
+    candidates = set()
+    with warnings.catch_warnings():
+        # Guessing month-first on a day-first value warns; both guesses are wanted here
+        warnings.simplefilter("ignore", UserWarning)
+        for value in sample.unique()[:50]:
+            candidates.add(guess_datetime_format(value))
+            candidates.add(guess_datetime_format(value, dayfirst=True))
+    candidates.discard(None)
+    best, best_rate = None, 0.0
+    for fmt in sorted(candidates):
+        rate = pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean()
+        if rate > best_rate:
+            best, best_rate = fmt, rate
+    return best if best_rate >= min_match else None
+
+
+def _convert_datetime(s: pd.Series, column: str, cache: DatetimeFormatCache) -> Tuple[pd.Series, Dict[str, Any]]:
+    if ptypes.is_datetime64_any_dtype(s.dtype):
+        return s, {"format_source": "already_datetime"}
+
+    fmt = cache.get(column)
+    source = "cached"
+    if fmt is not None:
+        # A cached format must still fit this column (another file may reuse the name)
+        probe = spread_sample(s, DEFAULT_FORMAT_SAMPLE_SIZE)
+        if len(probe) and pd.to_datetime(probe, format=fmt, errors="coerce").notna().mean() < DEFAULT_FORMAT_MIN_MATCH:
+            fmt = None
+    if fmt is None:
+        fmt = infer_datetime_format(s)
+        source = "inferred"
+        if fmt is not None:
+            cache.set(column, fmt)
+
+    if fmt is None:
+        return pd.to_datetime(s, errors="coerce", format="mixed"), {"format_source": "mixed"}
+
+    parsed = pd.to_datetime(s, format=fmt, errors="coerce")
+    # Values the fixed format could not read are retried element-wise
+    missed = parsed.isna() & s.notna()
+    if missed.any():
+        retried = pd.to_datetime(s[missed].astype(str), errors="coerce", format="mixed")
+        if retried.notna().any():
+            parsed = parsed.copy()
+            parsed[missed] = retried
+    return parsed, {"datetime_format": fmt, "format_source": source, "fallback_rows": int(missed.sum())}
+
+
+def _smallest_int_dtype(lo, hi):
+    types = _UINT_TYPES if lo >= 0 else _INT_TYPES
+    for dtype in types:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return None
+
+
+def _as_backend_dtype(s: pd.Series, np_dtype):
+    """np_dtype expressed in the storage backend of s (numpy, nullable or Arrow)"""
+    if isinstance(s.dtype, pd.ArrowDtype):
+        return pd.ArrowDtype(pa.from_numpy_dtype(np_dtype))
+    if isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+        return pd.api.types.pandas_dtype(np.dtype(np_dtype).name.capitalize().replace("Uint", "UInt"))
+    return np_dtype
+
+
+def downcast_numeric(s: pd.Series) -> pd.Series:
+    """
+    Cast a numeric column to the smallest dtype that holds every value exactly
+
+    Integers shrink to the narrowest (unsigned when non-negative) integer
+    type; null-free floats holding only whole numbers become integers;
+    other floats become float32 only when that round-trips losslessly.
+    """
+    if not ptypes.is_numeric_dtype(s.dtype) or ptypes.is_bool_dtype(s.dtype):
+        return s
+    values = s.dropna()
+    if values.empty:
+        return s
+    if ptypes.is_integer_dtype(s.dtype):
+        target = _smallest_int_dtype(values.min(), values.max())
+        if target is not None and np.dtype(target).itemsize < _itemsize(s.dtype):
+            return s.astype(_as_backend_dtype(s, target))
+        return s
+    arr = values.to_numpy(dtype="float64")
+    if not np.isfinite(arr).all():
+        return s
+    if len(values) == len(s) and np.array_equal(arr, np.trunc(arr)):
+        target = _smallest_int_dtype(arr.min(), arr.max())
+        if target is not None:
+            return s.astype(_as_backend_dtype(s, target))
+    if _itemsize(s.dtype) > 4 and np.array_equal(arr.astype(np.float32).astype(np.float64), arr):
+        return s.astype(_as_backend_dtype(s, np.float32))
+    return s
+
+
+def _itemsize(dtype) -> int:
+    if isinstance(dtype, pd.ArrowDtype):
+        return dtype.pyarrow_dtype.bit_width // 8
+    return np.dtype(getattr(dtype, "numpy_dtype", dtype)).itemsize
+
+
+def apply_type_conversion(df: pd.DataFrame, conversion: dict, copy: bool = False, downcast: bool = True,
+                          return_report: bool = False, format_cache: Optional[DatetimeFormatCache] = None):
+    """
+    Convert columns to numeric, datetime or text
+
+    Columns are replaced one at a time in df itself (no full-frame copy
+    unless copy=True). Datetimes are parsed with a format inferred from a
+    sample and cached per column name, falling back to element-wise parsing
+    only for values the format cannot read. Numeric columns are downcast to
+    the smallest lossless dtype.
+
+    Args:
+        df: DataFrame to convert
+        conversion: {column: "numeric"|"datetime"|"text"}
+        copy: Work on a copy instead of df
+        downcast: Downcast converted numeric columns
+        return_report: Also return per-column timings and details
+        format_cache: Datetime format cache (the module-level one by default)
+
+    Returns:
+        DataFrame, or (DataFrame, report) with return_report=True
+    """
+    if copy:
+        df = df.copy()
+    format_cache = format_cache or datetime_format_cache
+    report: Dict[str, Dict[str, Any]] = {}
+    for col, t in conversion.items():
+        if col not in df.columns:
+            continue
+        started = time.perf_counter()
+        before = str(df[col].dtype)
+        entry: Dict[str, Any] = {"target": t, "from_dtype": before}
+        try:
+            s = df[col]
+            nulls_before = int(s.isna().sum())
+            if t == 'numeric':
+                converted = pd.to_numeric(s, errors='coerce')
+                if downcast:
+                    converted = downcast_numeric(converted)
+            elif t == 'datetime':
+                converted, details = _convert_datetime(s, col, format_cache)
+                entry.update(details)
+            elif t == 'text':
+                converted = s.astype(str)
+            else:
+                continue
+            entry["coerced_to_null"] = int(converted.isna().sum()) - nulls_before
+            df[col] = converted
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["to_dtype"] = str(df[col].dtype)
+        entry["seconds"] = round(time.perf_counter() - started, 4)
+        report[col] = entry
+    if return_report:
+        return df, report
+    return df
@@ -0,0 +1,616 @@
+import itertools
+import os
+import pickle
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_MEMORY_BUDGET_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+
+_EMBEDDINGS_FILE = "embedding_result.npz"
+_EMBEDDINGS_NPY_FILE = "embedding_result.npy"
+_STATE_FILE = "state.pkl"
+
+
+def estimate_footprint(value: Any, _seen: Optional[set] = None,
+                       _frame_sizes: Optional[Dict[int, Tuple[Any, int]]] = None) -> int:
+    """
+    Deep, approximate memory footprint of a session value in bytes
+
+    DataFrames are measured with memory_usage(deep=True), numpy arrays by
+    nbytes; containers and dataclass-like objects are walked recursively.
+    Objects reachable more than once are only counted once.
+
+    _frame_sizes ({id: (weakref, bytes)}) caches DataFrame sizes between
+    calls; new measurements are added to it.
+    """
+    if _seen is None:
+        _seen = set()
+    if value is None or isinstance(value, (bool, int, float)):
+        return sys.getsizeof(value)
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, pd.DataFrame):
+        if _frame_sizes is None:
+            return int(value.memory_usage(deep=True, index=True).sum())
+        cached = _frame_sizes.get(id(value))
+        if cached is not None and cached[0]() is value:
+            return cached[1]
+        size = int(value.memory_usage(deep=True, index=True).sum())
+        _frame_sizes[id(value)] = (weakref.ref(value), size)
+        return size
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_footprint(k, _seen, _frame_sizes) + estimate_footprint(v, _seen, _frame_sizes)
+            for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_footprint(v, _seen, _frame_sizes) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_footprint(vars(value), _seen, _frame_sizes)
+    return sys.getsizeof(value)
+
+
+class SessionStore:
+    """
+    Dict-like session registry with a memory budget, LRU spill to disk and TTL expiry
+
+    Sessions stay resident while the total deep footprint fits the budget.
+    When it does not, the least recently used sessions are written to
+    spill_dir (DataFrames as Parquet, embedding matrices as npz, everything
+    else pickled) and dropped from memory; the next access reloads them.
+    Sessions idle for longer than ttl_seconds are removed entirely.
+
+    Callers that mutate a session in place should write it back with
+    ``store[session_id] = session`` so its footprint is re-measured.
+    """
+
+    def __init__(self, memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+                 spill_dir: Optional[str] = None,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.memory_budget_bytes = int(memory_budget_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._spill_dir = spill_dir
+        self._resident: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._spilled: Dict[str, str] = {}
+        self._last_access: Dict[str, float] = {}
+        # session_id -> footprint; a table shared by several keys (df, source_df,
+        # a ChunkPlan's source) is counted once
+        self._sizes: Dict[str, int] = {}
+        # session_id -> DataFrame sizes of the last measurement, so unchanged tables are not re-measured
+        self._frame_sizes: Dict[str, Dict[int, Tuple[Any, int]]] = {}
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        self.stats = {"evictions": 0, "reloads": 0, "expired": 0}
+
+    # ----- mapping interface -----
+    def new_session_id(self) -> str:
+        with self._lock:
+            while True:
+                session_id = f"session_{next(self._counter)}"
+                if session_id not in self._resident and session_id not in self._spilled:
+                    return session_id
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            self._expire()
+            return session_id in self._resident or session_id in self._spilled
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            if session_id in self._spilled:
+                self._resident[session_id] = self._load(session_id)
+                self.stats["reloads"] += 1
+            if session_id not in self._resident:
+                raise KeyError(session_id)
+            self._resident.move_to_end(session_id)
+            self._last_access[session_id] = time.time()
+            self._measure(session_id)
+            self._enforce_budget(pinned=session_id)
+            return self._resident[session_id]
+
+    def __setitem__(self, session_id: str, session: Dict[str, Any]):
+        with self._lock:
+            self._discard_spill(session_id)
+            self._resident[session_id] = session
+            self._resident.move_to_end(session_id)
+            self._last_access[session_id] = time.time()
+            self._measure(session_id)
+            self._enforce_budget(pinned=session_id)
+
+    def __delitem__(self, session_id: str):
+        with self._lock:
+            if session_id not in self._resident and session_id not in self._spilled:
+                raise KeyError(session_id)
+            self._forget(session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._resident) + len(self._spilled)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._resident) + list(self._spilled))
+
+    def get(self, session_id: str, default=None):
+        try:
+            return self[session_id]
+        except KeyError:
+            return default
+
+    # ----- accounting -----
+    def resident_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def memory_report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": self.resident_bytes(),
+                "resident_sessions": len(self._resident),
+                "spilled_sessions": len(self._spilled),
+                "session_bytes": dict(self._sizes),
+                **self.stats
+            }
+
+    def _measure(self, session_id: str):
+        # One walk over the whole session, so objects reachable from several keys count once
+        previous = self._frame_sizes.get(session_id, {})
+        frame_sizes = {frame_id: entry for frame_id, entry in previous.items() if entry[0]() is not None}
+        seen: set = set()
+        size = 0
+        for key, value in self._resident[session_id].items():
+            size += estimate_footprint(key, seen) + estimate_footprint(value, seen, frame_sizes)
+        self._sizes[session_id] = size
+        self._frame_sizes[session_id] = frame_sizes
+
+    def _enforce_budget(self, pinned: Optional[str] = None):
+        while self.resident_bytes() > self.memory_budget_bytes:
+            victim = next((sid for sid in self._resident if sid != pinned), None)
+            if victim is None:
+                break
+            self._spill(victim)
+
+    def _expire(self):
+        if not self.ttl_seconds:
+            return
+        cutoff = time.time() - float(self.ttl_seconds)
+        for session_id in [sid for sid, ts in self._last_access.items() if ts < cutoff]:
+            self._forget(session_id)
+            self.stats["expired"] += 1
+
+    def _forget(self, session_id: str):
+        self._resident.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+        self._frame_sizes.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+        self._discard_spill(session_id)
+
+    # ----- spill / reload -----
+    def _spill_root(self) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="csv_sessions_")
+        os.makedirs(self._spill_dir, exist_ok=True)
+        return self._spill_dir
+
+    def _spill(self, session_id: str):
+        session = self._resident.pop(session_id)
+        self._sizes.pop(session_id, None)
+        self._frame_sizes.pop(session_id, None)
+        path = os.path.join(self._spill_root(), session_id)
+        os.makedirs(path, exist_ok=True)
+        write_session(session, path)
+        self._spilled[session_id] = path
+        self.stats["evictions"] += 1
+
+    def _load(self, session_id: str) -> Dict[str, Any]:
+        path = self._spilled.pop(session_id)
+        try:
+            return read_session(path)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _discard_spill(self, session_id: str):
+        path = self._spilled.pop(session_id, None)
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _arrow_types_mapper(arrow_type):
+    # Keep dictionary columns as pandas categoricals, wrap everything else zero-copy
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def _link_or_copy(source: str, target: str) -> bool:
+    """Hard-link source to target (copy where links are unsupported); False if source is gone"""
+    try:
+        os.link(source, target)
+        return True
+    except OSError:
+        try:
+            shutil.copyfile(source, target)
+            return True
+        except OSError:
+            return False
+
+
+def write_session(session: Dict[str, Any], path: str, frame_format: str = "parquet",
+                  embedding_format: str = "npz",
+                  reuse_files: Optional[Dict[int, Tuple[Any, str]]] = None) -> Dict[str, str]:
+    """
+    Write a session dict to a directory
+
+    Top-level DataFrames go to <key>.parquet or, with frame_format="arrow",
+    to an Arrow IPC file that readers can memory-map (pickled if Arrow cannot
+    represent them). The embedding matrix of an EmbeddingResult goes to an
+    npz file, or an npy file with embedding_format="npy". The remaining state
+    is pickled. A DataFrame held under several keys (e.g. df and
+    source_df after upload) is written once and read back as one object.
+
+    reuse_files ({id(frame): (weakref, path)}) names files that already hold
+    a frame in this format; those frames are hard-linked (or copied) instead
+    of serialized again.
+
+    Returns:
+        {key: file name} of the frames written as files
+    """
+    state: Dict[str, Any] = {}
+    frame_files: Dict[str, str] = {}
+    written: Dict[int, str] = {}
+    for key, value in session.items():
+        if isinstance(value, pd.DataFrame) and id(value) in written:
+            frame_files[key] = written[id(value)]
+            continue
+        if isinstance(value, pd.DataFrame):
+            reuse = (reuse_files or {}).get(id(value))
+            if reuse is not None and reuse[0]() is value:
+                # Another process may have removed the old version meanwhile; then write it again
+                filename = f"{key}{os.path.splitext(reuse[1])[1]}"
+                if _link_or_copy(reuse[1], os.path.join(path, filename)):
+                    frame_files[key] = written[id(value)] = filename
+                    continue
+            try:
+                if frame_format == "arrow":
+                    filename = f"{key}.arrow"
+                    table = pa.Table.from_pandas(value, preserve_index=True)
+                    with pa.OSFile(os.path.join(path, filename), "wb") as sink:
+                        with pa.ipc.new_file(sink, table.schema) as writer:
+                            writer.write_table(table)
+                else:
+                    filename = f"{key}.parquet"
+                    value.to_parquet(os.path.join(path, filename))
+                frame_files[key] = filename
+                written[id(value)] = filename
+                continue
+            except Exception:
+                pass
+        state[key] = value
+
+    embedding_file = None
+    embedding_result = state.get("embedding_result")
+    embedded_chunks = getattr(embedding_result, "embedded_chunks", None)
+    stripped = []
+    if embedded_chunks:
+        try:
+            matrix = np.vstack([np.asarray(ec.embedding) for ec in embedded_chunks])
+            if embedding_format == "npy":
+                embedding_file = _EMBEDDINGS_NPY_FILE
+                np.save(os.path.join(path, embedding_file), matrix)
+            else:
+                embedding_file = _EMBEDDINGS_FILE
+                np.savez(os.path.join(path, embedding_file), embeddings=matrix)
+            for ec in embedded_chunks:
+                stripped.append(ec.embedding)
+                ec.embedding = None
+        except Exception:
+            embedding_file = None
+            stripped = []
+
+    try:
+        with open(os.path.join(path, _STATE_FILE), "wb") as fh:
+            pickle.dump({"state": state, "frame_files": frame_files, "embedding_file": embedding_file},
+                        fh, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        # Leave the in-memory objects untouched for anyone still holding them
+        for ec, embedding in zip(embedded_chunks or [], stripped):
+            ec.embedding = embedding
+    return frame_files
+
+
+def read_session(path: str, mmap: bool = False) -> Dict[str, Any]:
+    """
+    Inverse of write_session
+
+    With mmap=True, Arrow IPC frames and npy embedding matrices are
+    memory-mapped instead of read, so several processes share the pages.
+    """
+    with open(os.path.join(path, _STATE_FILE), "rb") as fh:
+        payload = pickle.load(fh)
+    session: Dict[str, Any] = payload["state"]
+    frames: Dict[str, pd.DataFrame] = {}
+    for key, filename in payload["frame_files"].items():
+        if filename not in frames:
+            file_path = os.path.join(path, filename)
+            if filename.endswith(".arrow"):
+                source = pa.memory_map(file_path, "r") if mmap else pa.OSFile(file_path, "rb")
+                table = pa.ipc.open_file(source).read_all()
+                frames[filename] = table.to_pandas(types_mapper=_arrow_types_mapper)
+            else:
+                frames[filename] = pd.read_parquet(file_path)
+        session[key] = frames[filename]
+
+    embedding_file = payload.get("embedding_file")
+    embedding_result = session.get("embedding_result")
+    if embedding_file and embedding_result is not None:
+        file_path = os.path.join(path, embedding_file)
+        if embedding_file.endswith(".npy"):
+            matrix = np.load(file_path, mmap_mode="r" if mmap else None)
+        else:
+            with np.load(file_path) as npz:
+                matrix = npz["embeddings"]
+        for ec, embedding in zip(embedding_result.embedded_chunks, matrix):
+            ec.embedding = embedding
+    return session
+
+
+class SharedSessionStore:
+    """
+    Session backend shared by several worker processes
+
+    A SQLite index under root_dir records every session and a version
+    number; each saved version lives in its own directory with DataFrames as
+    Arrow IPC files and embedding matrices as npy files, both memory-mapped
+    on load so workers do not copy them. Session ids are random UUIDs.
+
+    Each process keeps a small LRU of loaded sessions and reloads one only
+    when another process has saved a newer version. As with SessionStore,
+    write a mutated session back with ``store[session_id] = session``.
+    """
+
+    def __init__(self, root_dir: str, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_cached_sessions: int = 8):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is not installed. Please install it to use SharedSessionStore.")
+        self.root_dir = root_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_cached_sessions = max(1, int(max_cached_sessions))
+        os.makedirs(root_dir, exist_ok=True)
+        self._db_path = os.path.join(root_dir, "sessions.db")
+        self._cache: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        # session_id -> {id(frame): (weakref, Arrow file)} of the frames in the latest version this
+        # process read or wrote; unchanged frames are linked into the next version, not rewritten
+        self._frame_files: Dict[str, Dict[int, Tuple[Any, str]]] = {}
+        self._lock = threading.RLock()
+        self.stats = {"loads": 0, "cache_hits": 0, "expired": 0, "frames_written": 0, "frames_linked": 0}
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+                "created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _version_dir(self, session_id: str, version: int) -> str:
+        return os.path.join(self.root_dir, session_id, f"v{version}")
+
+    # ----- mapping interface -----
+    def new_session_id(self) -> str:
+        return f"session_{uuid.uuid4().hex}"
+
+    def __contains__(self, session_id: str) -> bool:
+        self._expire()
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row is not None
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        self._expire()
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                with self._lock:
+                    self._cache.pop(session_id, None)
+                raise KeyError(session_id)
+            conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (time.time(), session_id))
+        version = int(row[0])
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(session_id)
+                self.stats["cache_hits"] += 1
+                return cached[1]
+        version_dir = self._version_dir(session_id, version)
+        session = read_session(version_dir, mmap=True)
+        self.stats["loads"] += 1
+        self._remember(session_id, version, session)
+        self._index_frames(session_id, session, version_dir)
+        return session
+
+    def __setitem__(self, session_id: str, session: Dict[str, Any]):
+        session_root = os.path.join(self.root_dir, session_id)
+        os.makedirs(session_root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix="staging_", dir=session_root)
+        with self._lock:
+            reuse_files = dict(self._frame_files.get(session_id, {}))
+        try:
+            frame_files = write_session(session, staging, frame_format="arrow", embedding_format="npy",
+                                        reuse_files=reuse_files)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+                previous = int(row[0]) if row else None
+                version = (previous or 0) + 1
+                os.replace(staging, self._version_dir(session_id, version))
+                if row is None:
+                    conn.execute("INSERT INTO sessions VALUES (?, ?, ?, ?)", (session_id, version, now, now))
+                else:
+                    conn.execute("UPDATE sessions SET version = ?, last_access = ? WHERE session_id = ?",
+                                 (version, now, session_id))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        self._remember(session_id, version, session)
+        frames = {id(value): value for value in session.values() if isinstance(value, pd.DataFrame)}
+        linked = sum(1 for frame_id, frame in frames.items()
+                     if frame_id in reuse_files and reuse_files[frame_id][0]() is frame)
+        self.stats["frames_linked"] += linked
+        self.stats["frames_written"] += len(frames) - linked
+        self._index_frames(session_id, session, self._version_dir(session_id, version), frame_files)
+        if previous is not None:
+            # Readers that still map the old files keep them alive on POSIX;
+            # elsewhere the removal is retried on the next save
+            self._remove_stale_versions(session_id)
+
+    def __delitem__(self, session_id: str):
+        with closing(self._connect()) as conn:
+            cur = conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        if cur.rowcount == 0:
+            raise KeyError(session_id)
+        self._drop_files(session_id)
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0])
+
+    def __iter__(self) -> Iterator[str]:
+        with closing(self._connect()) as conn:
+            return iter([row[0] for row in conn.execute("SELECT session_id FROM sessions")])
+
+    def get(self, session_id: str, default=None):
+        try:
+            return self[session_id]
+        except KeyError:
+            return default
+
+    def memory_report(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = {sid: estimate_footprint(session) for sid, (_, session) in self._cache.items()}
+        return {
+            "backend": "shared",
+            "root_dir": self.root_dir,
+            "sessions": len(self),
+            "cached_sessions": len(cached),
+            "session_bytes": cached,
+            **self.stats
+        }
+
+    # ----- internals -----
+    def _index_frames(self, session_id: str, session: Dict[str, Any], version_dir: str,
+                      frame_files: Optional[Dict[str, str]] = None):
+        """Remember which Arrow file of version_dir holds each of the session's frames"""
+        index: Dict[int, Tuple[Any, str]] = {}
+        for key, value in session.items():
+            if not isinstance(value, pd.DataFrame) or id(value) in index:
+                continue
+            filename = frame_files.get(key) if frame_files is not None else f"{key}.arrow"
+            file_path = os.path.join(version_dir, filename) if filename else None
+            if file_path and filename.endswith(".arrow") and os.path.exists(file_path):
+                index[id(value)] = (weakref.ref(value), file_path)
+        with self._lock:
+            self._frame_files[session_id] = index
+
+    def _remember(self, session_id: str, version: int, session: Dict[str, Any]):
+        with self._lock:
+            self._cache[session_id] = (version, session)
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.max_cached_sessions:
+                self._cache.popitem(last=False)
+
+    def _remove_stale_versions(self, session_id: str):
+        """Remove the versions older than the indexed one, under the index write lock
+
+        Another worker may have committed a newer version since this one
+        saved, so the current version is re-read rather than assumed; it and
+        anything newer are never removed.
+        """
+        session_root = os.path.join(self.root_dir, session_id)
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+                if row is None:
+                    return
+                current = int(row[0])
+                for name in os.listdir(session_root):
+                    if name.startswith("v") and name[1:].isdigit() and int(name[1:]) < current:
+                        shutil.rmtree(os.path.join(session_root, name), ignore_errors=True)
+            finally:
+                conn.execute("COMMIT")
+
+    def _drop_files(self, session_id: str):
+        with self._lock:
+            self._cache.pop(session_id, None)
+            self._frame_files.pop(session_id, None)
+        shutil.rmtree(os.path.join(self.root_dir, session_id), ignore_errors=True)
+
+    def _expire(self):
+        if not self.ttl_seconds:
+            return
+        cutoff = time.time() - float(self.ttl_seconds)
+        with closing(self._connect()) as conn:
+            expired = [row[0] for row in conn.execute(
+                "SELECT session_id FROM sessions WHERE last_access < ?", (cutoff,))]
+            if expired:
+                conn.executemany("DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in expired])
+        for session_id in expired:
+            self._drop_files(session_id)
+            self.stats["expired"] += 1
+
+
+def create_session_store(backend: str = "memory", **kwargs):
+    """
+    Build the session backend used by the API
+
+    Args:
+        backend: "memory" (per-process SessionStore) or "shared" (SharedSessionStore,
+            required when running several uvicorn workers)
+        **kwargs: Passed to the store constructor
+    """
+    backend = (backend or "memory").strip().lower()
+    if backend == "shared":
+        return SharedSessionStore(**kwargs)
+    if backend == "memory":
+        return SessionStore(**kwargs)
+    raise ValueError(f"Unknown session backend '{backend}'. Use 'memory' or 'shared'.")
@@ -0,0 +1,65 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.chunking.base_chunker import ChunkingResult, ChunkPlan
+from src.chunking.fixed_size_chunker import chunk_fixed
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"id": np.arange(10), "name": [f"row {i}" for i in range(10)]})
+
+
+def test_range_plan_pickle_drops_source_and_bind_restores_it(df):
+    plan = ChunkPlan.from_ranges(df, [0, 4], [4, 10])
+    restored = pickle.loads(pickle.dumps(plan))
+    assert not restored.bound
+    assert restored.lengths().tolist() == [4, 6]
+    with pytest.raises(RuntimeError):
+        restored[0]
+    restored.bind(df)
+    assert restored.bound
+    pd.testing.assert_frame_equal(restored[1], df.iloc[4:10])
+
+
+def test_position_plan_round_trip(df):
+    plan = ChunkPlan.from_positions(df, [np.array([0, 5]), np.array([2, 3, 9])])
+    restored = pickle.loads(pickle.dumps(plan)).bind(df)
+    pd.testing.assert_frame_equal(restored[1], df.take([2, 3, 9]))
+
+
+def test_bind_rejects_other_row_count(df):
+    plan = pickle.loads(pickle.dumps(ChunkPlan.from_ranges(df, [0], [10])))
+    with pytest.raises(ValueError):
+        plan.bind(df.iloc[:5])
+
+
+def test_result_bind_is_noop_when_bound(df):
+    plan = ChunkPlan.from_ranges(df, [0], [10])
+    result = ChunkingResult(chunks=plan, metadata=[], method="fixed_size", total_chunks=1)
+    result.bind(df.iloc[:5])
+    assert plan.source is df
+
+
+def test_fixed_size_overlap_ranges(df):
+    result = chunk_fixed(df, chunk_size=4, overlap=1, preserve_headers=False)
+    assert result.chunks.starts.tolist() == [0, 3, 6]
+    assert result.chunks.stops.tolist() == [4, 7, 10]
+    assert [m.end_index for m in result.metadata] == [3, 6, 9]
+
+
+def test_fixed_size_overlap_must_be_smaller_than_chunk_size(df):
+    with pytest.raises(ValueError):
+        chunk_fixed(df, chunk_size=4, overlap=4)
+
+
+def test_bind_rejects_changed_table_with_same_row_count(df):
+    plan = pickle.loads(pickle.dumps(ChunkPlan.from_ranges(df, [0], [10])))
+    changed = df.assign(name=df["name"].str.upper())
+    with pytest.raises(ValueError):
+        plan.bind(changed)
+    plan.bind(df.copy())
+    assert plan.bound
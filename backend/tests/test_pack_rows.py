@@ -0,0 +1,22 @@
+import numpy as np
+
+from src.chunking.document_based_chunker import pack_rows
+
+
+def test_greedy_bounds():
+    bounds = pack_rows(np.array([3, 3, 10, 1, 1]), 5)
+    assert bounds.tolist() == [0, 1, 2, 3, 5]
+
+
+def test_rows_fill_budget_exactly():
+    bounds = pack_rows(np.array([2, 3, 1, 4, 5]), 5)
+    assert bounds.tolist() == [0, 2, 4, 5]
+
+
+def test_over_budget_row_gets_its_own_slice():
+    bounds = pack_rows(np.array([1, 9, 1]), 5)
+    assert bounds.tolist() == [0, 1, 2, 3]
+
+
+def test_empty_input():
+    assert pack_rows(np.array([], dtype=np.int64), 5).tolist() == [0]